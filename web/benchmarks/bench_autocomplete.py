@@ -0,0 +1,46 @@
+"""
+NexSupply Benchmark - autocomplete lookup and update latency
+Fills an AutocompleteTrie with synthetic canonical queries up to its entry cap
+(so eviction runs) and times top-5 completions for short prefixes and single
+incremental updates.
+
+Usage (from web/):
+    python -m benchmarks.bench_autocomplete
+"""
+
+import random
+import time
+import timeit
+
+from services.autocomplete import AutocompleteTrie
+from utils.cost_tables import CATEGORY_KEYWORDS
+
+
+def main():
+    rng = random.Random(5)
+    words = sorted({w for kws in CATEGORY_KEYWORDS.values() for kw in kws for w in kw.split()})
+    modifiers = ["bulk", "custom", "private label", "wholesale", "eco", "mini", "premium"]
+    terms = [
+        " ".join(rng.choices(modifiers, k=rng.randint(0, 1)) + rng.choices(words, k=rng.randint(1, 3)))
+        for _ in range(60000)
+    ]
+    trie = AutocompleteTrie(max_entries=20000)
+    now = time.time()
+
+    started = time.perf_counter()
+    for term in terms:
+        trie.add(term, now - rng.uniform(0, 90) * 86400)
+    build_s = time.perf_counter() - started
+    print(f"build: {len(terms):,} rows -> {len(trie):,} entries in {build_s:.2f}s")
+
+    prefixes = [term[:rng.randint(2, 6)] for term in rng.sample(terms, 2000)]
+    seconds = min(timeit.repeat(lambda: [trie.complete(p, 5) for p in prefixes], number=1, repeat=5))
+    print(f"complete (top 5): {seconds / len(prefixes) * 1e6:8.2f} µs/lookup")
+
+    updates = rng.choices(terms, k=2000)
+    seconds = min(timeit.repeat(lambda: [trie.add(t, now) for t in updates], number=1, repeat=5))
+    print(f"add (incremental): {seconds / len(updates) * 1e6:8.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+NexSupply Benchmark - classify_category latency
+Compares the Aho-Corasick classifier with the previous one-scan-per-keyword
+loop on short queries and on 5,000-character pasted product descriptions.
+The exact pass (scan_query) must agree with the loop; classify_category adds
+the typo-tolerant second pass, which is meant to change some results (a query
+cut off at "festiv" now resolves to seasonal items), so it is only timed.
+The lexicon caches are cleared before each run, so every query is a full scan.
+
+Usage (from web/):
+    python -m benchmarks.bench_classify_category
+"""
+
+import random
+import timeit
+
+from utils.cost_tables import CATEGORY_KEYWORDS, classify_category
+from utils.lexicon import _correct_word, scan_query
+
+
+def classify_by_substring_loop(query: str) -> str:
+    """Previous implementation: one `in` scan per keyword."""
+    query_lower = query.lower()
+    scores = {}
+    for cat_id, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(1 for kw in keywords if kw.lower() in query_lower)
+        if score > 0:
+            scores[cat_id] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return "generic_consumer_product"
+
+
+def _queries(rng: random.Random, length: int, count: int):
+    vocabulary = [kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords]
+    filler = ["premium", "wholesale", "supplier", "units", "shipping", "to", "the", "USA", "quality"]
+    queries = []
+    for _ in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(vocabulary) if rng.random() < 0.2 else rng.choice(filler))
+        queries.append(" ".join(words)[:length])
+    return queries
+
+
+def classify_exact(query: str) -> str:
+    """Aho-Corasick pass alone, without the fuzzy fallback."""
+    return scan_query(query).category
+
+
+def _clear_caches():
+    scan_query.cache_clear()
+    _correct_word.cache_clear()
+
+
+def main():
+    rng = random.Random(42)
+    for label, length, count in (("short (~40 chars)", 40, 2000), ("paste (5,000 chars)", 5000, 100)):
+        queries = _queries(rng, length, count)
+        assert [classify_exact(q) for q in queries] == [classify_by_substring_loop(q) for q in queries]
+        changed = sum(classify_category(q) != classify_exact(q) for q in queries)
+        print(f"{label:<22} typo pass changed {changed}/{count} labels")
+        for name, fn in (
+            ("substring loop", classify_by_substring_loop),
+            ("aho-corasick", classify_exact),
+            ("aho+typo pass", classify_category),
+        ):
+            seconds = min(timeit.repeat(
+                lambda: [fn(q) for q in queries], setup=_clear_caches, number=1, repeat=5
+            ))
+            print(f"{label:<22} {name:<16} {seconds / count * 1e6:9.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+NexSupply Benchmark - LLM response JSON parsing and repair
+Builds a synthetic corpus by damaging one hybrid-prompt response (fenced,
+wrapped in prose with braces, trailing commas, raw newlines in strings, cut
+off at a random point) and compares the previous regex + find/rfind cleaner
+with parse_llm_json(): how many responses each recovers and how long a parse
+takes, split into responses json can decode as-is and ones needing repair.
+
+The damage kinds are the ones parse_llm_json was written to repair, so the
+recovery counts show coverage of those kinds, not a recovery rate on
+recorded model output.
+
+Usage (from web/):
+    python -m benchmarks.bench_json_repair
+"""
+
+import json
+import random
+import re
+import timeit
+from collections import Counter
+
+from utils.streaming_json import parse_llm_json
+
+
+RESPONSE = {
+    "product_name": "Silicone baby teether",
+    "target_market": "USA",
+    "channel": "Amazon FBA",
+    "volume_units": 5000,
+    "demand_level": "High",
+    "demand_notes": "Steady search volume; peaks in Q4 {gift season}.",
+    "competition_level": "Medium",
+    "margin_notes": "Healthy at $12.99 retail.",
+    "hidden_cost_alerts": [
+        {"title": "CPC testing", "detail": "Children's products need third-party lab tests.", "cost_usd": 1200},
+        {"title": "FBA prep", "detail": "Poly-bag and suffocation warning labels.", "cost_usd": 350},
+    ],
+    "suppliers": [
+        {"name": "Dongguan Silicone Co.", "moq": 1000, "rating": 4.6, "certifications": ["ISO9001", "FDA"]},
+        {"name": "Shenzhen BabyCare Ltd.", "moq": 3000, "rating": 4.3, "certifications": ["LFGB"]},
+    ],
+    "risk_overview": "Compliance is the main risk; budget 3 weeks for testing.",
+    "consulting_reason": "First children's product import.",
+}
+
+
+def _legacy_parse(text):
+    """The cleaner parse_llm_json replaced: fence regex, then a find/rfind brace slice."""
+    cleaned = text.strip()
+    for pattern in (r'^```json\s*\n?(.*?)\n?```$', r'^```\s*\n?(.*?)\n?```$'):
+        match = re.match(pattern, cleaned, re.DOTALL | re.IGNORECASE)
+        if match:
+            cleaned = match.group(1).strip()
+            break
+    first, last = cleaned.find("{"), cleaned.rfind("}")
+    if first != -1 and last != -1:
+        cleaned = cleaned[first:last + 1]
+    try:
+        return json.loads(cleaned)
+    except ValueError:
+        return None
+
+
+def build_corpus(rng, size):
+    """(kind, text) pairs of malformed responses."""
+    pretty = json.dumps(RESPONSE, indent=2, ensure_ascii=False)
+    kinds = {
+        "clean": lambda: pretty,
+        "fenced": lambda: f"```json\n{pretty}\n```",
+        "prose_with_braces": lambda: f"Here is the {{analysis}}:\n```json\n{pretty}\n```\nLet me know {{anything}}.",
+        "trailing_commas": lambda: re.sub(r"(\]|\}|\"|\d)\n", r"\1,\n", pretty),
+        "raw_newlines": lambda: pretty.replace("; peaks", ";\npeaks").replace("tests.", "tests.\n\tSee CPSC."),
+        "truncated": lambda: "```json\n" + pretty[:rng.randint(len(pretty) // 3, len(pretty) - 2)],
+    }
+    names = sorted(kinds)
+    return [(kind, kinds[kind]()) for kind in (rng.choice(names) for _ in range(size))]
+
+
+def main():
+    rng = random.Random(11)
+    corpus = build_corpus(rng, 600)
+
+    recovered = {"legacy": Counter(), "parse_llm_json": Counter()}
+    totals = Counter(kind for kind, _ in corpus)
+    for kind, text in corpus:
+        if _legacy_parse(text) is not None:
+            recovered["legacy"][kind] += 1
+        if parse_llm_json(text).data is not None:
+            recovered["parse_llm_json"][kind] += 1
+
+    print(f"{'kind':<20}{'n':>5}{'legacy':>10}{'parse_llm_json':>16}")
+    for kind in sorted(totals):
+        print(f"{kind:<20}{totals[kind]:>5}{recovered['legacy'][kind]:>10}{recovered['parse_llm_json'][kind]:>16}")
+    print(f"{'total':<20}{len(corpus):>5}{sum(recovered['legacy'].values()):>10}"
+          f"{sum(recovered['parse_llm_json'].values()):>16}")
+
+    # Decodable responses take the raw_decode fast path; the rest are scanned
+    groups = {
+        "as-is": [text for _, text in corpus if not parse_llm_json(text).repairs],
+        "repaired": [text for _, text in corpus if parse_llm_json(text).repairs],
+    }
+    for group, texts in groups.items():
+        for name, parse in (("legacy", _legacy_parse), ("parse_llm_json", parse_llm_json)):
+            seconds = min(timeit.repeat(lambda: [parse(t) for t in texts], number=1, repeat=5))
+            print(f"{group + ' (' + str(len(texts)) + ')':<16}{name:<16}{seconds / len(texts) * 1e6:8.1f} µs/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+NexSupply Benchmark - quantity parsing throughput
+Compares parse_quantity() with the previous input_parser.parse_volume regex
+chain on short queries and on longer pasted requests built from the test
+corpus.
+
+Usage (from web/):
+    python -m benchmarks.bench_quantity_parser
+"""
+
+import random
+import re
+import timeit
+
+from utils.quantity_parser import parse_quantity
+from tests.test_quantity_parser import QUANTITY_CORPUS
+
+
+def parse_volume_regex_chain(text):
+    """Previous parse_volume: one re.search per pattern, Korean then English then plain."""
+    if not text:
+        return None
+    text_lower = text.lower()
+    for pattern, multiplier in (
+        (r'(\d+(?:\.\d+)?)\s*만\s*개?', 10000),
+        (r'(\d+(?:\.\d+)?)\s*천\s*개?', 1000),
+        (r'(\d+(?:\.\d+)?)\s*백\s*개?', 100),
+        (r'(\d+(?:\.\d+)?)\s*million', 1000000),
+        (r'(\d+(?:\.\d+)?)\s*m', 1000000),
+        (r'(\d+(?:\.\d+)?)\s*thousand', 1000),
+        (r'(\d+(?:\.\d+)?)\s*k', 1000),
+    ):
+        match = re.search(pattern, text_lower)
+        if match:
+            return int(float(match.group(1)) * multiplier)
+    number_match = re.search(r'(\d{1,3}(?:,\d{3})*(?:\.\d+)?)', text)
+    if number_match:
+        return int(float(number_match.group(1).replace(',', '')))
+    return None
+
+
+def main():
+    rng = random.Random(3)
+    phrases = [text for text, _ in QUANTITY_CORPUS if text]
+    filler = "We are a US importer looking for a reliable factory with private label options. "
+    workloads = (
+        ("short query", [f"gummy candy {rng.choice(phrases)} to USA" for _ in range(5000)]),
+        ("short query, no number", [f"gummy candy {rng.choice(['bulk', 'wholesale', 'oem'])} to USA" for _ in range(5000)]),
+        ("pasted request (~1 KB)", [
+            filler * 6 + rng.choice(phrases) + " " + filler * 6 for _ in range(500)
+        ]),
+    )
+    for label, texts in workloads:
+        for name, fn in (("regex chain", parse_volume_regex_chain), ("grammar", parse_quantity)):
+            seconds = min(timeit.repeat(lambda: [fn(t) for t in texts], number=1, repeat=5))
+            print(f"{label:<24} {name:<12} {len(texts) / seconds:12,.0f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,6 @@ Clean, unified input area with polished Quick Start cards
 """
 
 import streamlit as st
-import time
 import traceback
 
 from services.gemini_service import GeminiService
@@ -316,6 +315,62 @@ def apply_css():
     """, unsafe_allow_html=True)
 
 
+# =============================================================================
+# AUTOCOMPLETE
+# =============================================================================
+
+def get_product_suggestions(query: str, k: int = 4) -> list:
+    """Previously analyzed products starting with what the user has typed."""
+    try:
+        from services.autocomplete import suggest_queries
+        return [s for s in suggest_queries(query, k + 1) if s != query.strip().lower()][:k]
+    except Exception:
+        return []
+
+
+def _apply_suggestion(suggestion: str):
+    st.session_state.product_input = suggestion
+    st.session_state.search_query = suggestion
+
+
+# =============================================================================
+# ANALYSIS PROGRESS
+# =============================================================================
+
+# Streamed insight keys -> progress line; keys sharing a prefix are one section
+PROGRESS_SECTIONS = [
+    ("landed_cost", "📊 Landed cost & margin estimate"),
+    ("demand_", "📈 Market demand"),
+    ("competition_", "⚔️ Competition risk"),
+    ("margin_", "💰 Margin outlook"),
+    ("reliability_", "🛡️ Supplier reliability"),
+    ("hidden_cost_alerts", "🚨 Hidden cost alerts"),
+    ("suppliers", "🏭 Supplier shortlist"),
+    ("risk_overview", "⚠️ Risk assessment"),
+]
+
+
+def make_progress_callback(status):
+    """on_partial callback that lists each analysis section in the status box as it arrives."""
+    shown = set()
+
+    def on_partial(key, value):
+        section = next(((prefix, label) for prefix, label in PROGRESS_SECTIONS if key.startswith(prefix)), None)
+        if section is None or section[0] in shown:
+            return
+        shown.add(section[0])
+        prefix, label = section
+        if prefix == "landed_cost" and isinstance(value, dict) and value.get("landed_cost_per_unit_usd"):
+            st.write(f"✅ {label}: **${value['landed_cost_per_unit_usd']:.2f}/unit**")
+            status.update(label="🧠 Analyzing market demand & competition risk...")
+        else:
+            st.write(f"✅ {label}")
+            if prefix in ("suppliers", "risk_overview"):
+                status.update(label="🔍 Vetting suppliers & running risk assessment...")
+
+    return on_partial
+
+
 # =============================================================================
 # LANDING PAGE - Refined UI
 # =============================================================================
@@ -395,6 +450,18 @@ def render_home_page():
         )
         st.session_state.search_query = product_query
         
+        # --- Suggestions from earlier analyses ---
+        suggestions = get_product_suggestions(product_query)
+        if suggestions:
+            for col, suggestion in zip(st.columns(len(suggestions)), suggestions):
+                col.button(
+                    suggestion,
+                    key=f"suggest_{suggestion}",
+                    on_click=_apply_suggestion,
+                    args=(suggestion,),
+                    use_container_width=True
+                )
+        
         st.markdown("<div style='height: 24px;'></div>", unsafe_allow_html=True)
         
         # --- Input 2: Context (Optional) ---
@@ -460,39 +527,15 @@ def render_home_page():
                     # === STEP-BY-STEP PROGRESS (Security-Aware Messages) ===
                     with st.status("🔎 AI is building your Sourcing Blueprint...", expanded=True) as status:
                         st.write("⏱️ *This analysis takes 10-20 seconds*")
-                        st.write("")
-                        st.write("📊 **Step 1/3:** Calculating Landed Cost & Margin Estimate...")
-                        start_time = time.time()
                         
                         try:
                             service = GeminiService()
                             
-                            # Step 2
-                            elapsed = int(time.time() - start_time)
-                            if elapsed > 5:  # Only update if taking time
-                                status.update(label="🧠 Deep-diving into complex supply chains...")
-                                st.write("📊 **Step 2/3:** Analyzing Market Demand & Competition Risk...")
-                            
-                            # Check elapsed time before analysis
-                            elapsed = time.time() - start_time
-                            if elapsed > 25:  # If already taking long, show timeout message
-                                status.update(label="⏳ Taking Longer Than Expected...")
-                                st.warning("⏳ **Taking Longer Than Expected!**\n\nDo you want us to email the full report and supplier shortlist when it's ready?")
-                                # Email collection form (shown in status)
-                                email_for_report = st.text_input("Your Email (optional)", key="timeout_email", placeholder="your@email.com")
-                                if email_for_report and "@" in email_for_report:
-                                    st.info("✅ We'll email you the report when ready. Continuing analysis...")
-                            
-                            result = service.analyze_product(state.get_input())
-                            
-                            # Step 3
-                            elapsed = int(time.time() - start_time)
-                            if elapsed > 15:  # If taking longer, show progress
-                                status.update(label="🔍 Vetting Suppliers & Running Risk Assessment...")
-                            else:
-                                status.update(label="✅ Step 3/3: Generating report...")
-                            
-                            st.write("📊 **Step 3/3:** Vetting Suppliers & Running Risk Assessment...")
+                            # Sections are listed as the streamed response completes them
+                            result = service.analyze_product(
+                                state.get_input(),
+                                on_partial=make_progress_callback(status)
+                            )
                             
                             if result["success"]:
                                 status.update(label="✅ Analysis complete!", state="complete")
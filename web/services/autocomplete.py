@@ -0,0 +1,214 @@
+"""
+NexSupply Autocomplete - Product query suggestions from logged analyses
+A prefix trie over canonical queries (utils.query_canonical). Every node keeps
+its own top-k completions, so a lookup is one walk down the prefix plus a
+copy of a short list - no subtree search.
+
+Scores combine frequency and recency with forward decay: each logged query
+adds 2 ** ((t - t0) / half_life), so newer rows weigh more and scores only
+ever grow. That keeps incremental updates cheap: a new row bumps one term and
+fixes the top-k lists on its path. Once rows arrive REBASE_HALF_LIVES after
+the landmark t0, t0 moves up to the new row and every score is rescaled by the
+same factor, so weights stay finite in a long-running process and rankings
+(hence the top-k lists) are unchanged.
+
+Memory is bounded by AppSettings.AUTOCOMPLETE_MAX_ENTRIES. When the trie
+outgrows it, the coldest tenth of the terms is evicted, emptied branches are
+pruned and the top-k lists on their paths are rebuilt from the children.
+"""
+
+import heapq
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.config import AppSettings
+
+
+TOP_K = 8
+MAX_TERM_LENGTH = 80
+MIN_PREFIX_LENGTH = 2
+EVICTION_FRACTION = 0.1
+# Landmark moves forward once a row's weight would exceed 2 ** REBASE_HALF_LIVES
+REBASE_HALF_LIVES = 32
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Fold a partially typed query the way canonical queries are folded."""
+    folded = unicodedata.normalize("NFKC", prefix or "").casefold()
+    words = " ".join(folded.split())
+    # "mug " should complete the next word, not "mug" itself
+    return words + " " if words and folded[-1].isspace() else words
+
+
+class _Node:
+    __slots__ = ("children", "top", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[str] = []
+        self.terminal = False
+
+
+class AutocompleteTrie:
+    """
+    Prefix trie of canonical queries with per-node top-k completions.
+
+    Args:
+        max_entries: Distinct terms kept before cold ones are evicted
+        half_life_days: Age at which a logged query counts half as much
+        top_k: Completions stored per node (largest k a lookup can ask for)
+        now: Forward-decay landmark as a Unix timestamp (default: current time)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = AppSettings.AUTOCOMPLETE_MAX_ENTRIES,
+        half_life_days: float = AppSettings.AUTOCOMPLETE_HALF_LIFE_DAYS,
+        top_k: int = TOP_K,
+        now: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.top_k = top_k
+        self._half_life_s = half_life_days * 86400.0
+        self._landmark = time.time() if now is None else now
+        self._root = _Node()
+        self.scores: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def weight(self, timestamp: float) -> float:
+        """Forward-decay weight of one row logged at `timestamp`."""
+        return 2.0 ** ((timestamp - self._landmark) / self._half_life_s)
+
+    def add(self, term: str, timestamp: Optional[float] = None, count: int = 1) -> None:
+        """Record `count` occurrences of a canonical query."""
+        term = term[:MAX_TERM_LENGTH].strip()
+        if not term:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if timestamp - self._landmark > REBASE_HALF_LIVES * self._half_life_s:
+                self._rebase(timestamp)
+            score = self.scores.get(term, 0.0) + count * self.weight(timestamp)
+            self.scores[term] = score
+            node = self._root
+            self._offer(node, term, score)
+            for ch in term:
+                node = node.children.setdefault(ch, _Node())
+                self._offer(node, term, score)
+            node.terminal = True
+            if len(self.scores) > self.max_entries:
+                self._evict(len(self.scores) - int(self.max_entries * (1 - EVICTION_FRACTION)))
+
+    def complete(self, prefix: str, k: int = 5) -> List[str]:
+        """Best k canonical queries starting with prefix, highest score first."""
+        node = self._root
+        for ch in normalize_prefix(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.top[:k]
+
+    # -------------------------------------------------------------------------
+    # Internals (called with the lock held)
+    # -------------------------------------------------------------------------
+
+    def _offer(self, node: _Node, term: str, score: float) -> None:
+        """Put term in node.top if its (increased) score earns a place."""
+        top = node.top
+        if term in top:
+            top.remove(term)
+        elif len(top) >= self.top_k and score <= self.scores[top[-1]]:
+            return
+        position = 0
+        while position < len(top) and self.scores[top[position]] >= score:
+            position += 1
+        top.insert(position, term)
+        del top[self.top_k:]
+
+    def _rebase(self, landmark: float) -> None:
+        """Move the decay landmark forward, rescaling every score to match."""
+        factor = 2.0 ** ((self._landmark - landmark) / self._half_life_s)
+        for term in self.scores:
+            self.scores[term] *= factor
+        self._landmark = landmark
+
+    def _evict(self, n: int) -> None:
+        """Drop the n coldest terms, prune their branches and repair top-k lists."""
+        for term in heapq.nsmallest(n, self.scores, key=self.scores.get):
+            del self.scores[term]
+            path = [self._root]
+            for ch in term:
+                path.append(path[-1].children[ch])
+            path[-1].terminal = False
+            # Bottom-up: prune empty nodes, rebuild the rest from their children
+            for depth in range(len(term), -1, -1):
+                node = path[depth]
+                if depth and not node.children and not node.terminal:
+                    del path[depth - 1].children[term[depth - 1]]
+                    continue
+                if term not in node.top:
+                    break  # ancestors never list a term their descendant dropped
+                candidates = {t for child in node.children.values() for t in child.top}
+                if node.terminal:
+                    candidates.add(term[:depth])
+                node.top = heapq.nlargest(self.top_k, candidates, key=self.scores.get)
+
+
+def _to_unix(timestamp) -> Optional[float]:
+    """analysis_logs timestamps: ISO strings (SQLite) or datetimes (PostgreSQL)."""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    try:
+        return datetime.fromisoformat(str(timestamp)).timestamp()
+    except ValueError:
+        return None
+
+
+def build_from_rows(rows: Iterable[Tuple[str, object]], **kwargs) -> AutocompleteTrie:
+    """Trie from (query_canonical, timestamp) rows."""
+    trie = AutocompleteTrie(**kwargs)
+    for term, timestamp in rows:
+        if term:
+            trie.add(term, _to_unix(timestamp))
+    return trie
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_autocomplete: Optional[AutocompleteTrie] = None
+_build_lock = threading.Lock()
+
+
+def get_autocomplete() -> AutocompleteTrie:
+    """Shared trie, built from analysis_logs on first use."""
+    global _autocomplete
+    if _autocomplete is None:
+        with _build_lock:
+            if _autocomplete is None:
+                from services.data_logger import get_recent_canonical_queries
+                _autocomplete = build_from_rows(
+                    get_recent_canonical_queries(AppSettings.AUTOCOMPLETE_BOOTSTRAP_ROWS)
+                )
+    return _autocomplete
+
+
+def record_query(query_canonical: str, timestamp: Optional[float] = None) -> None:
+    """Add a newly logged query; a no-op until the trie has been built."""
+    if _autocomplete is not None:
+        _autocomplete.add(query_canonical, timestamp)
+
+
+def suggest_queries(prefix: str, k: int = 5) -> List[str]:
+    """Autocomplete suggestions for a partially typed product query."""
+    if len(normalize_prefix(prefix)) < MIN_PREFIX_LENGTH:
+        return []
+    return get_autocomplete().complete(prefix, k)
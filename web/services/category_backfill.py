@@ -0,0 +1,148 @@
+"""
+NexSupply Category Backfill - Re-classify logged queries after taxonomy changes
+analysis_logs.product_category is written once, from whatever the pipeline
+returned at the time. After CATEGORY_KEYWORDS or COST_TABLES change, trend
+views mix old and new labels. This job re-classifies user_query with the
+current classifier and stamps each row with TAXONOMY_VERSION. The same pass
+fills query_canonical / query_hash on rows logged before those columns existed.
+
+Rows are read with a keyset cursor (id > last_id ORDER BY id LIMIT n), so
+memory stays constant and each batch is its own transaction. Rows already
+stamped with the current version are skipped, which makes the job resumable:
+an interrupted run picks up where it stopped.
+
+Usage (from web/):
+    python -m services.category_backfill --batch-size 2000
+    python -m services.category_backfill --dry-run --limit 10000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.data_logger import _get_placeholder, db_session, init_database, logger
+from utils.cost_tables import COST_TABLES, TAXONOMY_VERSION, classify_category
+from utils.query_canonical import canonicalize_query
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _fetch_stale_batch(cursor, after_id: int, version: str, batch_size: int) -> List[Tuple[int, str, Optional[str]]]:
+    """Next batch of (id, user_query, product_category) not yet on `version`."""
+    placeholder = _get_placeholder()
+    cursor.execute(f"""
+        SELECT id, user_query, product_category
+        FROM analysis_logs
+        WHERE id > {placeholder}
+            AND (taxonomy_version IS NULL OR taxonomy_version != {placeholder})
+        ORDER BY id
+        LIMIT {placeholder}
+    """, (after_id, version, batch_size))
+    return [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+
+
+def classify_batch(queries: List[str]) -> List[str]:
+    """Category label per query; repeated queries in a batch are classified once."""
+    labels: Dict[str, str] = {}
+    for query in queries:
+        if query not in labels:
+            labels[query] = COST_TABLES[classify_category(query or "")]["label"]
+    return [labels[query] for query in queries]
+
+
+def backfill_categories(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    start_after_id: int = 0,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Re-classify analysis_logs rows not yet on the current taxonomy.
+
+    Args:
+        batch_size: Rows per read / executemany / commit
+        start_after_id: Only rows with a larger id (resume point)
+        limit: Stop after this many rows
+        dry_run: Classify and count, but write nothing
+        progress: Called with the running stats after every batch
+
+    Returns:
+        Dictionary with rows_scanned, rows_changed, last_id, elapsed_s,
+        rows_per_s and taxonomy_version
+    """
+    init_database()
+    placeholder = _get_placeholder()
+    stats = {
+        "taxonomy_version": TAXONOMY_VERSION,
+        "rows_scanned": 0,
+        "rows_changed": 0,
+        "last_id": start_after_id,
+        "elapsed_s": 0.0,
+        "rows_per_s": 0.0,
+    }
+    started = time.perf_counter()
+
+    while limit is None or stats["rows_scanned"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - stats["rows_scanned"])
+        # One transaction per batch; db_session commits on exit
+        with db_session() as conn:
+            cursor = conn.cursor()
+            rows = _fetch_stale_batch(cursor, stats["last_id"], TAXONOMY_VERSION, size)
+            if not rows:
+                break
+            labels = classify_batch([query for _, query, _ in rows])
+            if not dry_run:
+                updates = []
+                for (row_id, query, _), label in zip(rows, labels):
+                    canonical = canonicalize_query(query or "")
+                    updates.append((label, TAXONOMY_VERSION, canonical.text, canonical.key, row_id))
+                cursor.executemany(f"""
+                    UPDATE analysis_logs
+                    SET product_category = {placeholder}, taxonomy_version = {placeholder},
+                        query_canonical = {placeholder}, query_hash = {placeholder}
+                    WHERE id = {placeholder}
+                """, updates)
+
+        stats["rows_scanned"] += len(rows)
+        stats["rows_changed"] += sum(old != new for (_, _, old), new in zip(rows, labels))
+        stats["last_id"] = rows[-1][0]
+        stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+        stats["rows_per_s"] = round(stats["rows_scanned"] / stats["elapsed_s"], 1) if stats["elapsed_s"] else 0.0
+        if progress:
+            progress(dict(stats))
+
+    logger.info(f"Category backfill finished: {stats}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-classify analysis_logs.product_category")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--start-after-id", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    def report(stats: Dict[str, Any]) -> None:
+        print(
+            f"scanned={stats['rows_scanned']:,} changed={stats['rows_changed']:,} "
+            f"last_id={stats['last_id']} {stats['rows_per_s']:,.0f} rows/s",
+            flush=True,
+        )
+
+    stats = backfill_categories(
+        batch_size=args.batch_size,
+        start_after_id=args.start_after_id,
+        limit=args.limit,
+        dry_run=args.dry_run,
+        progress=report,
+    )
+    print(f"Done ({'dry run, ' if args.dry_run else ''}taxonomy {stats['taxonomy_version']}): "
+          f"{stats['rows_scanned']:,} rows in {stats['elapsed_s']}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
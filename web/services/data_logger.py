@@ -185,6 +185,16 @@ def _adapt_datetime_function(days: int) -> str:
 # DATABASE INITIALIZATION
 # =============================================================================
 
+def _ensure_column(cursor, table: str, column: str, column_type: str) -> None:
+    """Add a column to an existing table if it is missing."""
+    if _db_type == 'postgresql':
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}")
+        return
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
 def init_database():
     """Initialize database with required tables."""
     global _db_type
@@ -215,6 +225,9 @@ def init_database():
                     session_id TEXT,
                     request_source TEXT DEFAULT 'web',
                     processing_time_ms INTEGER,
+                    taxonomy_version TEXT,
+                    query_canonical TEXT,
+                    query_hash TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
@@ -261,6 +274,9 @@ def init_database():
                     session_id TEXT,
                     request_source TEXT DEFAULT 'web',
                     processing_time_ms INTEGER,
+                    taxonomy_version TEXT,
+                    query_canonical TEXT,
+                    query_hash TEXT,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
@@ -290,11 +306,17 @@ def init_database():
                 )
             """)
         
+        # Columns added after the first release
+        _ensure_column(cursor, "analysis_logs", "taxonomy_version", "TEXT")
+        _ensure_column(cursor, "analysis_logs", "query_canonical", "TEXT")
+        _ensure_column(cursor, "analysis_logs", "query_hash", "TEXT")
+        
         # Create indexes
         try:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON analysis_logs(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_mode ON analysis_logs(analysis_mode)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_category ON analysis_logs(product_category)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_query_hash ON analysis_logs(query_hash)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_mode_usage_name ON mode_usage(mode_name)")
         except Exception as e:
             logger.warning(f"Index creation warning (may already exist): {e}")
@@ -331,6 +353,10 @@ def log_analysis(
         confidence = json_data.get("analysis_confidence", 0)
         product_info = json_data.get("product_info", {})
         product_category = product_info.get("category", "Unknown")
+        # The pipeline labeled the row with the current classifier; rows with
+        # no label are left unstamped for the category backfill
+        from utils.cost_tables import TAXONOMY_VERSION
+        taxonomy_version = TAXONOMY_VERSION if "category" in product_info else None
         
         landed_cost = json_data.get("landed_cost", {})
         estimated_cost = landed_cost.get("cost_per_unit_usd", 0)
@@ -357,6 +383,8 @@ def log_analysis(
         
         timestamp = datetime.now().isoformat()
         placeholder = _get_placeholder()
+        from utils.query_canonical import canonicalize_query
+        canonical = canonicalize_query(query)
         
         with db_session() as conn:
             cursor = conn.cursor()
@@ -365,10 +393,10 @@ def log_analysis(
                     timestamp, user_query, analysis_mode, confidence_score,
                     product_category, estimated_landed_cost, supplier_count,
                     top_risk_factors, ai_result_json, user_email, session_id,
-                    processing_time_ms
+                    processing_time_ms, query_canonical, query_hash, taxonomy_version
                 ) VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
                          {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
-                         {placeholder}, {placeholder})
+                         {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
             """, (
                 timestamp,
                 query,
@@ -381,14 +409,22 @@ def log_analysis(
                 json_str,
                 user_email,
                 session_id,
-                processing_time_ms
+                processing_time_ms,
+                canonical.text,
+                canonical.key,
+                taxonomy_version
             ))
             
             if _db_type == 'postgresql':
                 cursor.execute("SELECT LASTVAL()")
-                return cursor.fetchone()[0]
+                log_id = cursor.fetchone()[0]
             else:
-                return cursor.lastrowid
+                log_id = cursor.lastrowid
+        
+        # Keep autocomplete suggestions current without a rebuild
+        from services.autocomplete import record_query
+        record_query(canonical.text)
+        return log_id
             
     except Exception as e:
         logger.error(f"Error logging analysis: {e}", exc_info=True)
@@ -528,11 +564,17 @@ def get_top_queries(limit: int = 20, days: int = 30) -> List[Dict]:
             if _db_type == 'postgresql':
                 cursor = conn.cursor(cursor_factory=RealDictCursor)
             
+            # Spelling variants share a query_hash; rows logged before the
+            # column existed fall back to their raw text
             cursor.execute(f"""
-                SELECT user_query, COUNT(*) as count, analysis_mode
+                SELECT
+                    MIN(user_query) as user_query,
+                    MIN(query_canonical) as query_canonical,
+                    COUNT(*) as count,
+                    analysis_mode
                 FROM analysis_logs
                 WHERE timestamp >= {date_expr}
-                GROUP BY user_query, analysis_mode
+                GROUP BY COALESCE(query_hash, user_query), analysis_mode
                 ORDER BY count DESC
                 LIMIT {placeholder}
             """, (limit,))
@@ -544,6 +586,33 @@ def get_top_queries(limit: int = 20, days: int = 30) -> List[Dict]:
         return []
 
 
+def get_analyses_for_query(query: str, limit: int = 20) -> List[Dict]:
+    """Logged analyses of the same product request (any spelling), newest first."""
+    try:
+        from utils.query_canonical import canonicalize_query
+        placeholder = _get_placeholder()
+        
+        with db_session() as conn:
+            cursor = conn.cursor()
+            if _db_type == 'postgresql':
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            cursor.execute(f"""
+                SELECT id, timestamp, user_query, analysis_mode, product_category,
+                    estimated_landed_cost, confidence_score
+                FROM analysis_logs
+                WHERE query_hash = {placeholder}
+                ORDER BY id DESC
+                LIMIT {placeholder}
+            """, (canonicalize_query(query).key, limit))
+            
+            return _fetch_rows_as_dict(cursor)
+            
+    except Exception as e:
+        logger.error(f"Error getting analyses for query: {e}", exc_info=True)
+        return []
+
+
 def get_mode_distribution(days: int = 30) -> Dict[str, int]:
     """Get distribution of analysis modes used."""
     try:
@@ -602,6 +671,57 @@ def get_category_trends(days: int = 30) -> List[Dict]:
         return []
 
 
+def get_labeled_queries(limit: int = 5000) -> List[Tuple[str, str]]:
+    """Get (user_query, product_category) pairs from logged analyses, newest first."""
+    try:
+        placeholder = _get_placeholder()
+
+        with db_session() as conn:
+            cursor = conn.cursor()
+            if _db_type == 'postgresql':
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            cursor.execute(f"""
+                SELECT user_query, product_category
+                FROM analysis_logs
+                WHERE product_category IS NOT NULL
+                    AND product_category != 'Unknown'
+                ORDER BY id DESC
+                LIMIT {placeholder}
+            """, (limit,))
+
+            return [
+                (row['user_query'], row['product_category'])
+                for row in _fetch_rows_as_dict(cursor)
+            ]
+
+    except Exception as e:
+        logger.error(f"Error getting labeled queries: {e}", exc_info=True)
+        return []
+
+
+def get_recent_canonical_queries(limit: int = 50000) -> List[Tuple[str, Any]]:
+    """Get (query_canonical, timestamp) of the most recent logged analyses."""
+    try:
+        placeholder = _get_placeholder()
+
+        with db_session() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT query_canonical, timestamp
+                FROM analysis_logs
+                WHERE query_canonical IS NOT NULL
+                ORDER BY id DESC
+                LIMIT {placeholder}
+            """, (limit,))
+
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    except Exception as e:
+        logger.error(f"Error getting recent canonical queries: {e}", exc_info=True)
+        return []
+
+
 def get_risk_trends(days: int = 30) -> Dict[str, int]:
     """Get frequency of different risk factors mentioned."""
     try:
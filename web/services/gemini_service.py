@@ -4,13 +4,16 @@ Uses centralized prompts from utils/prompts.py for easy maintenance.
 """
 from __future__ import annotations
 
+import contextlib
 import os
 import json
-import re
 import logging
 import functools
+import threading
+import time
 import streamlit as st
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,6 +21,10 @@ import google.generativeai as genai
 
 # Import centralized prompts
 from utils.prompts import build_analysis_prompt, build_image_analysis_prompt
+from utils.config import AppSettings
+from utils.lexicon import ANALYSIS_MODES, scan_query
+from utils.rate_limiter import RateLimiter
+from utils.singleflight import SingleFlight
 
 # Load .env for local development
 load_dotenv(override=False)
@@ -164,40 +171,58 @@ def configure_gemini() -> bool:
         return False
 
 
-# =============================================================================
-# MODE DETECTION
-# =============================================================================
+# Every Gemini call in the process goes through this limiter, so concurrent
+# pipelines (multi-product fan-out, shadow extraction) share one quota
+LLM_RATE_LIMITER = RateLimiter(
+    max_concurrent=AppSettings.LLM_MAX_CONCURRENT_REQUESTS,
+    requests_per_minute=AppSettings.LLM_REQUESTS_PER_MINUTE
+)
+
+# Background LLM calls issued alongside a request's main call (extraction);
+# requests wait on their futures, never the reverse
+LLM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=AppSettings.LLM_MAX_CONCURRENT_REQUESTS,
+    thread_name_prefix="llm"
+)
+
+# Shadow comparisons are measurement only: one worker of their own, so they
+# never queue ahead of request-critical extraction on LLM_EXECUTOR
+SHADOW_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-shadow")
+_shadow_lock = threading.Lock()
+_shadow_pending: Optional[Future] = None
+
+
+def submit_shadow(fn: Callable[..., Any], *args) -> Optional[Future]:
+    """Run fn on SHADOW_EXECUTOR, or skip it (None) while the previous one is unfinished."""
+    global _shadow_pending
+    with _shadow_lock:
+        if _shadow_pending is not None and not _shadow_pending.done():
+            return None
+        _shadow_pending = SHADOW_EXECUTOR.submit(fn, *args)
+        return _shadow_pending
 
-ANALYSIS_MODES = {
-    "verify": {
-        "keywords": ["verify", "verification", "check", "legitimate", "real factory", 
-                     "trading company", "alibaba supplier", "검증", "확인", "scam", "fraud"],
-    },
-    "cost": {
-        "keywords": ["cost", "landed cost", "calculate", "price", "freight", "customs", 
-                     "FOB", "duty", "tariff", "비용", "가격", "랜딩", "관세"],
-    },
-    "market": {
-        "keywords": ["market", "analysis", "demand", "trend", "competition", "margin",
-                     "opportunity", "시장", "분석", "트렌드", "수요"],
-    },
-    "leadtime": {
-        "keywords": ["lead time", "delivery", "timeline", "shipping", "production time",
-                     "when", "how long", "리드타임", "배송", "일정", "납기"],
+# Identical analyses in flight at the same time share one LLM call; keyed on
+# the insight cache key (hybrid insights) and the whitespace-folded query
+# (extraction, whose answer depends on the exact quantities)
+INSIGHT_FLIGHTS = SingleFlight()
+EXTRACTION_FLIGHTS = SingleFlight()
+
+
+def get_coalescing_stats() -> Dict[str, Dict[str, Any]]:
+    """How many LLM calls were coalesced into identical in-flight calls."""
+    return {
+        "insights": INSIGHT_FLIGHTS.stats(),
+        "extraction": EXTRACTION_FLIGHTS.stats(),
     }
-}
 
 
+# =============================================================================
+# MODE DETECTION
+# =============================================================================
+
 def detect_analysis_mode(query: str) -> str:
-    """Detect analysis mode from query content."""
-    query_lower = query.lower()
-    
-    for mode, config in ANALYSIS_MODES.items():
-        for keyword in config["keywords"]:
-            if keyword.lower() in query_lower:
-                return mode
-    
-    return "general"
+    """Detect analysis mode from query content (first ANALYSIS_MODES entry with a keyword hit)."""
+    return scan_query(query).mode
 
 
 # =============================================================================
@@ -240,41 +265,95 @@ class GeminiService:
             )
         return self._model
     
-    def _clean_json_response(self, response_text: str) -> str:
-        """Extract pure JSON from AI response."""
-        cleaned = response_text.strip()
-        
-        # Remove markdown code blocks
-        patterns = [
-            r'^```json\s*\n?(.*?)\n?```$',
-            r'^```\s*\n?(.*?)\n?```$',
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, cleaned, re.DOTALL | re.IGNORECASE)
-            if match:
-                cleaned = match.group(1).strip()
-                break
-        
-        # Extract JSON object
-        first_brace = cleaned.find('{')
-        last_brace = cleaned.rfind('}')
-        
-        if first_brace != -1 and last_brace != -1:
-            cleaned = cleaned[first_brace:last_brace + 1]
+    def _generate_content(self, contents):
+        """model.generate_content() under the shared LLM rate limiter."""
+        model = self._get_model()
+        with LLM_RATE_LIMITER:
+            return model.generate_content(contents)
+
+    def _stream_content(self, contents) -> Iterator[str]:
+        """
+        Text chunks of a streamed generate_content() call, holding one limiter slot until the stream ends.
+
+        Consume it inside contextlib.closing() so the slot is released as soon
+        as the consumer stops, not when the generator is garbage-collected.
+        """
+        model = self._get_model()
+        with LLM_RATE_LIMITER:
+            for chunk in model.generate_content(contents, stream=True):
+                text = getattr(chunk, "text", "")
+                if text:
+                    yield text
+
+    def _parse_json_response(self, response_text: str) -> tuple:
+        """Parse (and if needed repair) the JSON object in an AI response."""
+        from utils.streaming_json import parse_llm_json
         
-        return cleaned
+        parsed = parse_llm_json(response_text)
+        if parsed.data is None:
+            return None, f"JSON parsing failed: {parsed.error}"
+        if parsed.repairs:
+            logger.info(f"Repaired AI response JSON: {parsed.repairs}")
+        return parsed.data, None
     
-    def _parse_json_response(self, response_text: str) -> tuple:
-        """Parse JSON from AI response."""
+    def _extract_with_llm(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract volume / channel / target market with the extraction prompt.
+        
+        Returns:
+            Normalized values (see normalize_extracted_values), or None on failure
+        """
         try:
-            cleaned = self._clean_json_response(response_text)
-            data = json.loads(cleaned)
-            return data, None
-        except json.JSONDecodeError as e:
-            return None, f"JSON parsing failed: {str(e)}"
+            from utils.extraction_prompts import (
+                build_extraction_prompt,
+                normalize_extracted_values,
+                validate_and_normalize_extraction
+            )
+            from utils.rule_extractor import EXTRACTION_MONITOR
+            
+            prompt = build_extraction_prompt(query)
+            started = time.perf_counter()
+            response = self._generate_content(prompt)
+            EXTRACTION_MONITOR.record_llm_latency((time.perf_counter() - started) * 1000)
+            
+            if response and response.text:
+                # Use Pydantic validation
+                extracted_dict, error = validate_and_normalize_extraction(response.text)
+                if not error and extracted_dict:
+                    logger.info(f"Successfully extracted: {extracted_dict}")
+                    return extracted_dict
+                # Fallback to old parsing if validation fails
+                logger.warning(f"Extraction validation failed: {error}, using fallback parser")
+                data, parse_error = self._parse_json_response(response.text)
+                if not parse_error and data:
+                    extracted = normalize_extracted_values(data)
+                    logger.info(f"Fallback extraction successful: {extracted}")
+                    return extracted
+        except ImportError as e:
+            logger.warning(f"Extraction module not available: {e}, using fallback parser")
+        except Exception as e:
+            logger.warning(f"Extraction failed: {e}, using fallback parser", exc_info=True)
+        return None
     
-    def analyze_product(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_with_llm_shared(self, query: str) -> Optional[Dict[str, Any]]:
+        """_extract_with_llm(), coalesced with identical concurrent extractions."""
+        return EXTRACTION_FLIGHTS.do(" ".join(query.split()), self._extract_with_llm, query)[0]
+    
+    def _shadow_compare_extraction(self, query: str, rule_values: Dict[str, Any]) -> None:
+        """Run the LLM extraction for a fast-path request and record agreement."""
+        from utils.rule_extractor import EXTRACTION_MONITOR
+        
+        llm_values = self._extract_with_llm(query)
+        if llm_values:
+            agrees = EXTRACTION_MONITOR.record_comparison(rule_values, llm_values)
+            if not all(agrees.values()):
+                logger.info(f"Rule/LLM extraction mismatch: {agrees}")
+    
+    def analyze_product(
+        self,
+        input_data: Dict[str, Any],
+        on_partial: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze a product sourcing query using hybrid system (rule-based + AI).
         
@@ -283,6 +362,8 @@ class GeminiService:
         
         Args:
             input_data: Dict with query, file_bytes, file_mime_type
+            on_partial: Called with (key, value) for each section of the
+                analysis as soon as it is available (see analyze_with_hybrid_system)
         
         Returns:
             {"success": True/False, "data": result_or_error, "mode": analysis_mode}
@@ -297,43 +378,41 @@ class GeminiService:
         # Detect analysis mode
         mode = detect_analysis_mode(query) if query else "general"
         
+        # Several products in one query: one pipeline per product, in parallel
+        if query and not file_bytes:
+            from utils.query_splitter import split_products
+            segments = split_products(query, max_segments=AppSettings.MULTI_PRODUCT_MAX_SEGMENTS)
+            if segments:
+                return self._analyze_multi_product(query, segments, input_data, mode)
+        
         try:
-            # Step 1: Extract structured data from user input using LLM
+            # Step 1: Extract structured data - rules first, LLM only for ambiguous input
+            from utils.rule_extractor import (
+                EXTRACTION_MONITOR,
+                extract_rule_based,
+                should_shadow_sample,
+            )
+            
             extracted_values = None
-            if query and self.is_configured:
-                try:
-                    from utils.extraction_prompts import (
-                        EXTRACTION_USER_PROMPT_TEMPLATE,
-                        normalize_extracted_values,
-                        validate_and_normalize_extraction
-                    )
-                    
-                    # Build extraction prompt with user message
-                    extraction_prompt = EXTRACTION_USER_PROMPT_TEMPLATE.format(user_message=query)
-                    
-                    model = self._get_model()
-                    response = model.generate_content(extraction_prompt)
-                    
-                    if response and response.text:
-                        # Use Pydantic validation
-                        extracted_dict, error = validate_and_normalize_extraction(response.text)
-                        if not error and extracted_dict:
-                            extracted_values = extracted_dict
-                            logger.info(f"Successfully extracted: {extracted_values}")
-                        elif error:
-                            # Fallback to old parsing if validation fails
-                            logger.warning(f"Extraction validation failed: {error}, using fallback parser")
-                            data, parse_error = self._parse_json_response(response.text)
-                            if not parse_error and data:
-                                extracted_values = normalize_extracted_values(data)
-                                logger.info(f"Fallback extraction successful: {extracted_values}")
-                except ImportError as e:
-                    logger.warning(f"Extraction module not available: {e}, using fallback parser")
-                except Exception as e:
-                    logger.warning(f"Extraction failed: {e}, using fallback parser", exc_info=True)
+            pending_extraction = None
+            extraction_path = "fallback_rules"
+            rule_extraction = extract_rule_based(query) if query else None
+            if rule_extraction and rule_extraction["confident"]:
+                extracted_values = rule_extraction["values"]
+                extraction_path = "rules"
+                if self.is_configured and should_shadow_sample():
+                    # Measure agreement with the LLM off the request path
+                    submit_shadow(self._shadow_compare_extraction, query, extracted_values)
+            elif query and self.is_configured:
+                # The insight prompt doesn't need the extracted values, so the
+                # extraction call runs alongside it and is reconciled afterwards
+                pending_extraction = LLM_EXECUTOR.submit(self._extract_with_llm_shared, query)
             
             # Step 2: Use extracted values or fallback to input parser
-            if extracted_values:
+            if pending_extraction is not None:
+                # Left empty so the LLM extraction outranks the input parser
+                units = channel = target_market = route = None
+            elif extracted_values:
                 units = extracted_values.get("volume_units")
                 channel = extracted_values.get("channel")
                 target_market = extracted_values.get("target_market")
@@ -361,9 +440,15 @@ class GeminiService:
                 channel=channel,
                 retail_price=None,
                 file_bytes=file_bytes,
-                research_data=research_data
+                research_data=research_data,
+                pending_extraction=pending_extraction,
+                on_partial=on_partial
             )
             
+            if pending_extraction is not None and pending_extraction.result():
+                extraction_path = "llm"
+            EXTRACTION_MONITOR.record_path(extraction_path)
+            
             if result["success"]:
                 # Convert to expected format
                 dashboard_data = result["data"]
@@ -383,7 +468,12 @@ class GeminiService:
                     # Don't break main flow if logging fails
                     logger.warning(f"Logging skipped: {log_err}")
                 
-                return {"success": True, "data": dashboard_data, "mode": mode}
+                return {
+                    "success": True,
+                    "data": dashboard_data,
+                    "mode": mode,
+                    "extraction_path": extraction_path,
+                }
             else:
                 return result
         
@@ -404,6 +494,118 @@ class GeminiService:
             logger.error(f"Unexpected error in analysis: {e}", exc_info=True)
             return {"success": False, "data": f"Analysis failed: {type(e).__name__}", "mode": mode}
     
+    def _analyze_multi_product(
+        self,
+        query: str,
+        segments: List[Any],
+        input_data: Dict[str, Any],
+        mode: str
+    ) -> Dict[str, Any]:
+        """
+        Analyze each product of a multi-product query concurrently.
+
+        Market, channel and route are usually stated once ("... for Amazon US"),
+        so they are read from the whole query and shared by every product.
+        All pipelines use the process-wide Gemini client and rate limiter, so
+        total latency tracks the slowest product rather than the sum.
+
+        Each product's extraction path is recorded like a single-product
+        request: "rules" when its quantity and the shared market and channel
+        all clear the fast-path threshold, else "fallback_rules".
+
+        Returns:
+            analyze_product() result whose `data` is the first product's
+            dashboard, plus `products` (one section per product, with its
+            extraction_path) and `totals` (the products priced as one
+            consolidated shipment). The top-level extraction_path is "rules"
+            only if every product took the fast path.
+        """
+        from utils.consolidation import compute_consolidated_shipment
+        from utils.cost_calculator import OrderParams
+        from utils.cost_tables import classify_category
+        from utils.research_data import parse_research_data_from_text
+        from utils.rule_extractor import EXTRACTION_MONITOR, FAST_PATH_FIELDS, extract_rule_based
+
+        shared_extraction = extract_rule_based(query)
+        shared = shared_extraction["values"]
+        research_data = parse_research_data_from_text(input_data.get("context_query", "") or query)
+
+        service = get_gemini_service()
+        if service.is_configured:
+            try:
+                service._get_model()  # create the shared client before fanning out
+            except RuntimeError as e:
+                logger.warning(f"Gemini unavailable, products analyzed without AI insights: {e}")
+
+        def analyze_segment(segment) -> Dict[str, Any]:
+            try:
+                return analyze_with_hybrid_system(
+                    query=segment.text,
+                    units=segment.units,
+                    route=shared["route"],
+                    target_market=shared["target_market"],
+                    channel=shared["channel"],
+                    retail_price=None,
+                    research_data=research_data
+                )
+            except Exception as e:
+                logger.error(f"Product analysis failed for {segment.text!r}: {e}", exc_info=True)
+                return {"success": False, "data": f"Analysis failed: {type(e).__name__}"}
+
+        def extraction_path(segment) -> str:
+            # Units come from the segment, market and channel from the whole query
+            confidence = dict(
+                shared_extraction["confidence"],
+                volume_units=extract_rule_based(segment.text)["confidence"]["volume_units"]
+            )
+            threshold = AppSettings.EXTRACTION_FAST_PATH_MIN_CONFIDENCE
+            return "rules" if all(confidence[field] >= threshold for field in FAST_PATH_FIELDS) else "fallback_rules"
+
+        with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+            results = list(pool.map(analyze_segment, segments))
+        paths = [extraction_path(segment) for segment in segments]
+        for path in paths:
+            EXTRACTION_MONITOR.record_path(path)
+
+        products = [
+            {
+                "query": segment.text,
+                "units": segment.units,
+                "category_id": classify_category(segment.text),
+                "success": result["success"],
+                "data": result["data"],
+                "extraction_path": path,
+            }
+            for segment, result, path in zip(segments, results, paths)
+        ]
+        analyzed = [product for product in products if product["success"]]
+        if not analyzed:
+            return {"success": False, "data": "Analysis failed for every product in the request.", "mode": mode}
+
+        totals = compute_consolidated_shipment([
+            OrderParams(category_id=product["category_id"], units=product["units"], route=shared["route"])
+            for product in analyzed
+        ])
+        totals["products_analyzed"] = len(analyzed)
+        totals["products_failed"] = len(products) - len(analyzed)
+
+        try:
+            from services.data_logger import log_analysis
+            for product in analyzed:
+                log_analysis(query=product["query"], mode=mode, json_data=product["data"])
+        except (ImportError, OSError, ValueError) as log_err:
+            logger.warning(f"Logging skipped: {log_err}")
+
+        return {
+            "success": True,
+            "data": analyzed[0]["data"],
+            "mode": mode,
+            "multi_product": True,
+            "products": products,
+            "totals": totals,
+            "extraction_path": "rules" if all(path == "rules" for path in paths) else "fallback_rules",
+        }
+
     def get_mock_analysis(self, query: str = "") -> Dict[str, Any]:
         """Return comprehensive mock data for demo/testing."""
         return {
@@ -595,15 +797,55 @@ class GeminiService:
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
+_gemini_service: Optional[GeminiService] = None
+
+
 def get_gemini_service() -> GeminiService:
-    """Get a GeminiService instance."""
-    return GeminiService()
+    """Get the process-wide GeminiService (one model client for every pipeline)."""
+    global _gemini_service
+    if _gemini_service is None:
+        _gemini_service = GeminiService()
+    return _gemini_service
 
 
 # =============================================================================
 # HYBRID ANALYSIS (Calculator + AI Insights)
 # =============================================================================
 
+def _emit_partial(on_partial: Optional[Callable[[str, Any], None]], key: str, value: Any) -> None:
+    """Pass one section to the progress callback; a failing callback is logged, not raised."""
+    if on_partial is None:
+        return
+    try:
+        on_partial(key, value)
+    except Exception as e:
+        # A rendering problem must not cost the analysis
+        logger.warning(f"Partial result callback failed for {key}: {e}")
+
+
+def _stream_insights(
+    service: GeminiService,
+    contents,
+    on_partial: Callable[[str, Any], None]
+) -> str:
+    """
+    Stream the insight call, passing each top-level key to on_partial as it closes.
+
+    Returns:
+        The full response text
+    """
+    from utils.streaming_json import IncrementalJSONParser
+
+    parser = IncrementalJSONParser()
+    pieces = []
+    with contextlib.closing(service._stream_content(contents)) as stream:
+        for text in stream:
+            pieces.append(text)
+            for key, value in parser.feed(text):
+                _emit_partial(on_partial, key, value)
+    return "".join(pieces)
+
+
 def analyze_with_hybrid_system(
     query: str,
     units: int = None,
@@ -612,7 +854,9 @@ def analyze_with_hybrid_system(
     channel: str = None,
     retail_price: Optional[float] = None,
     file_bytes: Optional[bytes] = None,
-    research_data: Optional[Dict[str, Any]] = None
+    research_data: Optional[Dict[str, Any]] = None,
+    pending_extraction: Optional[Future] = None,
+    on_partial: Optional[Callable[[str, Any], None]] = None
 ) -> Dict[str, Any]:
     """
     Hybrid analysis: Rule-based cost calculation + AI insights.
@@ -630,13 +874,20 @@ def analyze_with_hybrid_system(
         channel: Sales channel (defaults to AppSettings.DEFAULT_CHANNEL)
         retail_price: Expected retail price
         file_bytes: Optional image data
+        pending_extraction: Future of an extraction LLM call issued alongside
+            this one; its values rank below the insight response's and above
+            the input parser's
+        on_partial: Progress callback. Receives ("landed_cost", result) as
+            soon as the rule engine is done, then each top-level key of the
+            AI insights as it streams in. When given, the insight call is
+            streamed; the returned result is the same either way.
     
     Returns:
         Complete analysis result
     """
     from utils.config import AppSettings
     from utils.cost_tables import classify_category, get_category_config
-    from utils.cost_calculator import OrderParams, compute_landed_cost
+    from utils.cost_calculator import OrderParams, cached_landed_cost
     from utils.result_builder import build_nexsupply_result, convert_to_dashboard_format
     from utils.prompts import build_hybrid_prompt, HYBRID_SYSTEM_PROMPT
     
@@ -661,63 +912,117 @@ def analyze_with_hybrid_system(
         incoterm=AppSettings.DEFAULT_INCOTERM,
         retail_price_per_unit=retail_price
     )
-    landed_cost_result = compute_landed_cost(order)
+    landed_cost_result = cached_landed_cost(order)
+    _emit_partial(on_partial, "landed_cost", landed_cost_result)
     
     # Step 4: Get AI insights (if API configured) - AI will extract volume, channel, target_market
     ai_insights = None
+    insight_source = "default"
     service = get_gemini_service()
     
     if service.is_configured:
         try:
-            # Build hybrid prompt with research data
-            prompt = build_hybrid_prompt(
-                user_input=query,
-                category_id=category_id,
-                category_label=cfg["label"],
-                landed_cost_json=json.dumps(landed_cost_result, indent=2),
-                image_summary="Image provided for analysis." if file_bytes else "",
-                suppliers_db_json="[]",  # Use default suppliers
-                research_data=research_data
+            # An equivalent earlier analysis (same canonical query, category,
+            # order-size bucket, route, research data, image and prompt) can
+            # reuse its qualitative insights; numbers are recomputed either way
+            from services.insight_cache import get_insight_cache, insight_cache_key
+            cache = get_insight_cache()
+            cache_key = insight_cache_key(
+                query, category_id, temp_units, temp_route,
+                target_market=temp_target_market,
+                channel=temp_channel,
+                research_data=research_data,
+                file_bytes=file_bytes
             )
+            data = cache.get(cache_key) if cache else None
             
-            model = service._get_model()
-            
-            # Call with system prompt
-            full_prompt = f"{HYBRID_SYSTEM_PROMPT}\n\n{prompt}"
-            
-            if file_bytes:
-                image_part = {"mime_type": "image/jpeg", "data": file_bytes}
-                response = model.generate_content([full_prompt, image_part])
+            if data is not None:
+                insight_source = "ai_cache"
+                for key, value in data.items():
+                    _emit_partial(on_partial, key, value)
             else:
-                response = model.generate_content(full_prompt)
+                # Build hybrid prompt with research data
+                prompt = build_hybrid_prompt(
+                    user_input=query,
+                    category_id=category_id,
+                    category_label=cfg["label"],
+                    landed_cost_json=json.dumps(landed_cost_result, indent=2),
+                    image_summary="Image provided for analysis." if file_bytes else "",
+                    suppliers_db_json="[]",  # Use default suppliers
+                    research_data=research_data
+                )
+                
+                # Call with system prompt
+                full_prompt = f"{HYBRID_SYSTEM_PROMPT}\n\n{prompt}"
+                
+                if file_bytes:
+                    image_part = {"mime_type": "image/jpeg", "data": file_bytes}
+                    contents = [full_prompt, image_part]
+                else:
+                    contents = full_prompt
+                
+                def fetch_insights() -> str:
+                    if on_partial:
+                        return _stream_insights(service, contents, on_partial)
+                    response = service._generate_content(contents)
+                    return response.text if response else ""
+                
+                # Sessions submitting the same analysis at the same moment
+                # share one call; each still builds and logs its own result
+                response_text, shared = INSIGHT_FLIGHTS.do(cache_key, fetch_insights)
+                
+                if response_text:
+                    # Streamed or not, the full text is parsed once more so
+                    # both paths produce the same insights
+                    from utils.streaming_json import parse_llm_json
+                    response_json = parse_llm_json(response_text)
+                    data = response_json.data
+                    if response_json.repairs:
+                        logger.info(f"Repaired insight response JSON: {response_json.repairs}")
+                    if data is not None and shared:
+                        insight_source = "ai_shared"
+                        for key, value in data.items():
+                            _emit_partial(on_partial, key, value)
+                    elif data is not None:
+                        insight_source = "ai"
+                        # A cut-off response is usable once but not worth keeping
+                        if cache and not response_json.truncated:
+                            cache.put(cache_key, data)
             
-            if response and response.text:
-                data, error = service._parse_json_response(response.text)
-                if not error:
-                    ai_insights = data
-                    
-                    # Inject research data into AI insights if provided
-                    if research_data and ai_insights:
-                        from utils.research_data import inject_research_data
-                        ai_insights = inject_research_data(ai_insights, research_data)
+            if data:
+                ai_insights = data
+                
+                # Inject research data into AI insights if provided
+                if research_data:
+                    from utils.research_data import inject_research_data
+                    ai_insights = inject_research_data(ai_insights, research_data)
+                
+                # Extract values from AI response (priority 1: AI extraction).
+                # Cached and coalesced insights are shared by spelling variants
+                # with other quantities, so only an own response may override them.
+                if insight_source == "ai":
+                    extracted_units = ai_insights.get("volume_units")
+                    extracted_target_market = ai_insights.get("target_market")
+                    extracted_channel = ai_insights.get("channel")
                     
-                    # Extract values from AI response (priority 1: AI extraction)
-                    if ai_insights:
-                        extracted_units = ai_insights.get("volume_units")
-                        extracted_target_market = ai_insights.get("target_market")
-                        extracted_channel = ai_insights.get("channel")
-                        
-                        # Use AI-extracted values if available
-                        if extracted_units and isinstance(extracted_units, (int, float)) and extracted_units > 0:
-                            units = int(extracted_units)
-                        if extracted_target_market and extracted_target_market.strip():
-                            target_market = extracted_target_market.strip()
-                        if extracted_channel and extracted_channel.strip():
-                            channel = extracted_channel.strip()
+                    # Use AI-extracted values if available
+                    if extracted_units and isinstance(extracted_units, (int, float)) and extracted_units > 0:
+                        units = int(extracted_units)
+                    if extracted_target_market and extracted_target_market.strip():
+                        target_market = extracted_target_market.strip()
+                    if extracted_channel and extracted_channel.strip():
+                        channel = extracted_channel.strip()
         except Exception as e:
             logger.error(f"AI insights failed: {e}", exc_info=True)
     
     # Step 5: Use extracted values or fallbacks (priority: AI > input parser > defaults)
+    if pending_extraction is not None:
+        extracted = pending_extraction.result() or {}
+        units = units or extracted.get("volume_units")
+        target_market = target_market or extracted.get("target_market")
+        channel = channel or extracted.get("channel")
+        route = route or extracted.get("route")
+    
     final_units = units or parsed.get("volume_units", AppSettings.DEFAULT_VOLUME_UNITS)
     final_target_market = target_market or parsed.get("target_market", AppSettings.DEFAULT_TARGET_MARKET)
     final_channel = channel or parsed.get("channel", AppSettings.DEFAULT_CHANNEL)
@@ -732,7 +1037,7 @@ def analyze_with_hybrid_system(
             incoterm=AppSettings.DEFAULT_INCOTERM,
             retail_price_per_unit=retail_price
         )
-        landed_cost_result = compute_landed_cost(order)
+        landed_cost_result = cached_landed_cost(order)
     
     # Step 7: Build final result with extracted values
     try:
@@ -743,7 +1048,8 @@ def analyze_with_hybrid_system(
             target_market=final_target_market,
             channel=final_channel,
             retail_price=retail_price,
-            ai_insights=ai_insights
+            ai_insights=ai_insights,
+            category_id=category_id
         )
         
         # Step 5: Convert to dashboard format for backward compatibility
@@ -755,7 +1061,7 @@ def analyze_with_hybrid_system(
             "data": dashboard_data,
             "full_result": result,
             "calculation_source": "rule_based",
-            "insight_source": "ai" if ai_insights else "default"
+            "insight_source": insight_source
         }
     except Exception as e:
         logger.error(f"Error building result: {e}", exc_info=True)
@@ -0,0 +1,208 @@
+"""
+NexSupply Insight Cache - Persistent cache for qualitative AI insights
+analyze_with_hybrid_system() sends the full hybrid prompt to Gemini on every
+analysis, even when the same product was analyzed a minute earlier. The
+insights it returns (market notes, risks, supplier guidance) depend on the
+product, category, rough order size, route and prompt - not on the exact
+numbers, which the rule engine recomputes every time. This module stores
+those insights in a local SQLite file keyed on exactly those inputs.
+
+    key = hash(canonical query, category id, units bucket, route, market,
+               channel, research-data hash, image hash, prompt version,
+               cost-table version)
+
+Entries expire after AppSettings.INSIGHT_CACHE_TTL_HOURS. The table is kept
+at INSIGHT_CACHE_MAX_ENTRIES by evicting least recently used rows.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.config import AppSettings
+
+logger = logging.getLogger(__name__)
+
+
+def units_bucket(units: Optional[int]) -> Optional[int]:
+    """Half-decade bucket of an order size: 1,000-3,161 -> 6, 3,162-9,999 -> 7, ..."""
+    if not units or units <= 0:
+        return None
+    return int(math.floor(math.log10(units) * 2))
+
+
+def _digest(data: Any) -> Optional[str]:
+    if data is None:
+        return None
+    if isinstance(data, (bytes, bytearray)):
+        return hashlib.sha256(data).hexdigest()
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def insight_cache_key(
+    query: str,
+    category_id: str,
+    units: Optional[int],
+    route: Optional[str],
+    target_market: Optional[str] = None,
+    channel: Optional[str] = None,
+    research_data: Optional[Dict[str, Any]] = None,
+    file_bytes: Optional[bytes] = None
+) -> str:
+    """Cache key of one hybrid-prompt call."""
+    from utils.compiled_cost_tables import get_cost_table_version
+    from utils.prompts import HYBRID_PROMPT_VERSION
+    from utils.query_canonical import query_cache_key
+
+    return _digest([
+        query_cache_key(query),
+        category_id,
+        units_bucket(units),
+        route,
+        target_market,
+        channel,
+        _digest(research_data),
+        _digest(file_bytes),
+        HYBRID_PROMPT_VERSION,
+        get_cost_table_version(),
+    ])
+
+
+def _default_cache_path() -> str:
+    """Next to the analysis log database (see data_logger._get_sqlite_path)."""
+    if os.path.exists("/tmp"):
+        return "/tmp/nexsupply_insight_cache.db"
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), "nexsupply_insight_cache.db")
+
+
+class InsightCache:
+    """
+    SQLite-backed cache of JSON values with TTL and LRU eviction.
+
+    Args:
+        path: Database file (":memory:" for a process-local cache)
+        ttl_seconds: Age after which an entry is a miss and is deleted
+        max_entries: Rows kept; the least recently used are evicted beyond it
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS insight_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_insight_cache_access ON insight_cache(last_access)"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value_json, created_at FROM insight_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM insight_cache WHERE cache_key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE insight_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value under key, evicting least recently used rows beyond max_entries."""
+        now = time.time()
+        value_json = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO insight_cache (cache_key, value_json, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value_json, now, now)
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM insight_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute("""
+                    DELETE FROM insight_cache WHERE cache_key IN (
+                        SELECT cache_key FROM insight_cache ORDER BY last_access LIMIT ?
+                    )
+                """, (excess,))
+                self.evictions += excess
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/expiry/eviction counters and current size."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM insight_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "size": size,
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM insight_cache")
+            self.hits = self.misses = self.expired = self.evictions = 0
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_insight_cache: Optional[InsightCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_insight_cache() -> Optional[InsightCache]:
+    """Shared insight cache, or None when disabled or the file cannot be opened."""
+    global _insight_cache
+    if not AppSettings.INSIGHT_CACHE_ENABLED:
+        return None
+    if _insight_cache is None:
+        with _cache_lock:
+            if _insight_cache is None:
+                try:
+                    _insight_cache = InsightCache(
+                        _default_cache_path(),
+                        ttl_seconds=AppSettings.INSIGHT_CACHE_TTL_HOURS * 3600,
+                        max_entries=AppSettings.INSIGHT_CACHE_MAX_ENTRIES
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Insight cache unavailable: {e}")
+                    return None
+    return _insight_cache
+
+
+def get_insight_cache_stats() -> Dict[str, Any]:
+    """Counters of the shared insight cache ({} when disabled)."""
+    cache = get_insight_cache()
+    return cache.stats() if cache else {}
@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the NexSupply unit tests.
+"""
+
+import copy
+
+import pytest
+
+
+# Test-only category with quantity price breaks. Production categories carry
+# no breaks until sourced factory break data exists.
+TIERED_CATEGORY_ID = "test_tiered_fob"
+
+
+@pytest.fixture
+def tiered_category(monkeypatch):
+    """A COST_TABLES category with two FOB price breaks, removed after the test."""
+    from utils.compiled_cost_tables import rebuild_compiled_cost_tables
+    from utils.cost_tables import COST_TABLES
+
+    cfg = copy.deepcopy(COST_TABLES["candy_marshmallow_stick"])
+    cfg["label"] = "Test tiered FOB category"
+    cfg["fob_price_breaks"] = [
+        {"min_units": 20000, "fob_cost_per_kg": cfg["base_fob_cost_per_kg"] * 0.9},
+        {"min_units": 100000, "fob_cost_per_kg": cfg["base_fob_cost_per_kg"] * 0.8},
+    ]
+    monkeypatch.setitem(COST_TABLES, TIERED_CATEGORY_ID, cfg)
+    rebuild_compiled_cost_tables()
+    yield TIERED_CATEGORY_ID
+    monkeypatch.undo()
+    rebuild_compiled_cost_tables()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the product query autocomplete trie.
+"""
+
+import random
+
+import pytest
+
+from services.autocomplete import REBASE_HALF_LIVES, AutocompleteTrie, build_from_rows
+
+DAY = 86400.0
+
+
+def _brute_force(trie, prefix, k):
+    """Reference: sort every stored term with the prefix by score."""
+    matches = [t for t in trie.scores if t.startswith(prefix)]
+    return sorted(matches, key=lambda t: -trie.scores[t])[:k]
+
+
+def test_frequency_and_recency_rank_completions():
+    """Test frequent queries rank first and a recent query outweighs an old one."""
+    trie = AutocompleteTrie(half_life_days=7, now=0.0)
+    for _ in range(3):
+        trie.add("marshmallow on stick", 0.0)
+    trie.add("marshmallow bulk", 0.0)
+    trie.add("mango dried", -70 * DAY)  # ten half-lives old
+    trie.add("mango candy", 0.0)
+
+    assert trie.complete("mar") == ["marshmallow on stick", "marshmallow bulk"]
+    assert trie.complete("MAN", k=1) == ["mango candy"]
+    assert trie.complete("zzz") == []
+
+    trie.add("mango dried", 7 * DAY)  # incremental update, no rebuild
+    assert trie.complete("man")[0] == "mango dried"
+
+
+def test_eviction_bounds_entries_and_keeps_topk_exact():
+    """Test cold terms are evicted, branches pruned and top-k lists stay exact."""
+    rng = random.Random(11)
+    words = ["gummy", "mug", "marshmallow", "towel", "toy", "tote", "case", "cable"]
+    trie = AutocompleteTrie(max_entries=200, top_k=5, now=0.0)
+    for i in range(3000):
+        term = " ".join(rng.choices(words, k=rng.randint(1, 3)))
+        trie.add(term, rng.uniform(-30, 0) * DAY)
+        assert len(trie) <= 200
+
+    for prefix in ["", "g", "gu", "mug ", "t", "to", "tote c", "ca"]:
+        assert trie.complete(prefix, 5) == _brute_force(trie, prefix, 5), prefix
+
+
+def test_landmark_rebased_so_weights_stay_finite():
+    """Test decades of rows keep finite scores and the same ranking as without rebasing."""
+    trie = AutocompleteTrie(half_life_days=7, now=0.0)
+    trie.add("gummy bears", 0.0, count=3)
+    trie.add("gummy worms", 0.0)
+    trie.add("gummy rings", 300 * DAY)
+    assert trie.complete("gummy") == ["gummy rings", "gummy bears", "gummy worms"]
+
+    # Without rebasing, weights overflow float64 after about 20 years
+    for year in range(1, 31):
+        trie.add("gummy sharks", year * 365 * DAY)
+    trie.add("gummy drops", 30 * 365 * DAY - 7 * DAY)
+    assert all(0 <= score < float("inf") for score in trie.scores.values())
+    assert trie.weight(30 * 365 * DAY) <= 2.0 ** REBASE_HALF_LIVES
+    assert trie.complete("gummy", k=2) == ["gummy sharks", "gummy drops"]
+
+
+def test_build_from_rows_accepts_log_timestamps():
+    """Test ISO strings, datetimes and missing values from analysis_logs are all accepted."""
+    from datetime import datetime
+    trie = build_from_rows([
+        ("gummy bears", "2025-01-01T10:00:00"),
+        ("gummy bears", datetime(2025, 1, 2)),
+        ("gummy worms", "not a date"),
+        (None, "2025-01-01T10:00:00"),
+    ])
+    assert set(trie.complete("gummy")) == {"gummy bears", "gummy worms"}
@@ -0,0 +1,66 @@
+"""
+Unit tests for the analysis_logs category backfill job.
+"""
+
+import pytest
+
+from services import data_logger
+from services.category_backfill import backfill_categories
+from utils.cost_tables import TAXONOMY_VERSION
+
+
+@pytest.fixture
+def log_db(tmp_path, monkeypatch):
+    """Fresh SQLite analysis_logs with a few rows labeled under an old taxonomy."""
+    monkeypatch.setattr(data_logger, "_get_sqlite_path", lambda: str(tmp_path / "logs.db"))
+    monkeypatch.setattr(data_logger, "_db_type", "sqlite")
+    data_logger.init_database()
+    queries = ["marshmallow sticks 20000 pcs", "iphone case", "cotton towel", "something odd"] * 5
+    with data_logger.db_session() as conn:
+        conn.executemany(
+            "INSERT INTO analysis_logs (timestamp, user_query, product_category) VALUES (?, ?, ?)",
+            [("2025-01-01T00:00:00", q, "Old Label") for q in queries],
+        )
+    return data_logger
+
+
+def _categories(db):
+    with db.db_session() as conn:
+        return conn.execute("SELECT product_category, taxonomy_version FROM analysis_logs ORDER BY id").fetchall()
+
+
+def test_backfill_relabels_in_batches_and_resumes(log_db):
+    """Test every row is relabeled and stamped, and a rerun finds nothing stale."""
+    seen = []
+    stats = backfill_categories(batch_size=3, limit=7, progress=seen.append)
+    assert stats["rows_scanned"] == 7
+    assert [s["rows_scanned"] for s in seen] == [3, 6, 7]
+
+    stats = backfill_categories(batch_size=3)
+    assert stats["rows_scanned"] == 13
+    rows = _categories(log_db)
+    assert all(version == TAXONOMY_VERSION for _, version in rows)
+    assert "Old Label" not in {category for category, _ in rows}
+    assert backfill_categories()["rows_scanned"] == 0
+
+
+def test_dry_run_writes_nothing(log_db):
+    """Test a dry run counts changes without touching rows."""
+    stats = backfill_categories(dry_run=True)
+    assert stats["rows_scanned"] == stats["rows_changed"] == 20
+    assert {tuple(row) for row in _categories(log_db)} == {("Old Label", None)}
+
+
+def test_freshly_logged_row_not_backfilled(log_db):
+    """Test log_analysis stamps the current taxonomy, so the backfill skips the row."""
+    from services.category_backfill import _fetch_stale_batch
+    from utils.cost_tables import COST_TABLES, classify_category
+
+    label = COST_TABLES[classify_category("yoga mat")]["label"]
+    log_id = log_db.log_analysis("yoga mat", "market", {"product_info": {"category": label}})
+    unlabeled_id = log_db.log_analysis("yoga mat", "market", {})
+
+    with log_db.db_session() as conn:
+        stale = {row[0] for row in _fetch_stale_batch(conn.cursor(), 0, TAXONOMY_VERSION, 100)}
+    assert log_id not in stale
+    assert unlabeled_id in stale
@@ -0,0 +1,64 @@
+"""
+Unit tests for compiled cost tables.
+Tests that the struct-of-arrays view matches COST_TABLES exactly.
+"""
+
+import copy
+
+import numpy as np
+import pytest
+from utils.cost_tables import COST_TABLES
+from utils.compiled_cost_tables import (
+    compile_cost_tables,
+    get_compiled_cost_tables,
+)
+from utils.cost_calculator import compute_landed_cost_batch
+
+
+def test_compiled_tables_match_source():
+    """Test that every compiled coefficient equals the source dict value."""
+    tables = get_compiled_cost_tables()
+    
+    assert tables.verify(COST_TABLES) == []
+    assert tables.values.shape == (len(COST_TABLES), len(tables.routes), len(tables.arrays))
+
+
+def test_compiled_lookup_fallbacks():
+    """Test that unknown categories and routes fall back like the dict lookups."""
+    tables = get_compiled_cost_tables()
+    
+    generic = tables.lookup("generic_consumer_product", "cn_to_us_west_coast")
+    assert tables.lookup("no_such_category", "no_such_route") == generic
+    
+    cfg = COST_TABLES["candy_marshmallow_stick"]
+    coef = tables.lookup("candy_marshmallow_stick", "cn_to_eu")
+    assert coef.sea_freight_per_cbm_usd == cfg["freight_profile"]["cn_to_eu"]["sea_freight_per_cbm_usd"]
+    assert coef.qc_cost_per_order_usd == cfg["qc_cost_per_order_usd"]
+
+
+def test_verify_detects_mismatch():
+    """Test that verify() reports a coefficient that differs from the source."""
+    tables = get_compiled_cost_tables()
+    changed = copy.deepcopy(COST_TABLES)
+    changed["candy_marshmallow_stick"]["base_fob_cost_per_kg"] += 1
+    
+    errors = tables.verify(changed)
+    assert any("base_fob_cost_per_kg" in e for e in errors)
+    assert compile_cost_tables(changed).version != tables.version
+
+
+def test_batch_accepts_integer_ids():
+    """Test that interned integer ids give the same batch result as strings."""
+    tables = get_compiled_cost_tables()
+    category_ids = ["candy_marshmallow_stick", "generic_consumer_product"]
+    routes = ["cn_to_eu", "cn_to_us_east_coast"]
+    
+    by_name = compute_landed_cost_batch(category_ids, [1000, 2000], routes)
+    by_index = compute_landed_cost_batch(
+        np.array([tables.category_id_of(c) for c in category_ids]),
+        [1000, 2000],
+        np.array([tables.route_id_of(r) for r in routes]),
+    )
+    
+    assert by_name.result(0) == by_index.result(0)
+    assert by_name.result(1) == by_index.result(1)
@@ -0,0 +1,76 @@
+"""
+Unit tests for issuing the extraction and insight LLM calls concurrently.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    """GeminiService whose extraction and insight calls each take 0.2s."""
+    from services import gemini_service, insight_cache
+
+    class FakeResponse:
+        text = '{"channel": "Online", "summary": "Stable demand."}'
+
+    class FakeInsightService:
+        is_configured = True
+
+        def _generate_content(self, contents):
+            time.sleep(0.2)
+            return FakeResponse()
+
+        def _parse_json_response(self, text):
+            return gemini_service.GeminiService()._parse_json_response(text)
+
+    def slow_extraction(self, query):
+        time.sleep(0.2)
+        return {"volume_units": 7777, "target_market": "EU", "channel": "Retail", "route": "cn_to_eu"}
+
+    monkeypatch.setattr(gemini_service.GeminiService, "is_configured", property(lambda self: True))
+    monkeypatch.setattr(gemini_service.GeminiService, "_extract_with_llm", slow_extraction)
+    monkeypatch.setattr(gemini_service, "get_gemini_service", lambda: FakeInsightService())
+    monkeypatch.setattr(insight_cache, "get_insight_cache", lambda: None)
+    monkeypatch.setattr("services.data_logger.log_analysis", lambda **kwargs: None)
+    return gemini_service
+
+
+def test_calls_overlap_and_values_reconcile_by_priority(slow_llm):
+    """Test end-to-end latency is about one LLM call, not two."""
+    started = time.perf_counter()
+    result = slow_llm.GeminiService().analyze_product({"query": "customs duty on ceramic mugs about 3000"})
+    elapsed = time.perf_counter() - started
+
+    assert result["success"]
+    assert elapsed < 0.35
+    assert result["extraction_path"] == "llm"
+
+
+def test_hybrid_reconciles_pending_extraction(slow_llm):
+    """Test the pending extraction fills fields the insight response left empty."""
+    future = slow_llm.LLM_EXECUTOR.submit(lambda: {"volume_units": 7777, "target_market": "EU", "route": "cn_to_eu"})
+    result = slow_llm.analyze_with_hybrid_system("ceramic mugs", pending_extraction=future)
+
+    assumptions = result["full_result"]["assumptions"]
+    assert assumptions["volume_units"] == 7777
+    assert assumptions["target_market"] == "EU"
+    assert assumptions["route"] == "cn_to_eu"
+    assert assumptions["channel"] == "Online"  # the insight response outranks extraction
+
+
+def test_shadow_comparisons_skip_while_one_is_running(slow_llm):
+    """Test shadow calls use their own single worker and are dropped rather than queued."""
+    release = threading.Event()
+    first = slow_llm.submit_shadow(release.wait, 5)
+    try:
+        assert first is not None
+        assert slow_llm.submit_shadow(lambda: None) is None
+        # Request-critical work is not stuck behind the shadow call
+        assert slow_llm.LLM_EXECUTOR.submit(lambda: "extracted").result(timeout=1) == "extracted"
+    finally:
+        release.set()
+    first.result(timeout=1)
+    assert slow_llm.submit_shadow(lambda: "next").result(timeout=1) == "next"
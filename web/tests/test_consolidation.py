@@ -0,0 +1,44 @@
+"""
+Unit tests for multi-SKU consolidated shipments.
+"""
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.consolidation import compute_consolidated_shipment
+
+
+SKUS = [
+    OrderParams(category_id="candy_marshmallow_stick", units=20000, retail_price_per_unit=0.99),
+    OrderParams(category_id="toys_games", units=3000),
+    OrderParams(category_id="candy_gummy_peelable", units=15000),
+]
+
+
+def test_single_sku_matches_standalone():
+    """Test a one-SKU shipment costs the same as compute_landed_cost()."""
+    result = compute_consolidated_shipment(SKUS[:1])
+    standalone = compute_landed_cost(SKUS[0])
+    
+    assert result["savings_usd"] == 0
+    assert result["total_landed_cost_usd"] == pytest.approx(standalone["total_landed_cost_usd"], abs=0.01)
+    assert result["skus"][0]["landed_cost_per_unit_usd"] == standalone["landed_cost_per_unit_usd"]
+
+
+def test_shared_fees_charged_once_and_fully_allocated():
+    """Test shared fees are charged once and allocations add up for every basis."""
+    standalone = sum(compute_landed_cost(sku)["total_landed_cost_usd"] for sku in SKUS)
+    
+    for allocation in ("cbm", "value", "weight"):
+        result = compute_consolidated_shipment(SKUS, allocation=allocation)
+        shared = sum(result["shared_costs_usd"].values())
+        allocated = sum(line["allocated_shared_costs_usd"] for line in result["skus"])
+        
+        assert allocated == pytest.approx(shared, abs=0.05)
+        assert result["savings_usd"] > 0
+        assert result["standalone_total_usd"] == pytest.approx(standalone, abs=0.05)
+        assert result["total_landed_cost_usd"] == pytest.approx(
+            sum(line["total_landed_cost_usd"] for line in result["skus"]), abs=0.05
+        )
+    assert "gross_margin_percent" in result["skus"][0]
+    with pytest.raises(ValueError):
+        compute_consolidated_shipment(SKUS, allocation="price")
@@ -0,0 +1,66 @@
+"""
+Unit tests for the LCL / FCL container planner.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_landed_cost_batch
+from utils.container_planner import (
+    CONTAINER_TYPES,
+    plan_containers,
+    plan_containers_batch,
+    plan_containers_for_batch,
+)
+from utils.cost_tables import CONTAINER_SPECS
+
+
+def _brute_force_freight(volume, weight, lcl_rate, rates):
+    """Cheapest freight over every mix of up to 20/12/12 containers."""
+    usable = np.array([CONTAINER_SPECS[t]["usable_cbm"] for t in CONTAINER_TYPES])
+    payload = np.array([CONTAINER_SPECS[t]["max_payload_kg"] for t in CONTAINER_TYPES])
+    capacity = np.minimum(usable, payload * volume / weight)
+    mixes = np.array(list(itertools.product(range(20), range(12), range(12))), dtype=float)
+    return float((mixes @ rates + np.maximum(volume - mixes @ capacity, 0) * lcl_rate).min())
+
+
+def test_small_order_ships_lcl_and_large_order_fcl():
+    """Test the LCL/FCL choice around the breakpoint."""
+    small = plan_containers(compute_landed_cost(OrderParams(category_id="candy_marshmallow_stick", units=5000)))
+    large = plan_containers(compute_landed_cost(OrderParams(category_id="candy_marshmallow_stick", units=400000)))
+    
+    assert small["mode"] == "LCL" and small["savings_usd"] == 0
+    assert small["lcl_only_freight_usd"] == small["freight_usd"]
+    assert large["mode"] == "FCL" and large["containers"]
+    assert large["freight_usd"] < large["lcl_only_freight_usd"]
+
+
+def test_plan_matches_brute_force():
+    """Test chosen mixes cost no more than an exhaustive search."""
+    rng = np.random.default_rng(3)
+    n = 60
+    volume = rng.uniform(0, 350, n)
+    weight = volume * rng.uniform(50, 900, n)
+    lcl_rate = rng.uniform(100, 250, n)
+    rates = np.tile([2600.0, 3400.0, 3550.0], (n, 1))
+    plan = plan_containers_batch(volume, weight, lcl_rate, rates)
+    
+    for i in range(n):
+        assert plan["freight_usd"][i] == pytest.approx(
+            _brute_force_freight(volume[i], weight[i], lcl_rate[i], rates[i]), abs=1e-6
+        )
+    assert np.all(plan["freight_usd"] <= plan["lcl_only_freight_usd"] + 1e-9)
+
+
+def test_batch_plan_matches_single_plan():
+    """Test planning a LandedCostBatch agrees with per-result planning."""
+    categories = ["candy_marshmallow_stick", "toys_games", "candy_marshmallow_stick"]
+    units = [5000, 80000, 300000]
+    batch = compute_landed_cost_batch(categories, units, routes="cn_to_eu")
+    plan = plan_containers_for_batch(batch)
+    
+    for i, result in enumerate(batch.iter_results()):
+        single = plan_containers(result)
+        assert single["freight_usd"] == pytest.approx(plan["freight_usd"][i], abs=0.5)
+        assert sum(single["containers"].values()) == plan["containers"][i].sum()
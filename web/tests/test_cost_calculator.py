@@ -3,8 +3,21 @@ Unit tests for cost calculator.
 Tests the core landed cost calculation logic.
 """
 
+from dataclasses import FrozenInstanceError
+
+import numpy as np
 import pytest
-from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_calculator import (
+    OrderParams,
+    compute_landed_cost,
+    compute_landed_cost_batch,
+    compute_landed_cost_for_orders,
+    cached_landed_cost,
+    cached_sensitivity,
+    clear_cost_cache,
+    get_cost_cache_stats,
+)
+from utils.cost_tables import COST_TABLES
 from utils.config import AppSettings
 
 
@@ -80,5 +93,103 @@ def test_order_params_defaults():
     assert order.incoterm == AppSettings.DEFAULT_INCOTERM
 
 
+def test_batch_matches_scalar_results():
+    """Test that every batch row equals the scalar compute_landed_cost() dict."""
+    orders = [
+        OrderParams(category_id=category_id, units=units, route=route,
+                    retail_price_per_unit=retail, custom_unit_weight_kg=weight)
+        for category_id in list(COST_TABLES) + ["unknown_category"]
+        for route in ["cn_to_us_west_coast", "cn_to_us_east_coast", "cn_to_eu", "unknown_route"]
+        for units in [1, 500, 5000, 123457]
+        for retail in [None, 0, 4.99]
+        for weight in [None, 0.25]
+    ]
+    
+    batch = compute_landed_cost_for_orders(orders)
+    
+    assert len(batch) == len(orders)
+    for i, order in enumerate(orders):
+        assert batch.result(i) == compute_landed_cost(order)
+
 
+def test_batch_columns_and_broadcasting():
+    """Test columnar output with a single route broadcast to all orders."""
+    batch = compute_landed_cost_batch(
+        category_ids=["toys_games", "candy_marshmallow_stick"],
+        units=[1000, 10000],
+        routes="cn_to_eu",
+        retail_prices=[None, 2.0],
+    )
+    
+    per_unit = batch.columns["landed_cost_per_unit_usd"]
+    assert per_unit.shape == (2,)
+    assert list(batch.routes) == ["cn_to_eu", "cn_to_eu"]
+    assert np.isnan(batch.columns["gross_margin_percent"][0])
+    assert not np.isnan(batch.columns["gross_margin_percent"][1])
+    assert "margin_estimate" not in batch.result(0)
+    assert "margin_estimate" in batch.result(1)
+
+
+def test_batch_rejects_invalid_input():
+    """Test that non-positive units and mismatched lengths are rejected."""
+    with pytest.raises(ValueError):
+        compute_landed_cost_batch(["toys_games"], [0])
+    with pytest.raises(ValueError):
+        compute_landed_cost_batch(["toys_games", "toys_games"], [100])
+
+
+def test_order_params_is_hashable_value():
+    """Test that equal orders hash equal and orders cannot be mutated."""
+    a = OrderParams(category_id="toys_games", units=5000)
+    b = OrderParams(category_id="toys_games", units=5000, route=AppSettings.DEFAULT_ROUTE)
+    
+    assert a == b and hash(a) == hash(b)
+    assert a.cache_key == b.cache_key
+    with pytest.raises(FrozenInstanceError):
+        a.units = 10
 
+
+def test_landed_cost_memo_hits_and_isolation():
+    """Test memo hit/miss counters and that callers get independent copies."""
+    clear_cost_cache()
+    order = OrderParams(category_id="candy_marshmallow_stick", units=20000, retail_price_per_unit=0.99)
+    
+    first = cached_landed_cost(order)
+    first["landed_cost_per_unit_usd"] = -1
+    second = cached_landed_cost(OrderParams(category_id="candy_marshmallow_stick", units=20000, retail_price_per_unit=0.99))
+    cached_sensitivity(order)
+    cached_sensitivity(order)
+    
+    assert second == compute_landed_cost(order)
+    stats = get_cost_cache_stats()
+    assert stats["landed_cost"]["hits"] == 1 and stats["landed_cost"]["misses"] == 1
+    assert stats["sensitivity"]["hits"] == 1 and stats["sensitivity"]["misses"] == 1
+    
+    cached_landed_cost(OrderParams(category_id="candy_marshmallow_stick", units=20001, retail_price_per_unit=0.99))
+    assert get_cost_cache_stats()["landed_cost"]["misses"] == 2
+
+
+def test_fob_price_breaks(tiered_category):
+    """Test FOB tiers apply at their thresholds in scalar and batch paths."""
+    cfg = COST_TABLES[tiered_category]
+    first_break = cfg["fob_price_breaks"][0]
+    units = [first_break["min_units"] - 1, first_break["min_units"], 10**9]
+    
+    batch = compute_landed_cost_batch([tiered_category] * 3, units)
+    for i, n in enumerate(units):
+        scalar = compute_landed_cost(OrderParams(category_id=tiered_category, units=n))
+        assert batch.result(i) == scalar
+    
+    fob_per_kg = batch.columns["product_fob"] / batch.columns["total_weight_kg"]
+    assert fob_per_kg[0] == pytest.approx(cfg["base_fob_cost_per_kg"])
+    assert fob_per_kg[1] == pytest.approx(first_break["fob_cost_per_kg"])
+    assert fob_per_kg[2] == pytest.approx(cfg["fob_price_breaks"][-1]["fob_cost_per_kg"])
+    
+    # Categories without breaks keep the flat rate
+    assert not any("fob_price_breaks" in c for k, c in COST_TABLES.items() if k != tiered_category)
+    flat = compute_landed_cost(OrderParams(category_id="generic_consumer_product", units=10**6))
+    generic = COST_TABLES["generic_consumer_product"]
+    assert "fob_price_breaks" not in generic
+    assert flat["cost_breakdown_detailed"]["product_fob"] == round(
+        10**6 * generic["default_unit_weight_kg"] * generic["base_fob_cost_per_kg"], 2
+    )
@@ -0,0 +1,53 @@
+"""
+Unit tests for the volume-sweep cost curve.
+"""
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_curve import compute_cost_curve, volume_grid
+
+
+def _fixed_share(category_id: str, units: int) -> float:
+    """Fixed handling/QC/cert share of total cost from the scalar calculator."""
+    result = compute_landed_cost(OrderParams(category_id=category_id, units=units))
+    return result["components_usd"]["handling"] / result["total_landed_cost_usd"]
+
+
+def test_volume_grid_spacing():
+    """Test log and linear grids cover the requested range."""
+    log_grid = volume_grid(500, 1_000_000, 50, "log")
+    linear_grid = volume_grid(500, 1_000_000, 50, "linear")
+    
+    assert log_grid[0] == 500 and log_grid[-1] == 1_000_000
+    assert np.all(np.diff(log_grid) > 0)
+    assert np.allclose(np.diff(linear_grid), np.diff(linear_grid)[0], atol=1)
+    with pytest.raises(ValueError):
+        volume_grid(500, 1000, 10, "cubic")
+
+
+def test_cost_curve_matches_scalar():
+    """Test that curve points equal the scalar per-unit cost."""
+    curve = compute_cost_curve("candy_marshmallow_stick", units=[500, 5000, 50000], retail_price=0.5)
+    
+    for i, units in enumerate(curve["units"]):
+        scalar = compute_landed_cost(OrderParams(
+            category_id="candy_marshmallow_stick",
+            units=int(units),
+            retail_price_per_unit=0.5
+        ))
+        assert round(float(curve["landed_cost_per_unit_usd"][i]), 4) == scalar["landed_cost_per_unit_usd"]
+        assert round(float(curve["margin"]["gross_margin_percent"][i]), 1) == \
+            scalar["margin_estimate"]["gross_margin_percent"]
+    
+    # Per-unit cost falls as fixed costs are spread over more units
+    assert np.all(np.diff(curve["landed_cost_per_unit_usd"]) < 0)
+
+
+def test_fixed_cost_breakpoint():
+    """Test that fixed costs drop below the threshold exactly at the breakpoint."""
+    curve = compute_cost_curve("candy_marshmallow_stick", fixed_share_threshold=0.05)
+    breakpoint_units = curve["fixed_cost_breakpoint"]["units"]
+    
+    assert _fixed_share("candy_marshmallow_stick", breakpoint_units) < 0.05
+    assert _fixed_share("candy_marshmallow_stick", breakpoint_units - 1) >= 0.05
@@ -0,0 +1,68 @@
+"""
+Unit tests for the Monte Carlo landed cost simulation.
+"""
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.cost_simulation import simulate_landed_cost
+
+
+def test_simulation_is_seeded():
+    """Test that the same seed gives identical results."""
+    order = OrderParams(category_id="candy_marshmallow_stick", units=20000, retail_price_per_unit=0.99)
+    
+    assert simulate_landed_cost(order, seed=7) == simulate_landed_cost(order, seed=7)
+    assert simulate_landed_cost(order, seed=7) != simulate_landed_cost(order, seed=8)
+
+
+def test_simulation_percentiles_bracket_point_estimate():
+    """Test P10 <= point estimate <= P90 when only table drivers are sampled."""
+    order = OrderParams(category_id="toys_games", units=5000)
+    result = simulate_landed_cost(order, include_hidden_costs=False)
+    per_unit = result["landed_cost_per_unit_usd"]
+    point = compute_landed_cost(order)["landed_cost_per_unit_usd"]
+    
+    assert per_unit["p10"] <= per_unit["p50"] <= per_unit["p90"]
+    assert per_unit["p10"] <= point <= per_unit["p90"]
+    assert "margin" not in result
+
+
+def test_simulation_margin_risk():
+    """Test margin risk probabilities for a tight and a generous retail price."""
+    tight = OrderParams(category_id="candy_marshmallow_stick", units=5000, retail_price_per_unit=0.5)
+    generous = OrderParams(category_id="candy_marshmallow_stick", units=5000, retail_price_per_unit=10.0)
+    
+    assert simulate_landed_cost(tight)["margin"]["probability_below_low"] > 0.9
+    assert simulate_landed_cost(generous)["margin"]["probability_below_low"] == 0.0
+    with pytest.raises(ValueError):
+        simulate_landed_cost(tight, n_samples=0)
+
+
+def test_hidden_costs_reported_as_separate_addon():
+    """Test the default band brackets the point estimate; hidden costs sit in their own add-on."""
+    from utils.cost_tables import classify_category
+    
+    order = OrderParams(category_id=classify_category("plastic phone case"), units=5000)
+    result = simulate_landed_cost(order)
+    per_unit = result["landed_cost_per_unit_usd"]
+    point = compute_landed_cost(order)["landed_cost_per_unit_usd"]
+    addon = result["hidden_cost_addon"]
+    
+    assert per_unit["p10"] <= point <= per_unit["p90"]
+    assert per_unit == simulate_landed_cost(order, include_hidden_costs=False)["landed_cost_per_unit_usd"]
+    assert addon["per_shipment_usd"]["p10"] > 0
+    assert addon["landed_cost_with_addon_per_unit_usd"]["p50"] > per_unit["p50"]
+
+
+def test_storage_charged_per_dwell_day(monkeypatch):
+    """Test storage_per_day scales with the dwell-time draw instead of a flat fee."""
+    from utils import cost_simulation
+    
+    order = OrderParams(category_id="toys_games", units=5000)
+    monkeypatch.setattr(cost_simulation, "STORAGE_DWELL_DAYS", (0.0, 0.0, 1e-9))
+    no_dwell = simulate_landed_cost(order)["hidden_cost_addon"]["per_shipment_usd"]["mean"]
+    monkeypatch.setattr(cost_simulation, "STORAGE_DWELL_DAYS", (10.0, 10.0, 10.0 + 1e-9))
+    long_dwell = simulate_landed_cost(order)["hidden_cost_addon"]["per_shipment_usd"]["mean"]
+    
+    # Mean daily rate is $325
+    assert long_dwell - no_dwell == pytest.approx(3250, rel=0.05)
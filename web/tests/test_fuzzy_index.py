@@ -0,0 +1,51 @@
+"""
+Unit tests for the symmetric-delete typo index and the fuzzy category pass.
+"""
+
+import pytest
+from utils.cost_tables import classify_category
+from utils.fuzzy_index import SymmetricDeleteIndex, max_edit_distance, osa_distance
+from utils.lexicon import correct_typos
+
+
+def test_lookup_finds_closest_term_within_distance():
+    """Test deletes, insertions, substitutions and transpositions up to the distance limit."""
+    index = SymmetricDeleteIndex(["iphone", "marshmallow", "bluetooth", "phone"])
+
+    assert index.lookup("iphone") == ("iphone", 0)
+    assert index.lookup("iphnoe", 1) == ("iphone", 1)
+    assert index.lookup("bluetoth", 1) == ("bluetooth", 1)
+    assert index.lookup("marshmellows", 2) == ("marshmallow", 2)
+    assert index.lookup("marshmellows", 1) is None
+    assert index.lookup("xphone", 2) is None  # first letter must match
+    assert osa_distance("abcd", "acbd", 2) == 1
+    assert osa_distance("kitten", "sitting", 2) == 3
+
+
+def test_typos_resolve_category_only_when_exact_match_fails():
+    """Test misspelled product words are classified and exact or unknown queries are unaffected."""
+    assert classify_category("marshmellow") == "candy_marshmallow_stick"
+    assert classify_category("iphnoe case") == "phone_case_protector"
+    assert classify_category("bluetoth speaker") == "electronics_small_accessory"
+    assert classify_category("random widget") == "generic_consumer_product"
+    assert correct_typos("Wholesale units please") == "wholesale units please"
+
+
+def test_unique_lookup_rejects_ties():
+    """Test a token equally close to two terms is left alone when a unique match is required."""
+    index = SymmetricDeleteIndex(["towel", "tower"])
+    assert index.lookup("towes", 1) == ("towel", 1)
+    assert index.lookup("towes", 1, unique=True) is None
+    assert index.lookup("towwl", 1, unique=True) == ("towel", 1)
+
+
+def test_edit_distance_scales_with_token_length():
+    """Test short tokens get no edits and only long tokens get two."""
+    assert [max_edit_distance("x" * n) for n in (4, 5, 9, 10, 20)] == [0, 1, 1, 2, 2]
+
+
+@pytest.mark.parametrize("query", ["portable speaker", "tower", "tower fan", "shorts", "steel stock"])
+def test_real_words_are_not_corrected_into_keywords(query):
+    """Test correctly spelled words near a keyword ("speaker"/"sneaker", "tower"/"towel") are kept."""
+    assert correct_typos(query) == query
+    assert classify_category(query) == "generic_consumer_product"
@@ -0,0 +1,84 @@
+"""
+Unit tests for the persistent AI insight cache.
+"""
+
+import time
+
+import pytest
+
+from services.insight_cache import InsightCache, insight_cache_key, units_bucket
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return InsightCache(str(tmp_path / "insights.db"), ttl_seconds=3600, max_entries=3)
+
+
+def test_get_put_lru_eviction_and_stats(cache):
+    """Test round trips, least-recently-used eviction and hit-rate counters."""
+    assert cache.get("a") is None
+    for key in "abc":
+        cache.put(key, {"key": key, "risks": ["moq"]})
+        time.sleep(0.001)
+    assert cache.get("a") == {"key": "a", "risks": ["moq"]}  # a is now most recent
+    time.sleep(0.001)
+    cache.put("d", {"key": "d"})
+
+    assert cache.get("b") is None
+    assert cache.get("c") == {"key": "c", "risks": ["moq"]}
+    stats = cache.stats()
+    assert stats["size"] == 3 and stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    """Test an entry older than the TTL is a miss and is deleted."""
+    cache = InsightCache(str(tmp_path / "insights.db"), ttl_seconds=0.01, max_entries=10)
+    cache.put("k", {"v": 1})
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["size"] == 0
+
+
+def test_key_ignores_spelling_but_not_inputs():
+    """Test spelling variants share a key; category, size bucket, route, research and image do not."""
+    base = dict(category_id="candy_marshmallow_stick", units=5000, route="cn_to_us_west_coast")
+    key = insight_cache_key("Marshmallow on stick 5000pcs", **base)
+    assert key == insight_cache_key("marshmallow on a stick, 5k units", **{**base, "units": 6000})
+    assert key != insight_cache_key("marshmallow on stick", **{**base, "units": 50000})
+    assert key != insight_cache_key("marshmallow on stick", **{**base, "category_id": "food_beverage_snacks"})
+    assert key != insight_cache_key("marshmallow on stick", **{**base, "route": "cn_to_eu"})
+    assert key != insight_cache_key("marshmallow on stick", **base, research_data={"price": 3})
+    assert key != insight_cache_key("marshmallow on stick", **base, file_bytes=b"\x89PNG")
+    assert units_bucket(1000) == units_bucket(3000) != units_bucket(4000)
+    assert units_bucket(None) is None
+
+
+def test_hybrid_analysis_reuses_cached_insights(cache, monkeypatch):
+    """Test a repeat analysis skips the LLM and keeps its own order size."""
+    from services import gemini_service, insight_cache
+
+    class FakeResponse:
+        text = '{"volume_units": 999, "summary": "Seasonal demand peaks in Q4."}'
+
+    class FakeService:
+        is_configured = True
+        calls = 0
+
+        def _generate_content(self, contents):
+            FakeService.calls += 1
+            return FakeResponse()
+
+        def _parse_json_response(self, text):
+            return gemini_service.GeminiService()._parse_json_response(text)
+
+    monkeypatch.setattr(gemini_service, "get_gemini_service", lambda: FakeService())
+    monkeypatch.setattr(insight_cache, "get_insight_cache", lambda: cache)
+
+    first = gemini_service.analyze_with_hybrid_system("Marshmallow on stick", units=5000, target_market="USA", channel="Amazon FBA")
+    second = gemini_service.analyze_with_hybrid_system("marshmallow on a stick", units=6000, target_market="USA", channel="Amazon FBA")
+
+    assert FakeService.calls == 1
+    assert (first["insight_source"], second["insight_source"]) == ("ai", "ai_cache")
+    assert first["full_result"]["assumptions"]["volume_units"] == 999   # fresh AI extraction applies
+    assert second["full_result"]["assumptions"]["volume_units"] == 6000  # cached extraction does not
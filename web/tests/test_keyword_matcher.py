@@ -0,0 +1,66 @@
+"""
+Unit tests for the Aho-Corasick keyword matcher and category classification.
+"""
+
+import random
+
+import pytest
+from utils.keyword_matcher import KeywordAutomaton
+from utils.cost_tables import CATEGORY_KEYWORDS, classify_category
+from utils.lexicon import scan_text
+
+
+def _classify_by_substring_loop(query):
+    """Reference: the original one-scan-per-keyword classifier."""
+    query_lower = query.lower()
+    scores = {}
+    for cat_id, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(1 for kw in keywords if kw.lower() in query_lower)
+        if score > 0:
+            scores[cat_id] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return "generic_consumer_product"
+
+
+def test_matches_overlapping_and_nested_keywords():
+    """Test substring semantics: overlapping, nested and repeated keywords count once each."""
+    matcher = KeywordAutomaton({"a": ["he", "she", "hers"], "b": ["his", "he"], "c": ["xyz"]})
+
+    assert matcher.count_by_label("USHERS and he") == {"a": 3, "b": 1}
+    assert matcher.matched_keywords("ushers") == {"a": ["he", "she", "hers"], "b": ["he"]}
+    assert matcher.count_by_label("nothing here") == {"a": 1, "b": 1}
+    assert matcher.count_by_label("") == {}
+
+
+def test_classify_category_matches_substring_loop():
+    """Test the automaton picks the same category as the per-keyword loop, ties included."""
+    vocabulary = [kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords]
+    vocabulary += ["wholesale", "from", "China", "FOB", "units", "Amazon", "US", "for"]
+    rng = random.Random(7)
+
+    queries = [
+        "marshmallow stick candy 20000 units",
+        "peelable gummy 젤리 to Korea",
+        "Bamboo toothbrush private label",
+        "random widget",
+        "",
+    ]
+    for _ in range(2000):
+        words = rng.choices(vocabulary, k=rng.randint(1, 12))
+        joiner = rng.choice([" ", "", ", "])
+        queries.append(joiner.join(w.upper() if rng.random() < 0.2 else w for w in words))
+
+    for query in queries:
+        expected = _classify_by_substring_loop(query)
+        assert scan_text(query).category == expected, query
+        if expected != "generic_consumer_product":  # else the typo pass may still find one
+            assert classify_category(query) == expected, query
+
+
+def test_find_spans_reports_every_occurrence():
+    """Test spans cover overlapping and repeated keywords at their offsets."""
+    automaton = KeywordAutomaton({"a": ["us", "usa"], "b": ["sa"]})
+    text = "USA us"
+    spans = sorted((automaton.patterns[p][1], start, end) for p, start, end in automaton.find_spans(text))
+    assert spans == [("sa", 1, 3), ("us", 0, 2), ("us", 4, 6), ("usa", 0, 3)]
@@ -0,0 +1,64 @@
+"""
+Unit tests for the shared query lexicon scan.
+"""
+
+import random
+import re
+
+import pytest
+from utils.lexicon import ANALYSIS_MODES, MARKET_MAP, CHANNEL_MAP, scan_query, scan_text
+from utils.input_parser import parse_input_parameters
+from utils.research_data import RESEARCH_PATTERNS, parse_research_data_from_text
+
+
+def _first_key_loop(text, mapping):
+    """Reference: the original first-key-wins dictionary loop."""
+    text_lower = text.lower()
+    for key, value in mapping.items():
+        if key in text_lower:
+            return value
+    return None
+
+
+def _mode_loop(text):
+    """Reference: the original detect_analysis_mode loop."""
+    text_lower = text.lower()
+    for mode, config in ANALYSIS_MODES.items():
+        for keyword in config["keywords"]:
+            if keyword.lower() in text_lower:
+                return mode
+    return "general"
+
+
+def test_scan_matches_per_field_loops():
+    """Test mode, market and channel priority match the original per-module loops."""
+    vocabulary = list(MARKET_MAP) + list(CHANNEL_MAP)
+    vocabulary += [kw for config in ANALYSIS_MODES.values() for kw in config["keywords"]]
+    vocabulary += ["gummy", "candy", "수요: 높음", "margin 30-40%", "widget", "from China"]
+    rng = random.Random(11)
+
+    for _ in range(2000):
+        words = rng.choices(vocabulary, k=rng.randint(1, 8))
+        text = " ".join(w.upper() if rng.random() < 0.2 else w for w in words)
+        hits = scan_text(text)
+
+        assert hits.mode == _mode_loop(text), text
+        assert hits.market == _first_key_loop(text, MARKET_MAP), text
+        assert hits.channel == _first_key_loop(text, CHANNEL_MAP), text
+        for anchor, pattern, _ in RESEARCH_PATTERNS:
+            if re.search(pattern, text.lower(), re.IGNORECASE):
+                assert anchor in hits.research_anchors, text
+
+
+def test_call_sites_read_one_scan():
+    """Test parsers return the fields of the shared scan for a mixed query."""
+    query = "Amazon FBA gummy candy for the 미국 시장, 수요: 높음, margin 30-40% - what freight cost?"
+    hits = scan_query(query)
+
+    assert (hits.mode, hits.market, hits.channel) == ("cost", "USA", "Amazon FBA")
+    assert parse_input_parameters(query)["channel"] == "Amazon FBA"
+    assert parse_input_parameters(query)["target_market"] == "USA"
+    research = parse_research_data_from_text(query)
+    assert research["demand_level"] == "High"
+    assert research["margin_range_percent"] == [30, 40]
+    assert scan_query("") == scan_text("") and scan_text("").mode == "general"
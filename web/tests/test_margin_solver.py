@@ -0,0 +1,72 @@
+"""
+Unit tests for the closed-form margin / break-even solver.
+"""
+
+import numpy as np
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost_for_orders
+from utils.cost_tables import COST_TABLES
+from utils.margin_solver import (
+    min_units_for_margin_batch,
+    retail_price_for_margin_batch,
+    solve_break_even_units,
+    solve_retail_price_for_margin,
+    solve_units_for_margin,
+)
+
+
+def _margin(category_id: str, units: int, retail_price: float) -> float:
+    """Unrounded gross margin percent from the batch engine."""
+    order = OrderParams(category_id=category_id, units=units, retail_price_per_unit=retail_price)
+    return float(compute_landed_cost_for_orders([order]).columns["gross_margin_percent"][0])
+
+
+def test_min_units_is_exact_boundary():
+    """Test solved units reach the target and one unit fewer does not."""
+    result = solve_units_for_margin("candy_marshmallow_stick", 0.99, 35.0)
+    units = result["units"]
+    
+    assert result["feasible"]
+    assert _margin("candy_marshmallow_stick", units, 0.99) >= 35.0
+    assert units == 1 or _margin("candy_marshmallow_stick", units - 1, 0.99) < 35.0
+    
+    break_even = solve_break_even_units("candy_marshmallow_stick", 0.99)
+    assert break_even["units"] < units
+
+
+def test_infeasible_target_and_price_solver():
+    """Test unreachable margins are flagged and the price solver round-trips."""
+    result = solve_units_for_margin("toys_games", 1.0, 60.0)
+    assert not result["feasible"] and result["units"] is None
+    assert result["max_margin_percent"] < 60.0
+    
+    price = solve_retail_price_for_margin("toys_games", 5000, 40.0)["retail_price_per_unit_usd"]
+    assert _margin("toys_games", 5000, price) == pytest.approx(40.0, abs=0.01)
+    with pytest.raises(ValueError):
+        solve_units_for_margin("toys_games", 5.0, 100.0)
+
+
+def test_batch_matches_scalar():
+    """Test batch solving many SKUs matches the single-SKU helpers."""
+    categories = ["candy_marshmallow_stick", "toys_games", "kitchenware", "unknown_category"]
+    prices = [0.99, 9.99, 12.0, 6.0]
+    batch = min_units_for_margin_batch(categories, prices, 30.0)
+    prices_needed = retail_price_for_margin_batch(categories, 10000, [30.0, 35.0, 40.0, 45.0])
+    
+    for i, (category_id, price) in enumerate(zip(categories, prices)):
+        scalar = solve_units_for_margin(category_id, price, 30.0)
+        assert batch["feasible"][i] == scalar["feasible"]
+        assert (int(batch["units"][i]) or None) == scalar["units"]
+    assert np.all(prices_needed["retail_price_per_unit_usd"] > prices_needed["landed_cost_per_unit_usd"])
+
+
+def test_solver_respects_fob_price_breaks(tiered_category):
+    """Test a target reachable only at a price break solves to that break."""
+    break_units = COST_TABLES[tiered_category]["fob_price_breaks"][0]["min_units"]
+    below = _margin(tiered_category, break_units - 1, 0.99)
+    at_break = _margin(tiered_category, break_units, 0.99)
+    target = (below + at_break) / 2
+    
+    result = solve_units_for_margin(tiered_category, 0.99, target)
+    assert below < target < at_break
+    assert result["units"] == break_units
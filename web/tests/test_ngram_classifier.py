@@ -0,0 +1,87 @@
+"""
+Unit tests for the TF-IDF character n-gram category classifier.
+"""
+
+import numpy as np
+import pytest
+from utils.ngram_classifier import (
+    FALLBACK_CATEGORY,
+    build_ngram_classifier,
+    char_ngrams,
+)
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return build_ngram_classifier()
+
+
+def test_classifies_paraphrases_and_cjk(classifier):
+    """Test queries without an exact keyword, CJK queries and the low-confidence fallback."""
+    assert classifier.classify("gummies in pouches") == "candy_gummy_peelable"
+    assert classifier.classify("marshmallow pops") == "candy_marshmallow_stick"
+    assert classifier.classify("帽子 批发") == "apparel_hat_cap"
+    assert classifier.classify("hello") == FALLBACK_CATEGORY
+    assert classifier.classify("") == FALLBACK_CATEGORY
+    assert "帽" in char_ngrams("帽子")
+
+    top = classifier.top_k(["bluetooth earbuds case"], k=3)[0]
+    assert len(top) == 3
+    assert top[0][0] == "electronics_small_accessory"
+    assert [score for _, score in top] == sorted((score for _, score in top), reverse=True)
+
+
+@pytest.mark.parametrize("query, category_id", [
+    ("マシュマロ", "candy_marshmallow_stick"),
+    ("マシュマロ 5000個", "candy_marshmallow_stick"),
+    ("スマホケース 卸売", "phone_case_protector"),
+    ("ヨガマット", "sports_fitness_equipment"),
+    ("腕時計", "watches_fashion"),
+    ("棉花糖", "candy_marshmallow_stick"),
+    ("棉花糖 批发", "candy_marshmallow_stick"),
+    ("手机壳 定制", "phone_case_protector"),
+    ("婴儿奶嘴", "baby_infant_products"),
+    ("保鲜盒", "home_food_container"),
+])
+def test_classifies_japanese_and_chinese(classifier, query, category_id):
+    """Test Japanese and Chinese queries match their category through the CJK terms."""
+    assert classifier.classify(query) == category_id
+
+
+def test_cjk_terms_cover_every_category():
+    """Test every category document has Japanese or Chinese terms."""
+    from utils.cost_tables import CATEGORY_KEYWORDS
+    from utils.ngram_classifier import CJK_CATEGORY_TERMS
+
+    assert set(CJK_CATEGORY_TERMS) == set(CATEGORY_KEYWORDS)
+
+
+def test_batch_scoring_matches_dense_product(classifier):
+    """Test the sparse batch product equals a dense query matrix times the category matrix."""
+    queries = ["dog leash", "티셔츠 반팔", "", "kids toy keychain", "yoga mat 2000 pcs"]
+    indptr, indices, values = classifier.vectorize(queries)
+    dense = np.zeros((len(queries), len(classifier.vocabulary)))
+    for row in range(len(queries)):
+        dense[row, indices[indptr[row]:indptr[row + 1]]] = values[indptr[row]:indptr[row + 1]]
+
+    np.testing.assert_allclose(classifier.score_batch(queries), dense @ classifier.category_matrix.T)
+    assert classifier.classify_batch(queries) == [classifier.classify(q) for q in queries]
+
+
+def test_batch_scoring_spans_blocks(classifier):
+    """Test a batch larger than one scoring block gives the same scores as query-by-query."""
+    from utils.ngram_classifier import SCORE_BLOCK_ROWS
+
+    queries = [f"item {i} dog leash" if i % 3 else "" for i in range(SCORE_BLOCK_ROWS * 2 + 5)]
+    one_by_one = np.vstack([classifier.score_batch([query]) for query in queries])
+    np.testing.assert_allclose(classifier.score_batch(queries), one_by_one)
+
+
+def test_learns_from_labeled_queries():
+    """Test labeled queries (by category_id or label) are added to the category documents."""
+    query = "glow sticks for parties"
+    labeled = [(query, "Small plastic novelty toy / Keychain"), ("unrelated", "Some LLM category")]
+    trained = build_ngram_classifier(labeled_queries=labeled)
+
+    assert trained.classify(query) == "novelty_toy_small_plastic"
+    assert trained.top_k([query], k=1)[0][0][1] > build_ngram_classifier().top_k([query], k=1)[0][0][1]
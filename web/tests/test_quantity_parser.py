@@ -0,0 +1,136 @@
+"""
+Unit tests for the multilingual quantity parser.
+"""
+
+import pytest
+from utils.quantity_parser import find_quantities, parse_quantity
+from utils.input_parser import parse_volume
+from utils.extraction_prompts import normalize_korean_number
+
+
+# (text, expected value or None)
+QUANTITY_CORPUS = [
+    # Plain numbers and grouping
+    ("5000", 5000),
+    ("2000000", 2000000),
+    ("2,000,000", 2000000),
+    ("10,000 units", 10000),
+    ("1.000.000 unidades", 1000000),
+    ("need 12500 pcs", 12500),
+    ("qty: 800", 800),
+    # English scales
+    ("2 million units", 2000000),
+    ("1.5 million", 1500000),
+    ("10k", 10000),
+    ("10K units", 10000),
+    ("2.3k", 2300),
+    ("5m units", 5000000),
+    ("5 M", 5000000),
+    ("3 thousand pieces", 3000),
+    ("2mn pcs", 2000000),
+    # Korean
+    ("200만개", 2000000),
+    ("200만 개", 2000000),
+    ("5천개", 5000),
+    ("3백개", 300),
+    ("1백만개", 1000000),
+    ("5천만개", 50000000),
+    ("3억", 300000000),
+    ("약200만개 필요", 2000000),
+    ("1.5만개", 15000),
+    ("2만개 정도", 20000),
+    ("1만개씩", 10000),
+    ("5000장", 5000),
+    ("300세트", 300),
+    # Chinese / Japanese
+    ("200万个", 2000000),
+    ("200万個", 2000000),
+    ("5千个", 5000),
+    ("3亿", 300000000),
+    ("10萬件", 100000),
+    ("2千枚", 2000),
+    ("1億個", 100000000),
+    # Compound amounts (descending scale groups are summed)
+    ("1만5천개", 15000),
+    ("2만 5천 개", 25000),
+    ("3천5백개", 3500),
+    ("1억2천만", 120000000),
+    ("1만5000개", 15000),
+    ("1万5千个", 15000),
+    ("2万3千5百個", 23500),
+    ("1만5천~2만개", 20000),
+    # Spanish
+    ("2 mil unidades", 2000),
+    ("1,5 millones", 1500000),
+    ("1 millón de piezas", 1000000),
+    ("3 millon", 3000000),
+    # Indian English / Hindi
+    ("2 lakh pcs", 200000),
+    ("1.5 crore", 15000000),
+    ("5 lakhs", 500000),
+    ("2 लाख", 200000),
+    ("1 करोड़", 10000000),
+    ("5 हज़ार", 5000),
+    # Arabic
+    ("5 ألف", 5000),
+    ("2 مليون", 2000000),
+    # Ranges (upper bound)
+    ("1~2만개", 20000),
+    ("1만~2만개", 20000),
+    ("1-2만개", 20000),
+    ("1〜2万个", 20000),
+    ("10,000-20,000 units", 20000),
+    ("20000 to 30000 units", 30000),
+    ("5k-10k", 10000),
+    ("3~5천개", 5000),
+    # Prices, sizes, durations and years are not quantities
+    ("$5", None),
+    ("5 mm", None),
+    ("5 meters", None),
+    ("20%", None),
+    ("30 days", None),
+    ("2만원", None),
+    ("5 kg", None),
+    ("no numbers here", None),
+    ("", None),
+    # Most confident quantity wins
+    ("$5 each, 10000 units", 10000),
+    ("MOQ 500, target 20000 pcs by 2025", 20000),
+    ("2만원짜리 5000개", 5000),
+    ("30일 이내 1만개", 10000),
+    ("iphone15 case 3000pcs", 3000),
+    ("100 백팩", 100),
+    ("ship 5000 to LA", 5000),
+    ("5000개 10000개", 5000),
+    ("3 m tape 500 rolls", 500),
+    ("1200 packs", 1200),
+    ("5000双", 5000),
+    ("3000켤레", 3000),
+    ("in 2025 order 300", 300),
+    ("2025", 2025),
+    # Words containing scale letters are not scales
+    ("5 milk cartons", 5),
+    ("50 mugs", 50),
+    ("12 kids toys", 12),
+]
+
+
+@pytest.mark.parametrize("text,expected", QUANTITY_CORPUS)
+def test_quantity_corpus(text, expected):
+    """Test every corpus expression, and that both legacy entry points agree with the parser."""
+    quantity = parse_quantity(text)
+    assert (quantity.value if quantity else None) == expected
+    assert parse_volume(text) == expected
+    assert normalize_korean_number(text) == expected
+
+
+def test_match_details():
+    """Test unit, span, range bounds and confidence ordering of matches."""
+    text = "Price $3.50, need 1~2만개 by May"
+    price, order = find_quantities(text)
+
+    assert price.confidence < 0.2
+    assert (order.value, order.low, order.is_range) == (20000, 10000, True)
+    assert order.unit == "개"
+    assert text[order.span[0]:order.span[1]] == "1~2만개" == order.text
+    assert parse_quantity("5000").confidence < parse_quantity("5천").confidence < parse_quantity("5000개").confidence
@@ -0,0 +1,68 @@
+"""
+Unit tests for query canonicalization and the analysis_logs query key.
+"""
+
+import pytest
+
+from utils.query_canonical import canonical_text, canonicalize_query, query_cache_key
+
+
+@pytest.mark.parametrize("query", [
+    "Marshmallow  on stick 5000pcs",
+    "marshmallow on a stick, 5k units",
+    "Marshmallow on stick ５０００pcs",
+    "MARSHMALLOW ON STICK 5000 pcs for Amazon FBA to the USA",
+])
+def test_spelling_variants_share_one_key(query):
+    """Test case, spacing, full-width digits, quantity, channel and market are folded away."""
+    assert canonical_text(query) == "marshmallow on stick"
+    assert query_cache_key(query) == query_cache_key("marshmallow on stick")
+
+
+def test_product_attributes_and_embedded_keywords_are_kept():
+    """Test sizes, prices and 'us' inside a word survive canonicalization."""
+    assert canonical_text("customs duty on 10cm mugs") == "customs duty on 10cm mugs"
+    assert canonical_text("$2 gummies, 3000 units to the US") == "2 gummies"
+    assert canonical_text("마시멜로 200만개 편의점") == "마시멜로"
+    # Nothing left after stripping: fall back to the folded text
+    assert canonical_text("5000 pcs") == "5000 pcs"
+    assert canonical_text("") == ""
+
+
+@pytest.mark.parametrize("query,other", [
+    ("iphone 15 case", "iphone 14 case"),
+    ("3 in 1 charger 500 units", "charger 500 units"),
+    ("model 3000 blender", "model blender"),
+    ("model 3000 blender 2000 pcs", "model 5000 blender 2000 pcs"),
+])
+def test_bare_numbers_are_product_terms(query, other):
+    """Test model numbers and 'N in 1' are kept, so different products never share a key."""
+    assert query_cache_key(query) != query_cache_key(other)
+
+
+def test_count_unit_quantity_stripped_bare_number_kept():
+    """Test only the quantity with a unit is dropped when a bare number is also present."""
+    assert canonical_text("3 in 1 charger 500 units") == "3 1 charger"
+    assert canonical_text("iPhone 15 case 5k pcs") == "iphone 15 case"
+
+
+def test_key_is_stable_hex():
+    """Test the key is a 16-character hash that differs for different products."""
+    key = canonicalize_query("gummy bears").key
+    assert len(key) == 16 and int(key, 16) >= 0
+    assert key != query_cache_key("gummy worms")
+
+
+def test_logged_variants_group_by_query_hash(tmp_path, monkeypatch):
+    """Test get_top_queries counts spelling variants as one query."""
+    from services import data_logger
+    monkeypatch.setattr(data_logger, "_get_sqlite_path", lambda: str(tmp_path / "logs.db"))
+    monkeypatch.setattr(data_logger, "_db_type", "sqlite")
+    for query in ["Marshmallow  on stick 5000pcs", "marshmallow on a stick, 5k units", "gummy bears"]:
+        assert data_logger.log_analysis(query, "market", {}) is not None
+
+    top = data_logger.get_top_queries()
+    assert [(row["query_canonical"], row["count"]) for row in top] == [
+        ("marshmallow on stick", 2), ("gummy bears", 1)
+    ]
+    assert len(data_logger.get_analyses_for_query("MARSHMALLOW ON STICK")) == 2
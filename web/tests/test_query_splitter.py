@@ -0,0 +1,93 @@
+"""
+Unit tests for multi-product query splitting and the parallel fan-out.
+"""
+
+import time
+
+import pytest
+
+from utils.query_splitter import split_products
+
+
+def test_splits_products_on_quantity_anchors():
+    """Test each quantity-bearing clause becomes a product; context clauses stay attached."""
+    segments = split_products("gummy pouches 20k, phone cases 5k, yoga mats 2k for Amazon US")
+    assert [(s.text, s.units) for s in segments] == [
+        ("gummy pouches 20k", 20000),
+        ("phone cases 5k", 5000),
+        ("yoga mats 2k for Amazon US", 2000),
+    ]
+
+    segments = split_products("Quote for: gummy pouches 20,000 pcs; phone cases 5000 units and yoga mats 2k, private label")
+    assert [s.units for s in segments] == [20000, 5000, 2000]
+    assert segments[0].text.startswith("Quote for:")
+    assert segments[2].text == "yoga mats 2k, private label"
+
+    assert [s.units for s in split_products("마시멜로 2만개, 젤리 5천개 편의점")] == [20000, 5000]
+
+
+@pytest.mark.parametrize("query", [
+    "Marshmallow on stick 5000pcs",
+    "marshmallow 20000 pcs, $2 each, to the US",   # price is not a second product
+    "20k pcs, 5k pcs",                              # no product names
+    "bamboo toothbrush 10000 pcs, 5000 units",      # second clause names nothing
+    "gummies 1~2만개",
+    "",
+])
+def test_single_product_queries_are_not_split(query):
+    """Test ambiguous or single-product queries give no segments."""
+    assert split_products(query) == []
+
+
+def test_fan_out_runs_products_concurrently(monkeypatch):
+    """Test multi-product analysis runs in parallel and returns sections and totals."""
+    from services import gemini_service
+
+    calls = []
+
+    def fake_pipeline(query, units, route, target_market, channel, retail_price, research_data):
+        calls.append((query, units, target_market, channel))
+        time.sleep(0.2)
+        return {"success": True, "data": {"product_info": {"name": query}}}
+
+    monkeypatch.setattr(gemini_service, "analyze_with_hybrid_system", fake_pipeline)
+    monkeypatch.setattr(gemini_service.GeminiService, "is_configured", property(lambda self: False))
+    monkeypatch.setattr("services.data_logger.log_analysis", lambda **kwargs: None)
+
+    started = time.perf_counter()
+    result = gemini_service.GeminiService().analyze_product(
+        {"query": "gummy pouches 20k, phone cases 5k, yoga mats 2k for Amazon FBA in the USA"}
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.45  # three 0.2s pipelines, not 0.6s in sequence
+    assert result["success"] and result["multi_product"]
+    assert [p["units"] for p in result["products"]] == [20000, 5000, 2000]
+    assert {(market, channel) for _, _, market, channel in calls} == {("USA", "Amazon FBA")}
+    assert result["totals"]["total_units"] == 27000
+    assert result["totals"]["products_analyzed"] == 3
+    assert result["data"] == {"product_info": {"name": "gummy pouches 20k"}}
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("gummy pouches 20k, phone cases 5k for Amazon FBA in the USA", "rules"),
+    ("gummy pouches 20k, phone cases 5k", "fallback_rules"),
+])
+def test_multi_product_records_extraction_paths(monkeypatch, query, expected):
+    """Test every product's extraction path is reported and recorded like a single-product request."""
+    from services import gemini_service
+    from utils import rule_extractor
+
+    monitor = rule_extractor.ExtractionMonitor()
+    monkeypatch.setattr(rule_extractor, "EXTRACTION_MONITOR", monitor)
+    monkeypatch.setattr(
+        gemini_service, "analyze_with_hybrid_system",
+        lambda **kwargs: {"success": True, "data": {"product_info": {"name": kwargs["query"]}}}
+    )
+    monkeypatch.setattr(gemini_service.GeminiService, "is_configured", property(lambda self: False))
+    monkeypatch.setattr("services.data_logger.log_analysis", lambda **kwargs: None)
+
+    result = gemini_service.GeminiService().analyze_product({"query": query})
+    assert result["extraction_path"] == expected
+    assert [p["extraction_path"] for p in result["products"]] == [expected, expected]
+    assert monitor.stats()["paths"][expected] == 2
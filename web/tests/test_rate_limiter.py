@@ -0,0 +1,59 @@
+"""
+Unit tests for the shared LLM rate limiter.
+"""
+
+import threading
+import time
+
+import pytest
+
+from utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces_starts():
+    """Test starts beyond the burst wait 60 / requests_per_minute seconds each."""
+    clock = FakeClock()
+    limiter = RateLimiter(max_concurrent=2, requests_per_minute=30, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        with limiter:
+            pass
+    assert clock.sleeps == pytest.approx([2.0, 2.0])
+    assert clock.now == pytest.approx(4.0)
+
+
+def test_concurrency_is_capped():
+    """Test no more than max_concurrent calls are in flight at once."""
+    limiter = RateLimiter(max_concurrent=2, requests_per_minute=6000, burst=10)
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def call():
+        with limiter:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+    with pytest.raises(ValueError):
+        RateLimiter(max_concurrent=0, requests_per_minute=10)
@@ -0,0 +1,48 @@
+"""
+Unit tests for the deterministic extraction fast path and its monitor.
+"""
+
+import pytest
+from utils.rule_extractor import ExtractionMonitor, extract_rule_based
+
+
+def test_confident_only_when_every_field_is_clear():
+    """Test the fast path needs a clear quantity, channel and whole-word market."""
+    clear = extract_rule_based("Peelable gummy 20000 pcs for Amazon FBA, selling in the USA")
+    assert clear["confident"]
+    assert clear["values"]["volume_units"] == 20000
+    assert clear["values"]["channel"] == "Amazon FBA"
+    assert clear["values"]["target_market"] == "USA"
+    assert clear["values"]["route"] == "cn_to_us_west_coast"
+
+    korean = extract_rule_based("마시멜로 200만개 편의점 미국 시장")
+    assert korean["confident"]
+    assert korean["values"]["volume_units"] == 2000000
+
+    # "us" only inside "customs"; bare number; no channel
+    vague = extract_rule_based("customs duty on 3000 mugs?")
+    assert not vague["confident"]
+    assert vague["confidence"]["target_market"] < 0.8
+    assert vague["confidence"]["channel"] == 0.0
+
+
+def test_monitor_reports_paths_latency_and_agreement():
+    """Test path counts, estimated latency saved and per-field agreement."""
+    monitor = ExtractionMonitor()
+    for path in ("rules", "rules", "rules", "llm"):
+        monitor.record_path(path)
+    monitor.record_llm_latency(1200.0)
+    monitor.record_llm_latency(800.0)
+
+    rule_values = {"volume_units": 20000, "channel": "E-commerce", "target_market": "USA"}
+    assert all(monitor.record_comparison(rule_values, {**rule_values, "channel": "Online"}).values())
+    monitor.record_comparison(rule_values, {**rule_values, "channel": "Online", "target_market": "EU"})
+
+    stats = monitor.stats()
+    assert stats["paths"] == {"rules": 3, "llm": 1, "fallback_rules": 0}
+    assert stats["avg_llm_latency_ms"] == 1000.0
+    assert stats["estimated_latency_saved_ms"] == 3000.0
+    assert stats["agreement_rate"] == 0.5
+    assert stats["field_agreement_rate"] == {"volume_units": 1.0, "channel": 1.0, "target_market": 0.5}
+    with pytest.raises(ValueError):
+        monitor.record_path("cache")
@@ -0,0 +1,56 @@
+"""
+Unit tests for the N-dimensional sensitivity scenario grid.
+"""
+
+import pytest
+from utils.cost_calculator import OrderParams, compute_landed_cost, compute_sensitivity
+from utils.scenario_grid import ShockAxis, compute_scenario_grid, rank_scenarios
+
+
+def test_grid_is_cartesian_product():
+    """Test grid size and that the identity scenario equals the base case."""
+    order = OrderParams(category_id="toys_games", units=5000, retail_price_per_unit=8.0)
+    grid = compute_scenario_grid(order, [
+        ShockAxis("freight", (0.9, 1.0, 1.2)),
+        ShockAxis("duty", (-5, 0), mode="add"),
+        ShockAxis("units", (0.5, 1.0, 2.0)),
+    ])
+    
+    assert len(grid["rows"]) == 3 * 2 * 3
+    identity = [row for row in grid["rows"] if not row["shocked_drivers"]]
+    assert len(identity) == 1
+    assert identity[0]["landed_cost_per_unit_usd"] == grid["base"]["landed_cost_per_unit_usd"]
+    assert identity[0]["margin_impact_points"] == 0.0
+
+
+def test_shocks_flow_through_cost_formula():
+    """Test volume shocks match the scalar calculator and cost shocks move cost the right way."""
+    order = OrderParams(category_id="candy_marshmallow_stick", units=20000, retail_price_per_unit=0.99)
+    grid = compute_scenario_grid(order, [ShockAxis("units", (0.5,)), ShockAxis("freight", (1.0, 1.2))])
+    half, half_freight_up = grid["rows"]
+    
+    scalar = compute_landed_cost(OrderParams(category_id="candy_marshmallow_stick", units=10000))
+    assert half["units"] == 10000
+    assert half["landed_cost_per_unit_usd"] == pytest.approx(scalar["landed_cost_per_unit_usd"], abs=1e-4)
+    assert half_freight_up["landed_cost_per_unit_usd"] > half["landed_cost_per_unit_usd"]
+    
+    duty_cut = compute_scenario_grid(order, [ShockAxis("duty", (-5,), mode="add")])
+    assert duty_cut["rows"][0]["margin_impact_points"] > 0
+    with pytest.raises(ValueError):
+        ShockAxis("weather", (1.1,))
+    with pytest.raises(ValueError):
+        compute_scenario_grid(order, [ShockAxis("fob", (1.1,)), ShockAxis("fob", (0.9,))])
+
+
+def test_rank_scenarios_and_sensitivity():
+    """Test ranking by absolute margin impact and the compute_sensitivity() output shape."""
+    order = OrderParams(category_id="toys_games", units=5000)
+    grid = compute_scenario_grid(order, [ShockAxis("fob", (1.0, 1.1)), ShockAxis("units", (1.0, 0.5))])
+    ranked = rank_scenarios(grid, top_n=3, max_drivers=1)
+    
+    assert [row["shocked_drivers"] for row in ranked] == [["units"], ["fob"]]
+    assert abs(ranked[0]["margin_impact_points"]) >= abs(ranked[1]["margin_impact_points"])
+    
+    sensitivity = compute_sensitivity(order)
+    assert len(sensitivity["scenarios"]) == 3
+    assert set(sensitivity["scenarios"][0]) == {"name", "trigger", "margin_impact", "new_margin", "recommendation"}
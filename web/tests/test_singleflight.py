@@ -0,0 +1,101 @@
+"""
+Unit tests for singleflight coalescing of identical in-flight LLM calls.
+"""
+
+import threading
+import time
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+def _run_concurrently(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    """Callers overlapping with the leader wait for and share its result."""
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "answer"
+
+    results = _run_concurrently(8, lambda: flights.do("key", slow))
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["answer"] * 8
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flights.stats() == {"executions": 1, "coalesced": 7, "coalesce_rate": 0.875, "in_flight": 0}
+
+
+def test_sequential_and_distinct_calls_not_coalesced():
+    """A finished call releases its key, and different keys never share."""
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == (1, False)
+    assert flights.do("a", lambda: 2) == (2, False)
+    assert flights.do("b", lambda: 3) == (3, False)
+    assert flights.stats()["coalesced"] == 0
+
+
+def test_leader_exception_raised_in_followers():
+    """A failed call fails every caller waiting on it, then the key is free again."""
+    flights = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ConnectionError("quota")
+
+    def call():
+        try:
+            flights.do("key", failing)
+        except ConnectionError:
+            return "raised"
+
+    assert _run_concurrently(4, call) == ["raised"] * 4
+    assert flights.stats()["in_flight"] == 0
+    assert flights.do("key", lambda: "ok") == ("ok", False)
+
+
+def test_concurrent_analyses_share_insight_call(monkeypatch):
+    """Identical concurrent analyses make one insight call but keep their own analysis IDs."""
+    from services import gemini_service, insight_cache
+
+    calls = []
+
+    class FakeResponse:
+        text = '{"product_name": "Yoga mat", "demand_level": "High"}'
+
+    class FakeService:
+        is_configured = True
+
+        def _generate_content(self, contents):
+            calls.append(1)
+            time.sleep(0.2)
+            return FakeResponse()
+
+    monkeypatch.setattr(gemini_service, "get_gemini_service", lambda: FakeService())
+    monkeypatch.setattr(insight_cache, "get_insight_cache", lambda: None)
+    monkeypatch.setattr(gemini_service, "INSIGHT_FLIGHTS", SingleFlight())
+
+    results = _run_concurrently(4, lambda: gemini_service.analyze_with_hybrid_system(
+        query="yoga mat 5000 units", units=5000, target_market="USA", channel="Amazon"
+    ))
+    assert len(calls) == 1
+    assert sorted(r["insight_source"] for r in results) == ["ai", "ai_shared", "ai_shared", "ai_shared"]
+    assert len({r["full_result"]["meta"]["analysis_id"] for r in results}) == 4
+    assert gemini_service.get_coalescing_stats()["insights"]["coalesced"] == 3
@@ -0,0 +1,213 @@
+"""
+Unit tests for the incremental JSON parser and streamed hybrid analysis.
+"""
+
+import json
+
+import pytest
+
+from utils.streaming_json import IncrementalJSONParser
+
+
+DOCUMENT = {
+    "product_name": "Yoga mat {6mm}, \"premium\"",
+    "demand_level": "High",
+    "hidden_cost_alerts": [{"title": "Duty", "detail": "a [b] {c}"}],
+    "suppliers": [],
+    "volume_units": 5000,
+    "risk_overview": None,
+}
+
+
+def _feed_all(parser, text, size):
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return members
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 10000])
+def test_members_emitted_in_order_for_any_chunking(size):
+    """Every top-level member is emitted once, in order, regardless of chunk size."""
+    parser = IncrementalJSONParser()
+    members = _feed_all(parser, json.dumps(DOCUMENT, indent=2), size)
+    assert members == list(DOCUMENT.items())
+    assert parser.done
+    assert parser.result() == DOCUMENT
+
+
+def test_member_emitted_as_soon_as_it_closes():
+    """A member is available before the rest of the object arrives."""
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"product_name": "Mug", "demand_') == [("product_name", "Mug")]
+    assert parser.feed('level": "Low"') == []
+    assert parser.feed("}") == [("demand_level", "Low")]
+
+
+def test_fence_preamble_and_trailing_text_ignored():
+    """Markdown fences and prose around the object are skipped."""
+    parser = IncrementalJSONParser()
+    text = 'Here you go:\n```json\n{"a": 1, "b": [1, 2]}\n```\nDone.'
+    assert _feed_all(parser, text, 4) == [("a", 1), ("b", [1, 2])]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_trailing_commas_tolerated():
+    """Trailing commas inside values and before the closing brace are accepted."""
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"a": [1, 2,], "b": {"x": 1,},}') == [("a", [1, 2]), ("b", {"x": 1})]
+
+
+def test_unparseable_member_skipped():
+    """A broken value is skipped without losing the members after it."""
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"a": nope, "b": 2}') == [("b", 2)]
+
+
+def test_incomplete_stream_not_done():
+    """A stream cut off mid-object keeps the members completed so far."""
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1, "b": "trunc')
+    assert not parser.done
+    assert parser.result() == {"a": 1}
+
+
+def test_hybrid_analysis_streams_sections(monkeypatch):
+    """on_partial receives the landed cost, then each insight key; the result matches."""
+    from services import gemini_service, insight_cache
+
+    response = json.dumps({"product_name": "Yoga mat", "demand_level": "High", "suppliers": []})
+
+    class FakeStreamingService:
+        is_configured = True
+
+        def _stream_content(self, contents):
+            for i in range(0, len(response), 5):
+                yield response[i:i + 5]
+
+        def _parse_json_response(self, text):
+            return gemini_service.GeminiService()._parse_json_response(text)
+
+    monkeypatch.setattr(gemini_service, "get_gemini_service", lambda: FakeStreamingService())
+    monkeypatch.setattr(insight_cache, "get_insight_cache", lambda: None)
+
+    seen = []
+    result = gemini_service.analyze_with_hybrid_system(
+        query="yoga mat 5000 units", units=5000, target_market="USA", channel="Amazon",
+        on_partial=lambda key, value: seen.append(key)
+    )
+    assert seen == ["landed_cost", "product_name", "demand_level", "suppliers"]
+    assert result["success"]
+    assert result["insight_source"] == "ai"
+
+
+def test_stream_closed_when_consumer_stops_early(monkeypatch):
+    """The stream (and its limiter slot) is released when consumption fails, not at garbage collection."""
+    from services import gemini_service
+    from utils import streaming_json
+
+    closed = []
+    streams = []  # another reference, so refcounting alone would not close it
+
+    def chunks():
+        try:
+            yield '{"product_name": "Yoga mat", '
+            yield '"demand_level": "High"}'
+        finally:
+            closed.append(True)
+
+    class FakeStreamingService:
+        def _stream_content(self, contents):
+            streams.append(chunks())
+            return streams[-1]
+
+    def broken_feed(self, chunk):
+        raise ValueError("parser bug")
+
+    monkeypatch.setattr(streaming_json.IncrementalJSONParser, "feed", broken_feed)
+    with pytest.raises(ValueError):
+        gemini_service._stream_insights(FakeStreamingService(), "prompt", lambda key, value: None)
+    assert closed == [True]
+
+
+def test_failing_callback_keeps_cached_insights(monkeypatch):
+    """A callback error on the landed cost or a cache hit is logged and the insights are kept."""
+    from services import gemini_service, insight_cache
+
+    class FakeCache:
+        def get(self, key):
+            return {"product_name": "Yoga mat", "demand_level": "High"}
+
+    class FakeService:
+        is_configured = True
+
+    def broken_ui(key, value):
+        raise RuntimeError("widget gone")
+
+    monkeypatch.setattr(gemini_service, "get_gemini_service", lambda: FakeService())
+    monkeypatch.setattr(insight_cache, "get_insight_cache", lambda: FakeCache())
+
+    result = gemini_service.analyze_with_hybrid_system(
+        query="yoga mat 5000 units", units=5000, target_market="USA", channel="Amazon",
+        on_partial=broken_ui
+    )
+    assert result["success"]
+    assert result["insight_source"] == "ai_cache"
+
+
+# =============================================================================
+# parse_llm_json
+# =============================================================================
+
+from utils.streaming_json import parse_llm_json
+
+
+def test_clean_response_needs_no_repairs():
+    """A well-formed response parses with an empty repair list."""
+    parsed = parse_llm_json(json.dumps(DOCUMENT))
+    assert parsed.data == DOCUMENT
+    assert parsed.repairs == []
+    assert not parsed.truncated
+
+
+def test_braces_in_surrounding_prose_ignored():
+    """Prose before a fence and after the object may contain braces."""
+    text = 'Use {curly} syntax:\n```json\n{"a": 1}\n```\nSee {"note": true} above.'
+    assert parse_llm_json(text).data == {"a": 1}
+
+
+@pytest.mark.parametrize("text, expected, repairs", [
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}, ["trailing_comma"]),
+    ('{"a": "line\none"}', {"a": "line\none"}, ["control_character"]),
+    ('{"a": 1, "b": "cut', {"a": 1, "b": "cut"}, ["unclosed_brackets", "unclosed_string"]),
+    ('{"a": 1, "b": [1, {"c": tru', {"a": 1, "b": [1, {}]}, ["unclosed_brackets", "truncated_member"]),
+    ('{"a": 1, "b":', {"a": 1}, ["unclosed_brackets", "truncated_member"]),
+])
+def test_repairs_reported(text, expected, repairs):
+    """Each repair yields the recoverable prefix and is named in the result."""
+    parsed = parse_llm_json(text)
+    assert parsed.data == expected
+    assert parsed.repairs == repairs
+
+
+def test_truncation_flag():
+    """Cut-off output is marked truncated; a trailing comma alone is not."""
+    assert parse_llm_json('{"a": [1').truncated
+    assert not parse_llm_json('{"a": [1,]}').truncated
+
+
+def test_unrecoverable_input_returns_error():
+    """No object, or an object broken beyond repair, gives data None and an error."""
+    assert parse_llm_json("no json here").data is None
+    parsed = parse_llm_json('{"a" 1}')
+    assert parsed.data is None
+    assert parsed.error
+
+
+def test_extraction_validation_uses_repairing_parser():
+    """validate_and_normalize_extraction accepts a truncated extraction response."""
+    from utils.extraction_prompts import validate_and_normalize_extraction
+
+    data, error = validate_and_normalize_extraction('```json\n{"volume": 5000, "channel": "amazon", ')
+    assert error is None
+    assert data["volume_units"] == 5000
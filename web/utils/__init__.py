@@ -14,7 +14,21 @@ from utils.cost_tables import (
     get_lead_time_estimate,
     get_hidden_cost_estimate,
 )
-from utils.cost_calculator import OrderParams, compute_landed_cost
+from utils.compiled_cost_tables import (
+    CompiledCostTables,
+    get_compiled_cost_tables,
+    rebuild_compiled_cost_tables,
+    get_cost_table_version,
+)
+from utils.cost_calculator import (
+    OrderParams,
+    compute_landed_cost,
+    LandedCostBatch,
+    compute_landed_cost_batch,
+    compute_landed_cost_for_orders,
+    get_cost_cache_stats,
+    clear_cost_cache,
+)
 from utils.result_builder import build_nexsupply_result, convert_to_dashboard_format
 from utils.prompts import (
     SYSTEM_INSTRUCTION,
@@ -62,9 +76,19 @@ __all__ = [
     "get_confidence_level",
     "get_lead_time_estimate",
     "get_hidden_cost_estimate",
+    # Compiled Cost Tables
+    "CompiledCostTables",
+    "get_compiled_cost_tables",
+    "rebuild_compiled_cost_tables",
+    "get_cost_table_version",
     # Cost Calculator
     "OrderParams",
     "compute_landed_cost",
+    "LandedCostBatch",
+    "compute_landed_cost_batch",
+    "compute_landed_cost_for_orders",
+    "get_cost_cache_stats",
+    "clear_cost_cache",
     # Result Builder
     "build_nexsupply_result",
     "convert_to_dashboard_format",
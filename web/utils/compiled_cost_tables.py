@@ -0,0 +1,308 @@
+"""
+NexSupply Compiled Cost Tables - Struct-of-arrays view of COST_TABLES
+COST_TABLES is the authoring format (nested dicts, one freight profile per
+category). The calculators read this compiled form instead:
+
+- Interned string → int maps for categories and routes
+- One dense float64 array per coefficient, indexed [category_id, route_id]
+- Per-category metadata (label, HS code, benchmarks) with defaults applied
+- FOB price breaks as sorted thresholds, resolved by binary search
+
+Built once at import. Call rebuild_compiled_cost_tables() after editing
+COST_TABLES at runtime.
+"""
+
+import bisect
+import hashlib
+import json
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.cost_tables import COST_TABLES
+
+
+FALLBACK_CATEGORY_ID = "generic_consumer_product"
+FALLBACK_ROUTE = "cn_to_us_west_coast"
+
+
+class CostCoefficients(NamedTuple):
+    """
+    Numeric coefficients for one (category, route) pair.
+    Fields are floats for scalar lookups and arrays for batch gathers.
+    """
+    default_unit_weight_kg: Any
+    default_units_per_carton: Any
+    default_cartons_per_cbm: Any
+    base_fob_cost_per_kg: Any
+    packing_cost_per_carton_usd: Any
+    inner_carton_cost_usd: Any
+    sea_freight_per_cbm_usd: Any
+    origin_charges_per_cbm_usd: Any
+    destination_charges_per_cbm_usd: Any
+    docs_and_broker_per_shipment_usd: Any
+    port_misc_per_shipment_usd: Any
+    qc_cost_per_order_usd: Any
+    cert_cost_per_sku_usd: Any
+    duty_rate_percent: Any
+    extra_taxes_percent: Any
+    margin_low: Any
+    margin_typical: Any
+    margin_high: Any
+    fcl_20gp_usd: Any
+    fcl_40gp_usd: Any
+    fcl_40hq_usd: Any
+
+
+# Where each coefficient lives in a COST_TABLES entry
+_FREIGHT_KEYS = (
+    "sea_freight_per_cbm_usd",
+    "origin_charges_per_cbm_usd",
+    "destination_charges_per_cbm_usd",
+)
+_HANDLING_KEYS = (
+    "docs_and_broker_per_shipment_usd",
+    "port_misc_per_shipment_usd",
+)
+_MARGIN_DEFAULTS = {"margin_low": 0.15, "margin_typical": 0.30, "margin_high": 0.50}
+_CONTAINER_RATE_KEYS = {"fcl_20gp_usd": "20gp", "fcl_40gp_usd": "40gp", "fcl_40hq_usd": "40hq"}
+
+
+def _source_value(cfg: Dict[str, Any], route: str, field: str) -> float:
+    """Read one coefficient from a COST_TABLES entry (same fallbacks as compute_landed_cost)."""
+    if field in _FREIGHT_KEYS or field in _CONTAINER_RATE_KEYS:
+        freight_cfg = cfg["freight_profile"].get(route, cfg["freight_profile"][FALLBACK_ROUTE])
+        if field in _CONTAINER_RATE_KEYS:
+            return freight_cfg["container_rates_usd"][_CONTAINER_RATE_KEYS[field]]
+        return freight_cfg[field]
+    if field in _HANDLING_KEYS:
+        return cfg["handling_profile"][field]
+    if field in _MARGIN_DEFAULTS:
+        return cfg.get("margin_benchmarks", {}).get(field[len("margin_"):], _MARGIN_DEFAULTS[field])
+    return cfg[field]
+
+
+def _fob_tiers(cfg: Dict[str, Any]) -> Tuple[List[float], List[float]]:
+    """
+    FOB price breaks of a COST_TABLES entry as (thresholds, rates).
+
+    thresholds[i] is the first unit count billed at rates[i + 1]; rates[0] is
+    base_fob_cost_per_kg. Categories without breaks get ([], [base]).
+    """
+    breaks = cfg.get("fob_price_breaks", [])
+    thresholds = [float(b["min_units"]) for b in breaks]
+    if any(b <= a for a, b in zip(thresholds, thresholds[1:])) or any(t <= 0 for t in thresholds):
+        raise ValueError(f"{cfg.get('label')}: fob_price_breaks must have increasing positive min_units")
+    rates = [cfg["base_fob_cost_per_kg"]] + [b["fob_cost_per_kg"] for b in breaks]
+    return thresholds, rates
+
+
+def _table_version(tables: Dict[str, Dict[str, Any]]) -> str:
+    """Stable content hash of the source tables (used as a cache key component)."""
+    payload = json.dumps(tables, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+class CompiledCostTables:
+    """
+    Dense, index-addressed representation of COST_TABLES.
+
+    `values` has shape (n_categories, n_routes, n_coefficients); per-category
+    coefficients are repeated across the route axis so every lookup is a
+    single [category_id, route_id] index.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Any]]):
+        self.category_ids: List[str] = list(tables.keys())
+        self.category_index: Dict[str, int] = {c: i for i, c in enumerate(self.category_ids)}
+
+        routes: Dict[str, int] = {}
+        for cfg in tables.values():
+            for route in cfg["freight_profile"]:
+                routes.setdefault(route, len(routes))
+        self.routes: List[str] = list(routes)
+        self.route_index: Dict[str, int] = routes
+
+        self.fallback_category = self.category_index[FALLBACK_CATEGORY_ID]
+        self.fallback_route = self.route_index[FALLBACK_ROUTE]
+
+        fields = CostCoefficients._fields
+        self.values = np.array(
+            [
+                [[_source_value(cfg, route, field) for field in fields] for route in self.routes]
+                for cfg in tables.values()
+            ],
+            dtype=np.float64,
+        ).reshape(len(self.category_ids), len(self.routes), len(fields))
+        self.values.setflags(write=False)
+
+        # Prebuilt Python-float rows for scalar lookups (no NumPy scalar overhead)
+        self._rows: List[List[CostCoefficients]] = [
+            [CostCoefficients(*row) for row in category_rows]
+            for category_rows in self.values.tolist()
+        ]
+
+        # One array per coefficient, e.g. self.arrays["duty_rate_percent"][c, r]
+        self.arrays: Dict[str, np.ndarray] = {
+            field: self.values[:, :, i] for i, field in enumerate(fields)
+        }
+
+        # Non-numeric / display metadata per category, defaults applied once
+        self.metadata: List[Dict[str, Any]] = [
+            {
+                "label": cfg["label"],
+                "hs_code_hint": cfg.get("hs_code_hint", "N/A"),
+                "duty_rate_percent": cfg["duty_rate_percent"],
+                "moq_units": cfg.get("moq_units", 1000),
+                "typical_lead_time_days": cfg.get("typical_lead_time_days", 25),
+                "margin_low": cfg.get("margin_benchmarks", {}).get("low", 0.15),
+                "margin_typical": cfg.get("margin_benchmarks", {}).get("typical", 0.30),
+                "margin_high": cfg.get("margin_benchmarks", {}).get("high", 0.50),
+            }
+            for cfg in tables.values()
+        ]
+
+        # FOB price breaks. Scalar: per-category sorted thresholds for bisect.
+        # Batch: all categories' thresholds in one sorted array keyed by
+        # (category_id, threshold), so one np.searchsorted resolves every order.
+        self.fob_tiers: List[Tuple[List[float], List[float]]] = [
+            _fob_tiers(cfg) for cfg in tables.values()
+        ]
+        starts = [[0.0] + thresholds for thresholds, _ in self.fob_tiers]
+        self.max_fob_tiers = max(len(rates) for _, rates in self.fob_tiers)
+        self._tier_scale = max(max(t[-1] for t in starts) * 2.0, 1.0)
+        self._tier_keys = np.array(
+            [c * self._tier_scale + t for c, ts in enumerate(starts) for t in ts], dtype=np.float64
+        )
+        self._tier_rates = np.array(
+            [rate for _, rates in self.fob_tiers for rate in rates], dtype=np.float64
+        )
+
+        # Padded (n_categories, max_fob_tiers) view for solvers: tier start
+        # units (inf past the last tier) and $/kg (last rate repeated)
+        self.fob_tier_starts = np.full((len(starts), self.max_fob_tiers), np.inf)
+        self.fob_tier_rates = np.empty((len(starts), self.max_fob_tiers))
+        for c, (ts, (_, rates)) in enumerate(zip(starts, self.fob_tiers)):
+            self.fob_tier_starts[c, :len(ts)] = ts
+            self.fob_tier_rates[c, :] = rates[-1]
+            self.fob_tier_rates[c, :len(rates)] = rates
+
+        self.version = _table_version(tables)
+
+    # -------------------------------------------------------------------------
+    # Index resolution
+    # -------------------------------------------------------------------------
+
+    def category_id_of(self, category_id: str) -> int:
+        """Interned index for a category (unknown → generic_consumer_product)."""
+        return self.category_index.get(category_id, self.fallback_category)
+
+    def route_id_of(self, route: Optional[str]) -> int:
+        """Interned index for a route (unknown → cn_to_us_west_coast)."""
+        return self.route_index.get(route, self.fallback_route)
+
+    def category_ids_of(self, category_ids: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+        """Vector version of category_id_of(); integer input is passed through."""
+        arr = np.asarray(category_ids)
+        if arr.dtype.kind in "iu":
+            return arr.astype(np.intp, copy=False)
+        get, fallback = self.category_index.get, self.fallback_category
+        return np.fromiter((get(c, fallback) for c in arr), dtype=np.intp, count=len(arr))
+
+    def route_ids_of(self, routes: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+        """Vector version of route_id_of(); integer input is passed through."""
+        arr = np.asarray(routes)
+        if arr.dtype.kind in "iu":
+            return arr.astype(np.intp, copy=False)
+        get, fallback = self.route_index.get, self.fallback_route
+        return np.fromiter((get(r, fallback) for r in arr), dtype=np.intp, count=len(arr))
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def lookup(self, category_id: str, route: Optional[str]) -> CostCoefficients:
+        """Coefficients for one order as Python floats."""
+        return self._rows[self.category_id_of(category_id)][self.route_id_of(route)]
+
+    def gather(self, category_idx: np.ndarray, route_idx: np.ndarray) -> CostCoefficients:
+        """Coefficients for many orders as arrays (one fancy-index per call)."""
+        gathered = self.values[category_idx, route_idx]
+        return CostCoefficients(*(gathered[..., i] for i in range(len(CostCoefficients._fields))))
+
+    def fob_cost_per_kg(self, category_id: str, units: float) -> float:
+        """FOB $/kg for one order after quantity price breaks (bisect)."""
+        thresholds, rates = self.fob_tiers[self.category_id_of(category_id)]
+        return rates[bisect.bisect_right(thresholds, units)] if thresholds else rates[0]
+
+    def fob_costs_per_kg(self, category_idx: np.ndarray, units: np.ndarray) -> np.ndarray:
+        """
+        Vector version of fob_cost_per_kg(): one np.searchsorted over the
+        (category, threshold) keys of every category.
+        """
+        keys = category_idx * self._tier_scale + np.minimum(units, self._tier_scale - 1)
+        return self._tier_rates[np.searchsorted(self._tier_keys, keys, side="right") - 1]
+
+    def metadata_for(self, category_id: str) -> Dict[str, Any]:
+        """Display metadata (label, HS code, benchmarks) for a category."""
+        return self.metadata[self.category_id_of(category_id)]
+
+    # -------------------------------------------------------------------------
+    # Consistency check
+    # -------------------------------------------------------------------------
+
+    def verify(self, tables: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Compare every compiled cell against the source dicts.
+
+        Returns:
+            List of mismatch descriptions (empty if the tables match exactly)
+        """
+        errors = []
+        if list(tables.keys()) != self.category_ids:
+            errors.append("category ids differ from source")
+            return errors
+
+        for c, (category_id, cfg) in enumerate(tables.items()):
+            for r, route in enumerate(self.routes):
+                for i, field in enumerate(CostCoefficients._fields):
+                    expected = _source_value(cfg, route, field)
+                    actual = self._rows[c][r][i]
+                    if actual != expected:
+                        errors.append(f"{category_id}/{route}/{field}: {actual!r} != {expected!r}")
+            if self.fob_tiers[c] != _fob_tiers(cfg):
+                errors.append(f"{category_id}/fob_price_breaks differ from source")
+            if self.metadata[c]["label"] != cfg["label"]:
+                errors.append(f"{category_id}/label differs from source")
+
+        return errors
+
+
+def compile_cost_tables(tables: Dict[str, Dict[str, Any]] = None) -> CompiledCostTables:
+    """Compile (and verify) a cost table dict into a CompiledCostTables."""
+    tables = COST_TABLES if tables is None else tables
+    compiled = CompiledCostTables(tables)
+    errors = compiled.verify(tables)
+    if errors:
+        raise ValueError(f"Compiled cost tables do not match source: {errors[:5]}")
+    return compiled
+
+
+_compiled: CompiledCostTables = compile_cost_tables()
+
+
+def get_compiled_cost_tables() -> CompiledCostTables:
+    """Get the process-wide compiled cost tables."""
+    return _compiled
+
+
+def rebuild_compiled_cost_tables() -> CompiledCostTables:
+    """Recompile from the current COST_TABLES (call after editing COST_TABLES)."""
+    global _compiled
+    _compiled = compile_cost_tables()
+    return _compiled
+
+
+def get_cost_table_version() -> str:
+    """Content hash of the cost tables currently in use."""
+    return _compiled.version
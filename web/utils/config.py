@@ -155,6 +155,29 @@ class AppSettings:
     DEFAULT_ROUTE = "cn_to_us_west_coast"
     DEFAULT_DESTINATION = "Los Angeles"
     
+    # Rule-based extraction fast path: skip the LLM extraction call when every
+    # field is found at or above this confidence; compare a sample with the LLM
+    EXTRACTION_FAST_PATH_MIN_CONFIDENCE = 0.8
+    EXTRACTION_SHADOW_SAMPLE_RATE = 0.05
+
+    # Product query autocomplete: distinct queries kept in memory, logged rows
+    # read at startup, and how fast a query's popularity decays
+    AUTOCOMPLETE_MAX_ENTRIES = 20000
+    AUTOCOMPLETE_BOOTSTRAP_ROWS = 50000
+    AUTOCOMPLETE_HALF_LIFE_DAYS = 14
+
+    # Gemini calls shared by every pipeline in the process
+    LLM_MAX_CONCURRENT_REQUESTS = 4
+    LLM_REQUESTS_PER_MINUTE = 60
+
+    # Multi-product queries: most products analyzed from one query
+    MULTI_PRODUCT_MAX_SEGMENTS = 6
+
+    # Persistent cache of qualitative AI insights (numbers are always recomputed)
+    INSIGHT_CACHE_ENABLED = True
+    INSIGHT_CACHE_TTL_HOURS = 24
+    INSIGHT_CACHE_MAX_ENTRIES = 5000
+
     # Route display mappings
     ROUTE_DISPLAY_MAP = {
         "cn_to_us_west_coast": "China → US West Coast",
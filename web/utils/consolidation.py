@@ -0,0 +1,117 @@
+"""
+NexSupply Consolidation - Multi-SKU shipment landed cost
+A PO that combines several SKUs (possibly from different categories) in one
+shipment pays the per-shipment handling fees (customs broker/docs, port misc)
+and the per-order QC inspection once, not once per SKU as separate
+compute_landed_cost() calls would. This module prices all SKUs in one batch,
+charges those shared fees once and allocates them back to SKUs by CBM, value
+or weight.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from utils.cost_calculator import OrderParams, compute_landed_cost_batch
+
+
+# Line items charged once per consolidated shipment / order
+SHARED_COST_KEYS = ("customs_broker", "port_misc", "qc_inspection")
+
+# Allocation basis → batch column used to split shared costs
+ALLOCATION_BASES = {
+    "cbm": "total_cbm",
+    "value": "product_fob",
+    "weight": "total_weight_kg",
+}
+
+
+def compute_consolidated_shipment(
+    skus: Sequence[OrderParams],
+    route: Optional[str] = None,
+    allocation: str = "cbm"
+) -> Dict[str, Any]:
+    """
+    Landed cost for several SKUs shipped together.
+
+    Shared fees are charged once at the highest rate among the SKUs'
+    categories (the shipment is cleared and inspected as one order).
+    Certification stays per SKU.
+
+    Args:
+        skus: One OrderParams per SKU line
+        route: Shipping route for the whole shipment (defaults to the first SKU's route)
+        allocation: How shared fees are split: "cbm", "value" (FOB) or "weight"
+
+    Returns:
+        Dictionary with shipment totals, savings vs. separate shipments and
+        per-SKU landed cost
+    """
+    if allocation not in ALLOCATION_BASES:
+        raise ValueError(
+            f"Unknown allocation: {allocation!r} (use one of {', '.join(ALLOCATION_BASES)})"
+        )
+    if not skus:
+        raise ValueError("skus must not be empty")
+
+    route = route or skus[0].route
+    batch = compute_landed_cost_batch(
+        category_ids=[sku.category_id for sku in skus],
+        units=[sku.units for sku in skus],
+        routes=route,
+        retail_prices=[sku.retail_price_per_unit for sku in skus],
+        custom_unit_weights_kg=[sku.custom_unit_weight_kg for sku in skus],
+    )
+    cols = batch.columns
+
+    # Shared fees: charged per SKU by the batch engine, once per shipment here
+    charged_per_sku = sum(cols[key] for key in SHARED_COST_KEYS)
+    shared_fees = {key: float(cols[key].max()) for key in SHARED_COST_KEYS}
+    shared_total = sum(shared_fees.values())
+
+    basis = cols[ALLOCATION_BASES[allocation]]
+    basis_total = basis.sum()
+    weights = basis / basis_total if basis_total > 0 else np.full(len(skus), 1.0 / len(skus))
+    allocated = shared_total * weights
+
+    separate_total = cols["total_landed_cost_usd"]
+    sku_total = separate_total - charged_per_sku + allocated
+    units = batch.units.astype(np.float64)
+    sku_cost_per_unit = sku_total / units
+
+    retail = batch.retail_price_per_unit  # NaN where no retail price
+    margin_pct = (retail - sku_cost_per_unit) / retail * 100.0
+
+    lines: List[Dict[str, Any]] = []
+    for i, sku in enumerate(skus):
+        line = {
+            "category_id": sku.category_id,
+            "units": int(batch.units[i]),
+            "total_cbm": round(float(cols["total_cbm"][i]), 3),
+            "total_weight_kg": round(float(cols["total_weight_kg"][i]), 2),
+            "allocation_share_percent": round(float(weights[i]) * 100.0, 1),
+            "allocated_shared_costs_usd": round(float(allocated[i]), 2),
+            "total_landed_cost_usd": round(float(sku_total[i]), 2),
+            "landed_cost_per_unit_usd": round(float(sku_cost_per_unit[i]), 4),
+            "standalone_cost_per_unit_usd": round(float(cols["landed_cost_per_unit_usd"][i]), 4),
+        }
+        if not np.isnan(margin_pct[i]):
+            line["gross_margin_percent"] = round(float(margin_pct[i]), 1)
+        lines.append(line)
+
+    consolidated_total = float(sku_total.sum())
+    standalone_total = float(separate_total.sum())
+
+    return {
+        "route": route,
+        "allocation": allocation,
+        "sku_count": len(skus),
+        "total_units": int(batch.units.sum()),
+        "total_cbm": round(float(cols["total_cbm"].sum()), 3),
+        "total_weight_kg": round(float(cols["total_weight_kg"].sum()), 2),
+        "shared_costs_usd": {key: round(value, 2) for key, value in shared_fees.items()},
+        "total_landed_cost_usd": round(consolidated_total, 2),
+        "standalone_total_usd": round(standalone_total, 2),
+        "savings_usd": round(standalone_total - consolidated_total, 2),
+        "skus": lines,
+    }
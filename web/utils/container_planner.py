@@ -0,0 +1,256 @@
+"""
+NexSupply Container Planner - LCL vs 20ft / 40ft / 40HQ FCL
+compute_landed_cost() prices freight per CBM (LCL-style). This stage takes
+total_cbm and total_weight_kg from a cost result and picks the cheapest mix
+of FCL containers, optionally with an LCL remainder, under each container's
+usable volume and payload limits.
+
+Orders are grouped by cargo profile (usable capacity per container type,
+FCL rates, LCL rate); a batch usually has one profile per category/route.
+Each profile gets precomputed breakpoints over every container mix in
+MIX_TABLE, so planning an order is two binary searches rather than a search
+over mixes.
+"""
+
+import itertools
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+from utils.cost_tables import CONTAINER_SPECS
+from utils.compiled_cost_tables import get_compiled_cost_tables
+
+
+CONTAINER_TYPES = tuple(CONTAINER_SPECS)  # ("20gp", "40gp", "40hq")
+CONTAINER_RATE_FIELDS = tuple(f"fcl_{t}_usd" for t in CONTAINER_TYPES)
+
+_USABLE_CBM = np.array([CONTAINER_SPECS[t]["usable_cbm"] for t in CONTAINER_TYPES])
+_MAX_PAYLOAD_KG = np.array([CONTAINER_SPECS[t]["max_payload_kg"] for t in CONTAINER_TYPES], dtype=np.float64)
+
+# Container counts enumerated per cargo profile: enough of each type to hold
+# ~450 CBM of volume-limited cargo on its own. Row 0 is pure LCL.
+MIX_TABLE = np.array(list(itertools.product(range(17), range(9), range(8))), dtype=np.float64)
+
+_FRONTIER_CACHE_SIZE = 512
+_frontier_cache: Dict[Tuple[float, ...], Tuple[np.ndarray, ...]] = {}
+
+
+def _running_argmin(values: np.ndarray) -> np.ndarray:
+    """Index of the minimum of values[:i + 1] for every i."""
+    index = np.arange(len(values))
+    is_min = values == np.minimum.accumulate(values)
+    return np.maximum.accumulate(np.where(is_min, index, 0))
+
+
+def _mix_frontier(key: Tuple[float, ...]) -> Tuple[np.ndarray, ...]:
+    """
+    Precomputed breakpoints for one cargo profile (capacities, rates, LCL rate).
+
+    Mixes are sorted by capacity. For a shipment of V CBM the cheapest plan is
+    either the cheapest mix holding all of V (suffix minimum of cost over
+    capacity >= V) or a smaller mix plus LCL for the rest (prefix minimum of
+    cost - lcl_rate * capacity over capacity <= V), so each order needs two
+    binary searches.
+    """
+    cached = _frontier_cache.get(key)
+    if cached is not None:
+        return cached
+
+    n_types = len(CONTAINER_TYPES)
+    capacity, rates, lcl_rate = np.array(key[:n_types]), np.array(key[n_types:-1]), key[-1]
+    mix_capacity = MIX_TABLE @ capacity
+    order = np.argsort(mix_capacity, kind="stable")
+    mix_capacity = mix_capacity[order]
+    mix_cost = (MIX_TABLE @ rates)[order]
+
+    last = len(order) - 1
+    cover_best = order[last - _running_argmin(mix_cost[::-1])[::-1]]
+    partial_best = order[_running_argmin(mix_cost - lcl_rate * mix_capacity)]
+
+    if len(_frontier_cache) >= _FRONTIER_CACHE_SIZE:
+        _frontier_cache.clear()
+    _frontier_cache[key] = (mix_capacity, cover_best, partial_best)
+    return _frontier_cache[key]
+
+
+def _group_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group identical rows of a float matrix.
+
+    Faster than np.unique(axis=0): each column is coded separately and the
+    codes are combined into one int64 key.
+
+    Returns:
+        (group id per row, index of one row per group)
+    """
+    group_of = np.zeros(len(matrix), dtype=np.int64)
+    first_member = np.zeros(min(len(matrix), 1), dtype=np.intp)
+    for column in matrix.T:
+        values, codes = np.unique(column, return_inverse=True)
+        # Re-compact after each column so the combined key stays below n**2
+        _, first_member, group_of = np.unique(
+            group_of * len(values) + codes.ravel(), return_index=True, return_inverse=True
+        )
+        group_of = group_of.ravel()
+    return group_of, first_member
+
+
+def plan_containers_batch(
+    total_cbm: np.ndarray,
+    total_weight_kg: np.ndarray,
+    lcl_rate_per_cbm: np.ndarray,
+    container_rates_usd: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Cheapest container mix per shipment.
+
+    Args:
+        total_cbm: Shipment volume per order
+        total_weight_kg: Shipment weight per order
+        lcl_rate_per_cbm: LCL freight + origin + destination per CBM
+        container_rates_usd: All-in FCL rate per container, shape (n, len(CONTAINER_TYPES))
+
+    Returns:
+        Dictionary of arrays: `containers` (n, types) counts, `lcl_cbm`,
+        `freight_usd`, `lcl_only_freight_usd`, `savings_usd`,
+        `utilization_percent` (volume used in the chosen containers) and
+        `lcl_fcl_breakpoint_cbm` (volume above which one container beats LCL)
+    """
+    volume = np.asarray(total_cbm, dtype=np.float64)
+    weight = np.asarray(total_weight_kg, dtype=np.float64)
+    lcl_rate = np.asarray(lcl_rate_per_cbm, dtype=np.float64)
+    n = len(volume)
+    rates = np.asarray(container_rates_usd, dtype=np.float64).reshape(n, len(CONTAINER_TYPES))
+    rows = np.arange(n)
+
+    # Usable CBM of *this* cargo per container: volume- or payload-limited
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cbm_per_kg = np.where(weight > 0, volume / weight, np.inf)
+    capacity = np.minimum(_USABLE_CBM, _MAX_PAYLOAD_KG * cbm_per_kg[:, None])
+
+    # Beyond what MIX_TABLE covers, pre-load full containers of the type that
+    # is cheapest per usable CBM, if that beats LCL (near-optimal for very
+    # large shipments)
+    table_limit = (capacity * MIX_TABLE.max(axis=0)).min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost_per_cbm = rates / capacity
+    bulk_type = np.argmin(cost_per_cbm, axis=1)
+    bulk_capacity = capacity[rows, bulk_type]
+    bulk_count = np.where(
+        cost_per_cbm[rows, bulk_type] < lcl_rate,
+        np.maximum(np.ceil((volume - table_limit) / bulk_capacity), 0.0),
+        0.0,
+    )
+    remainder = volume - bulk_count * bulk_capacity
+
+    best_mix = np.zeros(n, dtype=np.intp)
+    lcl_cbm = np.zeros(n)
+    profile_of, first_member = _group_rows(np.column_stack([capacity, rates, lcl_rate]))
+    by_profile = np.argsort(profile_of, kind="stable")
+    bounds = np.searchsorted(profile_of[by_profile], np.arange(len(first_member) + 1))
+    for p, first in enumerate(first_member):
+        members = by_profile[bounds[p]:bounds[p + 1]]
+        key = (*capacity[first].tolist(), *rates[first].tolist(), float(lcl_rate[first]))
+        mix_capacity, cover_best, partial_best = _mix_frontier(key)
+        v = remainder[members]
+        cover_at = np.searchsorted(mix_capacity, v, side="left")
+        covered = cover_at < len(cover_best)  # False when v exceeds every mix
+        cover = cover_best[np.minimum(cover_at, len(cover_best) - 1)]
+        partial = partial_best[np.searchsorted(mix_capacity, v, side="right") - 1]
+
+        cover_cost = np.where(covered, MIX_TABLE[cover] @ rates[members[0]], np.inf)
+        partial_lcl = np.maximum(v - MIX_TABLE[partial] @ capacity[members[0]], 0.0)
+        partial_cost = MIX_TABLE[partial] @ rates[members[0]] + partial_lcl * lcl_rate[members[0]]
+        use_partial = partial_cost < cover_cost
+        best_mix[members] = np.where(use_partial, partial, cover)
+        lcl_cbm[members] = np.where(use_partial, partial_lcl, 0.0)
+
+    containers = MIX_TABLE[best_mix].copy()
+    containers[rows, bulk_type] += bulk_count
+    freight = (containers * rates).sum(axis=1) + lcl_cbm * lcl_rate
+    lcl_only = volume * lcl_rate
+
+    container_cbm = (containers * capacity).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(
+            container_cbm > 0, (volume - lcl_cbm) / container_cbm * 100.0, 0.0
+        )
+        breakpoint_cbm = np.where(lcl_rate > 0, rates.min(axis=1) / lcl_rate, np.inf)
+
+    return {
+        "containers": containers.astype(np.int64),
+        "lcl_cbm": lcl_cbm,
+        "freight_usd": freight,
+        "lcl_only_freight_usd": lcl_only,
+        "savings_usd": lcl_only - freight,
+        "utilization_percent": utilization,
+        "lcl_fcl_breakpoint_cbm": breakpoint_cbm,
+    }
+
+
+def plan_containers_for_orders(
+    category_ids: np.ndarray,
+    routes: np.ndarray,
+    total_cbm: np.ndarray,
+    total_weight_kg: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Gather LCL and FCL rates from the compiled tables and plan each order."""
+    tables = get_compiled_cost_tables()
+    coef = tables.gather(tables.category_ids_of(category_ids), tables.route_ids_of(routes))
+    lcl_rate = (
+        coef.sea_freight_per_cbm_usd
+        + coef.origin_charges_per_cbm_usd
+        + coef.destination_charges_per_cbm_usd
+    )
+    rates = np.stack([getattr(coef, field) for field in CONTAINER_RATE_FIELDS], axis=-1)
+    return plan_containers_batch(total_cbm, total_weight_kg, lcl_rate, rates)
+
+
+def plan_containers_for_batch(batch) -> Dict[str, np.ndarray]:
+    """Container plan for every order in a LandedCostBatch."""
+    return plan_containers_for_orders(
+        batch.category_ids,
+        batch.routes,
+        batch.columns["total_cbm"],
+        batch.columns["total_weight_kg"],
+    )
+
+
+def plan_containers(landed_cost: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Container plan for one compute_landed_cost() result.
+
+    Returns:
+        Dictionary with the chosen mode (LCL / FCL / FCL+LCL), container
+        counts, freight cost vs. all-LCL and the LCL→FCL breakpoint
+    """
+    assumptions = landed_cost["assumptions"]
+    plan = plan_containers_for_orders(
+        np.array([assumptions["category_id"]]),
+        np.array([assumptions["route"]]),
+        np.array([landed_cost["total_cbm"]]),
+        np.array([landed_cost["total_weight_kg"]]),
+    )
+
+    containers = {t: int(n) for t, n in zip(CONTAINER_TYPES, plan["containers"][0]) if n}
+    lcl_cbm = float(plan["lcl_cbm"][0])
+    if not containers:
+        mode = "LCL"
+    elif lcl_cbm > 0:
+        mode = "FCL+LCL"
+    else:
+        mode = "FCL"
+
+    return {
+        "mode": mode,
+        "containers": containers,
+        "containers_display": ", ".join(
+            f"{n} x {CONTAINER_SPECS[t]['label']}" for t, n in containers.items()
+        ) or "LCL only",
+        "lcl_cbm": round(lcl_cbm, 3),
+        "freight_usd": round(float(plan["freight_usd"][0]), 2),
+        "lcl_only_freight_usd": round(float(plan["lcl_only_freight_usd"][0]), 2),
+        "savings_usd": round(float(plan["savings_usd"][0]), 2),
+        "utilization_percent": round(float(plan["utilization_percent"][0]), 1),
+        "lcl_fcl_breakpoint_cbm": round(float(plan["lcl_fcl_breakpoint_cbm"][0]), 1),
+    }
@@ -9,14 +9,25 @@ SECURITY NOTE: This module contains proprietary calculation logic.
 Do not expose calculation formulas or coefficients to client-side code.
 """
 
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Iterator, List, Tuple, Union
+
+import numpy as np
+
 from utils.cost_tables import COST_TABLES, classify_category, get_category_config
+from utils.compiled_cost_tables import (
+    CostCoefficients,
+    get_compiled_cost_tables,
+    get_cost_table_version,
+)
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrderParams:
-    """Parameters for landed cost calculation."""
+    """Parameters for landed cost calculation (immutable and hashable)."""
     category_id: str
     units: int
     route: str = None
@@ -28,10 +39,23 @@ class OrderParams:
         """Set defaults from AppSettings if not provided."""
         from utils.config import AppSettings
         if self.route is None:
-            self.route = AppSettings.DEFAULT_ROUTE
+            object.__setattr__(self, "route", AppSettings.DEFAULT_ROUTE)
         if self.incoterm is None:
-            self.incoterm = AppSettings.DEFAULT_INCOTERM
-    
+            object.__setattr__(self, "incoterm", AppSettings.DEFAULT_INCOTERM)
+    
+    @property
+    def cache_key(self) -> Tuple:
+        """Memo key: every input that affects the result plus the cost-table version."""
+        return (
+            self.category_id,
+            self.units,
+            self.route,
+            self.incoterm,
+            self.retail_price_per_unit,
+            self.custom_unit_weight_kg,
+            get_cost_table_version(),
+        )
+
 
 def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     """
@@ -44,12 +68,14 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     - Margin estimates (if retail price provided)
     - Assumptions and metadata
     """
-    cfg = get_category_config(order.category_id)
+    # O(1) indexed lookup into the compiled tables (same fallbacks as the dicts)
+    tables = get_compiled_cost_tables()
+    coef = tables.lookup(order.category_id, order.route)
     
     units = order.units
-    unit_weight = order.custom_unit_weight_kg or cfg["default_unit_weight_kg"]
-    units_per_carton = cfg["default_units_per_carton"]
-    cartons_per_cbm = cfg["default_cartons_per_cbm"]
+    unit_weight = order.custom_unit_weight_kg or coef.default_unit_weight_kg
+    units_per_carton = coef.default_units_per_carton
+    cartons_per_cbm = coef.default_cartons_per_cbm
     
     # ===========================================
     # BASIC CALCULATIONS
@@ -61,53 +87,108 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     # ===========================================
     # PRODUCT COST (FOB)
     # ===========================================
-    product_cost = total_weight_kg * cfg["base_fob_cost_per_kg"]
+    # Quantity price breaks (if any) resolved by binary search
+    fob_cost_per_kg = tables.fob_cost_per_kg(order.category_id, units)
+    product_cost = total_weight_kg * fob_cost_per_kg
     
     # ===========================================
     # PACKING COSTS
     # ===========================================
-    packing_cost = total_cartons * cfg["packing_cost_per_carton_usd"]
-    inner_carton_cost = total_cartons * cfg["inner_carton_cost_usd"]
-    total_packing = packing_cost + inner_carton_cost
+    packing_cost = total_cartons * coef.packing_cost_per_carton_usd
+    inner_carton_cost = total_cartons * coef.inner_carton_cost_usd
     
     # ===========================================
     # FREIGHT & LOGISTICS
     # ===========================================
-    # Get freight profile for the route
-    freight_cfg = cfg["freight_profile"].get(
-        order.route, 
-        cfg["freight_profile"]["cn_to_us_west_coast"]  # Fallback
-    )
-    handling_cfg = cfg["handling_profile"]
-    
-    sea_freight = total_cbm * freight_cfg["sea_freight_per_cbm_usd"]
-    origin_charges = total_cbm * freight_cfg["origin_charges_per_cbm_usd"]
-    destination_charges = total_cbm * freight_cfg["destination_charges_per_cbm_usd"]
-    total_shipping = sea_freight + origin_charges + destination_charges
+    # Unknown routes already resolved to cn_to_us_west_coast by the lookup
+    sea_freight = total_cbm * coef.sea_freight_per_cbm_usd
+    origin_charges = total_cbm * coef.origin_charges_per_cbm_usd
+    destination_charges = total_cbm * coef.destination_charges_per_cbm_usd
     
     # ===========================================
     # HANDLING & FIXED COSTS
     # ===========================================
-    docs_and_broker = handling_cfg["docs_and_broker_per_shipment_usd"]
-    port_misc = handling_cfg["port_misc_per_shipment_usd"]
-    qc_cost = cfg["qc_cost_per_order_usd"]
-    cert_cost = cfg["cert_cost_per_sku_usd"]
-    total_handling = docs_and_broker + port_misc + qc_cost + cert_cost
+    docs_and_broker = coef.docs_and_broker_per_shipment_usd
+    port_misc = coef.port_misc_per_shipment_usd
+    qc_cost = coef.qc_cost_per_order_usd
+    cert_cost = coef.cert_cost_per_sku_usd
     
     # ===========================================
     # DUTY & TAXES
     # ===========================================
     # Dutiable value = FOB + Freight (simplified)
     dutiable_base = product_cost + sea_freight
-    duty = dutiable_base * cfg["duty_rate_percent"] / 100.0
-    extra_taxes = dutiable_base * cfg["extra_taxes_percent"] / 100.0
-    total_duty = duty + extra_taxes
+    duty = dutiable_base * coef.duty_rate_percent / 100.0
+    extra_taxes = dutiable_base * coef.extra_taxes_percent / 100.0
+    
+    detailed = {
+        "product_fob": product_cost,
+        "packing_outer": packing_cost,
+        "packing_inner": inner_carton_cost,
+        "sea_freight": sea_freight,
+        "origin_charges": origin_charges,
+        "destination_charges": destination_charges,
+        "customs_broker": docs_and_broker,
+        "port_misc": port_misc,
+        "qc_inspection": qc_cost,
+        "certification": cert_cost,
+        "import_duty": duty,
+        "extra_taxes": extra_taxes,
+    }
+    
+    return _build_landed_cost_result(
+        meta=tables.metadata_for(order.category_id),
+        category_id=order.category_id,
+        route=order.route,
+        incoterm=order.incoterm,
+        units=units,
+        unit_weight=unit_weight,
+        retail_price=order.retail_price_per_unit,
+        total_weight_kg=total_weight_kg,
+        total_cartons=total_cartons,
+        total_cbm=total_cbm,
+        detailed=detailed,
+    )
+
+
+def _build_landed_cost_result(
+    meta: Dict[str, Any],
+    category_id: str,
+    route: str,
+    incoterm: str,
+    units: int,
+    unit_weight: float,
+    retail_price: Optional[float],
+    total_weight_kg: float,
+    total_cartons: float,
+    total_cbm: float,
+    detailed: Dict[str, float],
+) -> Dict[str, Any]:
+    """
+    Assemble the landed cost result dict from raw (unrounded) line items.
+    
+    Shared by compute_landed_cost() and LandedCostBatch so that the scalar
+    and batch paths produce identical dictionaries.
+    """
+    total_packing = detailed["packing_outer"] + detailed["packing_inner"]
+    total_shipping = (
+        detailed["sea_freight"]
+        + detailed["origin_charges"]
+        + detailed["destination_charges"]
+    )
+    total_handling = (
+        detailed["customs_broker"]
+        + detailed["port_misc"]
+        + detailed["qc_inspection"]
+        + detailed["certification"]
+    )
+    total_duty = detailed["import_duty"] + detailed["extra_taxes"]
     
     # ===========================================
     # TOTAL LANDED COST
     # ===========================================
     total_cost = (
-        product_cost
+        detailed["product_fob"]
         + total_packing
         + total_shipping
         + total_handling
@@ -120,7 +201,7 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     # COMPONENT BREAKDOWN
     # ===========================================
     components = {
-        "product": product_cost,
+        "product": detailed["product_fob"],
         "packing": total_packing,
         "shipping": total_shipping,
         "handling": total_handling,
@@ -147,56 +228,42 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
         "landed_cost_per_unit_usd": round(cost_per_unit, 4),
         "components_usd": {k: round(v, 2) for k, v in components.items()},
         "components_share_percent": {k: round(v, 1) for k, v in cost_share_percent.items()},
-        "cost_breakdown_detailed": {
-            "product_fob": round(product_cost, 2),
-            "packing_outer": round(packing_cost, 2),
-            "packing_inner": round(inner_carton_cost, 2),
-            "sea_freight": round(sea_freight, 2),
-            "origin_charges": round(origin_charges, 2),
-            "destination_charges": round(destination_charges, 2),
-            "customs_broker": round(docs_and_broker, 2),
-            "port_misc": round(port_misc, 2),
-            "qc_inspection": round(qc_cost, 2),
-            "certification": round(cert_cost, 2),
-            "import_duty": round(duty, 2),
-            "extra_taxes": round(extra_taxes, 2),
-        },
+        "cost_breakdown_detailed": {k: round(v, 2) for k, v in detailed.items()},
         "assumptions": {
-            "category": cfg["label"],
-            "category_id": order.category_id,
-            "route": order.route,
-            "incoterm": order.incoterm,
+            "category": meta["label"],
+            "category_id": category_id,
+            "route": route,
+            "incoterm": incoterm,
             "unit_weight_kg": unit_weight,
-            "duty_rate_percent": cfg["duty_rate_percent"],
-            "hs_code_hint": cfg.get("hs_code_hint", "N/A"),
+            "duty_rate_percent": meta["duty_rate_percent"],
+            "hs_code_hint": meta["hs_code_hint"],
         },
         "benchmarks": {
-            "moq_units": cfg.get("moq_units", 1000),
-            "typical_lead_time_days": cfg.get("typical_lead_time_days", 25),
-            "margin_low": cfg.get("margin_benchmarks", {}).get("low", 0.15),
-            "margin_typical": cfg.get("margin_benchmarks", {}).get("typical", 0.30),
-            "margin_high": cfg.get("margin_benchmarks", {}).get("high", 0.50),
+            "moq_units": meta["moq_units"],
+            "typical_lead_time_days": meta["typical_lead_time_days"],
+            "margin_low": meta["margin_low"],
+            "margin_typical": meta["margin_typical"],
+            "margin_high": meta["margin_high"],
         }
     }
     
     # ===========================================
     # MARGIN ESTIMATE (if retail price provided)
     # ===========================================
-    if order.retail_price_per_unit is not None and order.retail_price_per_unit > 0:
-        margin = order.retail_price_per_unit - cost_per_unit
-        margin_pct = (margin / order.retail_price_per_unit) * 100.0
+    if retail_price is not None and retail_price > 0:
+        margin = retail_price - cost_per_unit
+        margin_pct = (margin / retail_price) * 100.0
         
         # Compare to benchmarks
-        margin_benchmarks = cfg.get("margin_benchmarks", {})
-        if margin_pct < margin_benchmarks.get("low", 0.15) * 100:
+        if margin_pct < meta["margin_low"] * 100:
             margin_assessment = "Below typical - consider negotiating costs"
-        elif margin_pct > margin_benchmarks.get("high", 0.50) * 100:
+        elif margin_pct > meta["margin_high"] * 100:
             margin_assessment = "Strong margin - good opportunity"
         else:
             margin_assessment = "Within typical range for this category"
         
         result["margin_estimate"] = {
-            "retail_price_per_unit_usd": round(order.retail_price_per_unit, 2),
+            "retail_price_per_unit_usd": round(retail_price, 2),
             "gross_margin_per_unit_usd": round(margin, 4),
             "gross_margin_percent": round(margin_pct, 1),
             "assessment": margin_assessment,
@@ -205,59 +272,91 @@ def compute_landed_cost(order: OrderParams) -> Dict[str, Any]:
     return result
 
 
-def compute_sensitivity(order: OrderParams, base_result: Dict[str, Any]) -> Dict[str, Any]:
+# Shocks evaluated by compute_sensitivity(); the largest margin impacts are shown
+SENSITIVITY_SHOCKS = (
+    ("freight", "multiply", 1.20),
+    ("fob", "multiply", 1.10),
+    ("duty", "add", -5.0),
+    ("packing", "multiply", 1.15),
+    ("units", "multiply", 0.5),
+)
+
+SENSITIVITY_NOTES = {
+    "freight": {
+        "label": "Shipping cost",
+        "trigger": "Peak season, port congestion, fuel surcharge",
+        "recommendation": "Consider off-peak shipping or larger batch sizes"
+    },
+    "fob": {
+        "label": "Product cost",
+        "trigger": "Raw material price increase, supplier renegotiation",
+        "recommendation": "Lock in pricing with longer contracts"
+    },
+    "duty": {
+        "label": "Duty",
+        "trigger": "Trade agreement, tariff negotiation",
+        "recommendation": "Monitor trade policy changes"
+    },
+    "packing": {
+        "label": "Packing cost",
+        "trigger": "Carton and packaging material price increases",
+        "recommendation": "Optimize carton size and units per carton"
+    },
+    "units": {
+        "label": "Order volume",
+        "trigger": "Smaller first order or split shipments",
+        "recommendation": "Fixed QC, certification and broker fees weigh more on small orders"
+    },
+}
+
+
+def _sensitivity_name(driver: str, mode: str, value: float) -> str:
+    """Human-readable scenario name, e.g. 'Shipping cost +20%'."""
+    label = SENSITIVITY_NOTES[driver]["label"]
+    if mode == "add":
+        direction = "reduced" if value < 0 else "increased"
+        return f"{label} {direction} by {abs(value):g} points"
+    return f"{label} {(value - 1) * 100:+.0f}%"
+
+
+def compute_sensitivity(
+    order: OrderParams,
+    top_n: int = 3
+) -> Dict[str, Any]:
     """
     Compute sensitivity scenarios: what if costs change?
     
-    Returns scenarios showing impact of:
-    - Shipping cost +20%
-    - Duty rate -5 points
-    - Product cost +10%
+    Each shock in SENSITIVITY_SHOCKS is recomputed through the landed cost
+    formula (see utils.scenario_grid) and the top_n scenarios with the
+    largest margin impact are returned.
+    
+    Args:
+        order: Base order
+        top_n: Number of scenarios to return
     """
-    cfg = get_category_config(order.category_id)
-    base_cost = base_result["landed_cost_per_unit_usd"]
-    base_margin = base_result.get("margin_estimate", {}).get("gross_margin_percent", 30)
+    from utils.scenario_grid import ShockAxis, compute_scenario_grid, rank_scenarios
     
-    scenarios = []
+    axes = [
+        ShockAxis(driver, (1.0 if mode == "multiply" else 0.0, value), mode=mode)
+        for driver, mode, value in SENSITIVITY_SHOCKS
+    ]
+    grid = compute_scenario_grid(order, axes)
     
-    # Scenario 1: Shipping +20%
-    shipping_share = base_result["components_share_percent"].get("shipping", 15)
-    shipping_impact_pct = shipping_share * 0.20  # 20% of shipping component
-    new_margin_shipping = base_margin - shipping_impact_pct
-    scenarios.append({
-        "name": "Shipping cost +20%",
-        "trigger": "Peak season, port congestion, fuel surcharge",
-        "margin_impact": f"-{shipping_impact_pct:.1f}%",
-        "new_margin": f"{new_margin_shipping:.1f}%",
-        "recommendation": "Consider off-peak shipping or larger batch sizes"
-    })
-    
-    # Scenario 2: Duty reduced by 5 points
-    duty_reduction = 5
-    duty_impact_pct = (cfg["duty_rate_percent"] - duty_reduction) / cfg["duty_rate_percent"] * base_result["components_share_percent"].get("duty_and_tax", 10) if cfg["duty_rate_percent"] > 0 else 0
-    new_margin_duty = base_margin + min(duty_impact_pct, 3)  # Cap at 3% improvement
-    scenarios.append({
-        "name": "Duty reduced by 5 points",
-        "trigger": "Trade agreement, tariff negotiation",
-        "margin_impact": f"+{min(duty_impact_pct, 3):.1f}%",
-        "new_margin": f"{new_margin_duty:.1f}%",
-        "recommendation": "Monitor trade policy changes"
-    })
-    
-    # Scenario 3: Product cost +10%
-    product_share = base_result["components_share_percent"].get("product", 50)
-    product_impact_pct = product_share * 0.10
-    new_margin_product = base_margin - product_impact_pct
-    scenarios.append({
-        "name": "Product cost +10%",
-        "trigger": "Raw material price increase, supplier renegotiation",
-        "margin_impact": f"-{product_impact_pct:.1f}%",
-        "new_margin": f"{new_margin_product:.1f}%",
-        "recommendation": "Lock in pricing with longer contracts"
-    })
+    scenarios = []
+    for row in rank_scenarios(grid, top_n=top_n, max_drivers=1):
+        driver = row["shocked_drivers"][0]
+        mode = next(m for d, m, _ in SENSITIVITY_SHOCKS if d == driver)
+        notes = SENSITIVITY_NOTES[driver]
+        scenarios.append({
+            "name": _sensitivity_name(driver, mode, row["shocks"][driver]),
+            "trigger": notes["trigger"],
+            "margin_impact": f"{row['margin_impact_points']:+.1f}%",
+            "new_margin": f"{row['gross_margin_percent']:.1f}%",
+            "recommendation": notes["recommendation"]
+        })
     
     return {
-        "base_margin": f"{base_margin:.1f}%",
+        "base_margin": f"{grid['base']['gross_margin_percent']:.1f}%",
         "scenarios": scenarios
     }
 
@@ -289,8 +388,8 @@ def compute_from_query(
         retail_price_per_unit=retail_price
     )
     
-    result = compute_landed_cost(order)
-    result["sensitivity"] = compute_sensitivity(order, result)
+    result = cached_landed_cost(order)
+    result["sensitivity"] = cached_sensitivity(order)
     result["query_parsed"] = {
         "original_query": query,
         "detected_category": category_id,
@@ -300,6 +399,281 @@ def compute_from_query(
     return result
 
 
+# =============================================================================
+# BATCH (COLUMNAR) CALCULATION
+# =============================================================================
+
+# Line items of cost_breakdown_detailed, in result order
+DETAILED_COST_KEYS = (
+    "product_fob",
+    "packing_outer",
+    "packing_inner",
+    "sea_freight",
+    "origin_charges",
+    "destination_charges",
+    "customs_broker",
+    "port_misc",
+    "qc_inspection",
+    "certification",
+    "import_duty",
+    "extra_taxes",
+)
+
+# Aggregated components of components_usd, in result order
+COMPONENT_KEYS = ("product", "packing", "shipping", "handling", "duty_and_tax")
+
+def _str_column(values: Union[str, Sequence[str], None], n: int, default: str) -> np.ndarray:
+    """Broadcast a string or sequence of strings to an object column."""
+    if values is None or isinstance(values, str):
+        return np.full(n, values or default, dtype=object)
+    column = np.array([str(v) if v else default for v in values], dtype=object)
+    if len(column) != n:
+        raise ValueError(f"Expected {n} values, got {len(column)}")
+    return column
+
+
+def _float_column(values: Union[float, Sequence[Optional[float]], None], n: int) -> np.ndarray:
+    """Broadcast optional floats to a float column, with None stored as NaN."""
+    if values is None:
+        return np.full(n, np.nan)
+    if np.isscalar(values):
+        return np.full(n, float(values))
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        column = values.astype(np.float64, copy=False)
+    else:
+        column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if len(column) != n:
+        raise ValueError(f"Expected {n} values, got {len(column)}")
+    return column
+
+
+@dataclass
+class LandedCostBatch:
+    """
+    Columnar landed cost results, one row per order.
+    
+    `columns` holds unrounded NumPy arrays for every line item, component,
+    total and margin. Per-order result dicts (identical to compute_landed_cost)
+    are only built on demand via result() / iter_results().
+    """
+    category_ids: np.ndarray
+    routes: np.ndarray
+    incoterms: np.ndarray
+    units: np.ndarray
+    unit_weight_kg: np.ndarray
+    retail_price_per_unit: np.ndarray
+    columns: Dict[str, np.ndarray]
+    
+    def __len__(self) -> int:
+        return len(self.units)
+    
+    def result(self, index: int) -> Dict[str, Any]:
+        """Build the compute_landed_cost()-style dict for a single order."""
+        category_id = self.category_ids[index]
+        retail_price = float(self.retail_price_per_unit[index])
+        units = self.units[index].item()
+        
+        return _build_landed_cost_result(
+            meta=get_compiled_cost_tables().metadata_for(category_id),
+            category_id=category_id,
+            route=self.routes[index],
+            incoterm=self.incoterms[index],
+            units=units,
+            unit_weight=float(self.unit_weight_kg[index]),
+            retail_price=None if np.isnan(retail_price) else retail_price,
+            total_weight_kg=float(self.columns["total_weight_kg"][index]),
+            total_cartons=float(self.columns["total_cartons"][index]),
+            total_cbm=float(self.columns["total_cbm"][index]),
+            detailed={key: float(self.columns[key][index]) for key in DETAILED_COST_KEYS},
+        )
+    
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """Lazily yield per-order result dicts."""
+        for index in range(len(self)):
+            yield self.result(index)
+
+
+def evaluate_landed_cost_columns(
+    coef: CostCoefficients,
+    units: np.ndarray,
+    weight_overrides: np.ndarray,
+    retail_prices: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Core vectorized landed cost formula.
+    
+    Args:
+        coef: CostCoefficients whose fields are arrays aligned with `units`
+            (callers may shock individual coefficients before evaluating);
+            base_fob_cost_per_kg must already reflect FOB price breaks
+            for `units` (CompiledCostTables.fob_costs_per_kg)
+        units: Order quantities
+        weight_overrides: Unit weight overrides (NaN/0 = category default)
+        retail_prices: Retail prices (NaN/<=0 = no margin)
+    
+    Returns:
+        Dict of unrounded columns (line items, components, totals, shares, margins)
+    """
+    # Same operation order as compute_landed_cost() so results are bit-identical
+    unit_weight = np.where(
+        np.isnan(weight_overrides) | (weight_overrides == 0),
+        coef.default_unit_weight_kg,
+        weight_overrides,
+    )
+    total_weight_kg = units * unit_weight
+    total_cartons = units / coef.default_units_per_carton
+    total_cbm = total_cartons / coef.default_cartons_per_cbm
+    
+    product_cost = total_weight_kg * coef.base_fob_cost_per_kg
+    packing_cost = total_cartons * coef.packing_cost_per_carton_usd
+    inner_carton_cost = total_cartons * coef.inner_carton_cost_usd
+    
+    sea_freight = total_cbm * coef.sea_freight_per_cbm_usd
+    origin_charges = total_cbm * coef.origin_charges_per_cbm_usd
+    destination_charges = total_cbm * coef.destination_charges_per_cbm_usd
+    
+    dutiable_base = product_cost + sea_freight
+    duty = dutiable_base * coef.duty_rate_percent / 100.0
+    extra_taxes = dutiable_base * coef.extra_taxes_percent / 100.0
+    
+    columns = {
+        "unit_weight_kg": unit_weight,
+        "total_weight_kg": total_weight_kg,
+        "total_cartons": total_cartons,
+        "total_cbm": total_cbm,
+        "product_fob": product_cost,
+        "packing_outer": packing_cost,
+        "packing_inner": inner_carton_cost,
+        "sea_freight": sea_freight,
+        "origin_charges": origin_charges,
+        "destination_charges": destination_charges,
+        "customs_broker": coef.docs_and_broker_per_shipment_usd,
+        "port_misc": coef.port_misc_per_shipment_usd,
+        "qc_inspection": coef.qc_cost_per_order_usd,
+        "certification": coef.cert_cost_per_sku_usd,
+        "import_duty": duty,
+        "extra_taxes": extra_taxes,
+    }
+    
+    columns["product"] = product_cost
+    columns["packing"] = packing_cost + inner_carton_cost
+    columns["shipping"] = sea_freight + origin_charges + destination_charges
+    columns["handling"] = (
+        columns["customs_broker"]
+        + columns["port_misc"]
+        + columns["qc_inspection"]
+        + columns["certification"]
+    )
+    columns["duty_and_tax"] = duty + extra_taxes
+    
+    total_cost = (
+        columns["product"]
+        + columns["packing"]
+        + columns["shipping"]
+        + columns["handling"]
+        + columns["duty_and_tax"]
+    )
+    columns["total_landed_cost_usd"] = total_cost
+    columns["landed_cost_per_unit_usd"] = total_cost / units
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for key in COMPONENT_KEYS:
+            columns[f"{key}_share_percent"] = np.where(
+                total_cost > 0, columns[key] / total_cost * 100.0, 0.0
+            )
+        
+        has_retail = retail_prices > 0  # NaN compares False
+        margin = retail_prices - columns["landed_cost_per_unit_usd"]
+        columns["gross_margin_per_unit_usd"] = np.where(has_retail, margin, np.nan)
+        columns["gross_margin_percent"] = np.where(
+            has_retail, (margin / retail_prices) * 100.0, np.nan
+        )
+    
+    return columns
+
+
+def compute_landed_cost_batch(
+    category_ids: Sequence[str],
+    units: Sequence[int],
+    routes: Union[str, Sequence[str], None] = None,
+    retail_prices: Union[float, Sequence[Optional[float]], None] = None,
+    custom_unit_weights_kg: Union[float, Sequence[Optional[float]], None] = None,
+    incoterms: Union[str, Sequence[str], None] = None,
+) -> LandedCostBatch:
+    """
+    Compute landed costs for many orders in one vectorized pass.
+    
+    Args:
+        category_ids: Category ID per order (strings, or integer ids from the compiled tables)
+        units: Order quantity per order
+        routes: Route per order, or one route for all (defaults to AppSettings.DEFAULT_ROUTE);
+            integer route ids from the compiled tables are also accepted
+        retail_prices: Retail price per order (None/NaN = no margin estimate)
+        custom_unit_weights_kg: Unit weight override per order (None/NaN = category default)
+        incoterms: Incoterm per order, or one for all (defaults to AppSettings.DEFAULT_INCOTERM)
+    
+    Returns:
+        LandedCostBatch whose rows match compute_landed_cost() exactly
+    """
+    from utils.config import AppSettings
+    
+    units_arr = np.asarray(units)
+    n = len(units_arr)
+    if units_arr.ndim != 1:
+        raise ValueError("units must be a one-dimensional sequence")
+    if np.any(units_arr <= 0):
+        raise ValueError("units must be positive for every order")
+    
+    tables = get_compiled_cost_tables()
+    
+    # Accept either string ids or pre-interned integer ids from the compiled tables
+    if isinstance(category_ids, np.ndarray) and category_ids.dtype.kind in "iu":
+        category_idx = category_ids.astype(np.intp, copy=False)
+        category_arr = np.array(tables.category_ids, dtype=object)[category_idx]
+    else:
+        category_arr = _str_column(category_ids, n, "generic_consumer_product")
+        category_idx = tables.category_ids_of(category_arr)
+    if isinstance(routes, np.ndarray) and routes.dtype.kind in "iu":
+        route_idx = routes.astype(np.intp, copy=False)
+        route_arr = np.array(tables.routes, dtype=object)[route_idx]
+    else:
+        route_arr = _str_column(routes, n, AppSettings.DEFAULT_ROUTE)
+        route_idx = tables.route_ids_of(route_arr)
+    if len(category_idx) != n or len(route_idx) != n:
+        raise ValueError(f"Expected {n} category ids and routes")
+    
+    incoterm_arr = _str_column(incoterms, n, AppSettings.DEFAULT_INCOTERM)
+    retail_arr = _float_column(retail_prices, n)
+    weight_arr = _float_column(custom_unit_weights_kg, n)
+    
+    coef = tables.gather(category_idx, route_idx)
+    coef = coef._replace(base_fob_cost_per_kg=tables.fob_costs_per_kg(category_idx, units_arr))
+    
+    columns = evaluate_landed_cost_columns(coef, units_arr, weight_arr, retail_arr)
+    
+    return LandedCostBatch(
+        category_ids=category_arr,
+        routes=route_arr,
+        incoterms=incoterm_arr,
+        units=units_arr,
+        unit_weight_kg=columns["unit_weight_kg"],
+        retail_price_per_unit=np.where(retail_arr > 0, retail_arr, np.nan),
+        columns=columns,
+    )
+
+
+def compute_landed_cost_for_orders(orders: Sequence[OrderParams]) -> LandedCostBatch:
+    """Batch version of compute_landed_cost() for a list of OrderParams."""
+    return compute_landed_cost_batch(
+        category_ids=[o.category_id for o in orders],
+        units=[o.units for o in orders],
+        routes=[o.route for o in orders],
+        retail_prices=[o.retail_price_per_unit for o in orders],
+        custom_unit_weights_kg=[o.custom_unit_weight_kg for o in orders],
+        incoterms=[o.incoterm for o in orders],
+    )
+
+
 # =============================================================================
 # FORMAT HELPERS FOR UI
 # =============================================================================
@@ -355,3 +729,88 @@ def format_for_cost_table(result: Dict[str, Any]) -> list:
     
     return rows
 
+
+# =============================================================================
+# MEMOIZED RESULTS
+# =============================================================================
+# One analysis computes the same order several times (initial estimate,
+# recompute after AI extraction, result builder). Results are pure functions of
+# OrderParams.cache_key, so they are memoized process-wide. Keys include the
+# cost-table version, so rebuild_compiled_cost_tables() invalidates old entries.
+
+LANDED_COST_CACHE_SIZE = 1024
+
+
+class ResultMemo:
+    """Thread-safe bounded LRU memo with hit/miss counters."""
+
+    def __init__(self, maxsize: int = LANDED_COST_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Tuple, compute) -> Dict[str, Any]:
+        """Return a copy of the memoized value for key, computing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_landed_cost_memo = ResultMemo()
+_sensitivity_memo = ResultMemo()
+
+
+def cached_landed_cost(order: OrderParams) -> Dict[str, Any]:
+    """compute_landed_cost() through the process-wide memo."""
+    return _landed_cost_memo.get_or_compute(order.cache_key, lambda: compute_landed_cost(order))
+
+
+def cached_sensitivity(order: OrderParams) -> Dict[str, Any]:
+    """compute_sensitivity() through the process-wide memo."""
+    return _sensitivity_memo.get_or_compute(order.cache_key, lambda: compute_sensitivity(order))
+
+
+def get_cost_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters for the landed cost and sensitivity memos."""
+    return {
+        "landed_cost": _landed_cost_memo.stats(),
+        "sensitivity": _sensitivity_memo.stats(),
+    }
+
+
+def clear_cost_cache() -> None:
+    """Clear the landed cost and sensitivity memos."""
+    _landed_cost_memo.clear()
+    _sensitivity_memo.clear()
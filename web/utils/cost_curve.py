@@ -0,0 +1,203 @@
+"""
+NexSupply Cost Curve - Per-unit landed cost across an order-volume sweep
+Evaluates a whole unit grid in one compute_landed_cost_batch() call, for
+cost-vs-volume charts, price-break views and margin-vs-benchmark bands.
+
+Cost model (see cost_calculator): every line item is linear in units except
+the per-shipment handling, QC and certification fees, so the fixed-cost share
+of total cost falls as F / (F + v * units). FOB price breaks make v a step
+function of units, which shows up as discontinuities in the curve.
+"""
+
+import math
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from utils.cost_calculator import COMPONENT_KEYS, compute_landed_cost_batch
+from utils.compiled_cost_tables import get_compiled_cost_tables
+from utils.margin_solver import tiered_cost_structure
+
+
+# Line items that do not scale with units (charged once per order/shipment)
+FIXED_COST_KEYS = ("customs_broker", "port_misc", "qc_inspection", "certification")
+
+
+def volume_grid(
+    min_units: int = 500,
+    max_units: int = 1_000_000,
+    points: int = 100,
+    spacing: str = "log"
+) -> np.ndarray:
+    """
+    Build a sorted grid of integer order quantities.
+
+    Args:
+        min_units: Smallest order quantity (>= 1)
+        max_units: Largest order quantity
+        points: Number of grid points before de-duplication
+        spacing: "log" (geometric) or "linear"
+
+    Returns:
+        Sorted, de-duplicated int64 array of unit counts
+    """
+    if min_units < 1 or max_units < min_units:
+        raise ValueError("Require 1 <= min_units <= max_units")
+    if points < 2:
+        raise ValueError("points must be at least 2")
+
+    if spacing == "log":
+        grid = np.geomspace(min_units, max_units, points)
+    elif spacing == "linear":
+        grid = np.linspace(min_units, max_units, points)
+    else:
+        raise ValueError(f"Unknown spacing: {spacing!r} (use 'log' or 'linear')")
+
+    return np.unique(np.rint(grid).astype(np.int64))
+
+
+def fixed_cost_breakpoint(
+    fixed_costs_usd: float,
+    variable_cost_per_unit_usd: float,
+    share_threshold: float
+) -> Optional[int]:
+    """
+    Smallest order quantity at which fixed costs fall below `share_threshold`
+    of total landed cost.
+
+    Solves F / (F + v * u) < s  ⇔  u > F * (1 - s) / (s * v).
+    Returns None if there is no variable cost to dilute the fixed costs.
+    """
+    if not 0 < share_threshold < 1:
+        raise ValueError("share_threshold must be between 0 and 1")
+    if fixed_costs_usd <= 0:
+        return 1
+    if variable_cost_per_unit_usd <= 0:
+        return None
+
+    bound = fixed_costs_usd * (1 - share_threshold) / (share_threshold * variable_cost_per_unit_usd)
+    return max(1, math.floor(bound) + 1)
+
+
+def compute_cost_curve(
+    category_id: str,
+    route: Optional[str] = None,
+    units: Optional[np.ndarray] = None,
+    min_units: int = 500,
+    max_units: int = 1_000_000,
+    points: int = 100,
+    spacing: str = "log",
+    retail_price: Optional[float] = None,
+    custom_unit_weight_kg: Optional[float] = None,
+    fixed_share_threshold: float = 0.05
+) -> Dict[str, Any]:
+    """
+    Per-unit landed cost, component shares and margin across a volume sweep.
+
+    Args:
+        category_id: Category to price
+        route: Shipping route (defaults to AppSettings.DEFAULT_ROUTE)
+        units: Explicit unit grid; if omitted, built with volume_grid()
+        min_units, max_units, points, spacing: Grid parameters for volume_grid()
+        retail_price: Retail price per unit (enables margin curve)
+        custom_unit_weight_kg: Unit weight override
+        fixed_share_threshold: Share of total cost (0-1) that fixed handling,
+            QC and certification costs must fall below
+
+    Returns:
+        Dictionary of NumPy arrays aligned with `units`, plus benchmark
+        margins and the fixed-cost breakpoint
+    """
+    from utils.config import AppSettings
+
+    route = route or AppSettings.DEFAULT_ROUTE
+    grid = (
+        volume_grid(min_units, max_units, points, spacing)
+        if units is None
+        else np.asarray(units, dtype=np.int64)
+    )
+    n = len(grid)
+
+    tables = get_compiled_cost_tables()
+    meta = tables.metadata_for(category_id)
+
+    batch = compute_landed_cost_batch(
+        category_ids=[category_id] * n,
+        units=grid,
+        routes=route,
+        retail_prices=retail_price,
+        custom_unit_weights_kg=custom_unit_weight_kg,
+    )
+    cols = batch.columns
+
+    fixed_costs = sum(cols[key] for key in FIXED_COST_KEYS)
+    total_cost = cols["total_landed_cost_usd"]
+
+    # Linear model per FOB price tier: everything except the fixed fees
+    # scales with units. The breakpoint is the first tier whose own bound
+    # lands inside that tier.
+    structure = tiered_cost_structure([category_id], route, custom_unit_weight_kg)
+    fixed_usd = float(structure["fixed_costs_usd"][0])
+    tier_starts = structure["tier_starts"][0]
+    tier_variable = structure["variable_cost_per_unit_usd"][0]
+    breakpoint_units, variable_per_unit = None, float(tier_variable[0])
+    for k in range(int(np.isfinite(tier_starts).sum())):
+        tier_end = tier_starts[k + 1] if k + 1 < len(tier_starts) else np.inf
+        units_k = fixed_cost_breakpoint(fixed_usd, float(tier_variable[k]), fixed_share_threshold)
+        if units_k is not None and max(units_k, tier_starts[k]) < tier_end:
+            breakpoint_units = int(max(units_k, tier_starts[k]))
+            variable_per_unit = float(tier_variable[k])
+            break
+
+    curve = {
+        "category_id": category_id,
+        "category_label": meta["label"],
+        "route": route,
+        "units": grid,
+        "landed_cost_per_unit_usd": cols["landed_cost_per_unit_usd"],
+        "total_landed_cost_usd": total_cost,
+        "components_share_percent": {
+            key: cols[f"{key}_share_percent"] for key in COMPONENT_KEYS
+        },
+        "fixed_cost_share_percent": np.where(total_cost > 0, fixed_costs / total_cost * 100.0, 0.0),
+        "fixed_cost_breakpoint": {
+            "share_threshold": fixed_share_threshold,
+            "fixed_costs_usd": round(fixed_usd, 2),
+            "variable_cost_per_unit_usd": round(variable_per_unit, 4),
+            "units": breakpoint_units,
+        },
+        "margin_benchmarks_percent": {
+            "low": meta["margin_low"] * 100,
+            "typical": meta["margin_typical"] * 100,
+            "high": meta["margin_high"] * 100,
+        },
+    }
+
+    if retail_price is not None and retail_price > 0:
+        margin_pct = cols["gross_margin_percent"]
+        # Same bands as compute_landed_cost() margin assessment
+        band = np.where(
+            margin_pct < meta["margin_low"] * 100,
+            "below",
+            np.where(margin_pct > meta["margin_high"] * 100, "above", "within"),
+        )
+        curve["margin"] = {
+            "retail_price_per_unit_usd": retail_price,
+            "gross_margin_percent": margin_pct,
+            "gross_margin_per_unit_usd": cols["gross_margin_per_unit_usd"],
+            "benchmark_band": band,
+        }
+
+    return curve
+
+
+def format_for_cost_curve_chart(curve: Dict[str, Any]) -> Dict[str, list]:
+    """Format a cost curve as plain lists for Plotly line charts."""
+    chart = {
+        "units": curve["units"].tolist(),
+        "cost_per_unit": np.round(curve["landed_cost_per_unit_usd"], 4).tolist(),
+        "fixed_share_percent": np.round(curve["fixed_cost_share_percent"], 1).tolist(),
+    }
+    if "margin" in curve:
+        chart["margin_percent"] = np.round(curve["margin"]["gross_margin_percent"], 1).tolist()
+    return chart
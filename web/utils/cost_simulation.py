@@ -0,0 +1,181 @@
+"""
+NexSupply Cost Simulation - Monte Carlo uncertainty band for landed cost
+compute_landed_cost() is a deterministic point estimate. This module draws
+seeded samples over the uncertain cost drivers and reports P10/P50/P90
+landed cost per unit plus the probability that margin falls below the
+category's low benchmark.
+
+HIDDEN_COST_ITEMS (insurance, FX fees, storage, ...) are not in the point
+estimate, so they are reported as a separate per-shipment add-on rather than
+folded into the band - the band always describes the same costs as the
+headline number it is shown next to.
+
+All samples are evaluated with array operations (no per-sample Python loop),
+so a 20,000-sample run takes a few milliseconds and can run on every analysis.
+"""
+
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from utils.cost_calculator import OrderParams, compute_landed_cost_for_orders
+from utils.compiled_cost_tables import get_compiled_cost_tables
+from utils.cost_tables import HIDDEN_COST_ITEMS
+
+
+DEFAULT_SAMPLES = 20000
+DEFAULT_SEED = 42
+
+# Triangular (low, mode, high) multipliers on the table values.
+# Ranges follow MARKET_DATA["landed_cost_ratios"] spreads and typical
+# quote-to-invoice drift for China → US/EU sea freight.
+UNCERTAINTY_PROFILE: Dict[str, tuple] = {
+    "fob_cost_per_kg": (0.85, 1.00, 1.25),
+    "sea_freight_per_cbm": (0.80, 1.00, 1.40),
+    "origin_charges_per_cbm": (0.90, 1.00, 1.15),
+    "destination_charges_per_cbm": (0.90, 1.00, 1.20),
+}
+
+# Triangular (low, mode, high) shift in duty rate, in percentage points
+DUTY_RATE_SHIFT_POINTS = (-2.0, 0.0, 5.0)
+
+# HIDDEN_COST_ITEMS that overlap a fixed line item already in the tables.
+# The add-on only counts what the sampled items cost beyond those table
+# values (avoids double counting).
+HIDDEN_COST_REPLACES = {
+    "customs_clearance": "customs_broker",
+    "documentation": "customs_broker",
+    "port_handling": "port_misc",
+    "inspection": "qc_inspection",
+}
+
+# Triangular (low, mode, high) days a shipment sits in storage past free time;
+# storage_per_day is charged per day of dwell, not per shipment
+STORAGE_DWELL_DAYS = (0.0, 1.0, 5.0)
+
+
+def _percentiles(values: np.ndarray, digits: int = 4) -> Dict[str, float]:
+    """P10/P50/P90 and mean of a sample array."""
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {
+        "p10": round(float(p10), digits),
+        "p50": round(float(p50), digits),
+        "p90": round(float(p90), digits),
+        "mean": round(float(values.mean()), digits),
+    }
+
+
+def _simulate_hidden_costs(rng: np.random.Generator, n_samples: int) -> np.ndarray:
+    """Per-shipment HIDDEN_COST_ITEMS total; storage is a daily rate times a dwell draw."""
+    items = list(HIDDEN_COST_ITEMS)
+    mins = np.array([HIDDEN_COST_ITEMS[key]["min_usd"] for key in items], dtype=np.float64)
+    maxs = np.array([HIDDEN_COST_ITEMS[key]["max_usd"] for key in items], dtype=np.float64)
+    # Independent uniform draw per item, one row per sample
+    draws = mins + rng.random((n_samples, len(items))) * (maxs - mins)
+    if "storage_per_day" in HIDDEN_COST_ITEMS:
+        low, mode, high = STORAGE_DWELL_DAYS
+        draws[:, items.index("storage_per_day")] *= rng.triangular(low, mode, high, n_samples)
+    return draws.sum(axis=1)
+
+
+def simulate_landed_cost(
+    order: OrderParams,
+    n_samples: int = DEFAULT_SAMPLES,
+    seed: Optional[int] = DEFAULT_SEED,
+    include_hidden_costs: bool = True
+) -> Dict[str, Any]:
+    """
+    Monte Carlo simulation of landed cost for one order.
+
+    Samples FOB cost/kg, freight/origin/destination per CBM, duty rate and
+    the HIDDEN_COST_ITEMS min/max ranges; everything else (units, cartons,
+    CBM, packing, fixed handling) is taken from the rule-based tables.
+    The landed cost band covers the same line items as the point estimate;
+    hidden costs are reported separately under "hidden_cost_addon".
+
+    Args:
+        order: Order to simulate
+        n_samples: Number of samples
+        seed: RNG seed (same seed + order → identical result)
+        include_hidden_costs: Also simulate the HIDDEN_COST_ITEMS add-on
+
+    Returns:
+        Dictionary with P10/P50/P90 cost per unit and margin risk
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be positive")
+
+    rng = np.random.default_rng(seed)
+    base = compute_landed_cost_for_orders([order])
+    cols = {key: float(value[0]) for key, value in base.columns.items()}
+    coef = get_compiled_cost_tables().lookup(order.category_id, order.route)
+    meta = get_compiled_cost_tables().metadata_for(order.category_id)
+    units = order.units
+
+    def draw(spec: tuple) -> np.ndarray:
+        low, mode, high = spec
+        return rng.triangular(low, mode, high, n_samples)
+
+    # Scale the deterministic line items by sampled multipliers
+    product = cols["product_fob"] * draw(UNCERTAINTY_PROFILE["fob_cost_per_kg"])
+    sea_freight = cols["sea_freight"] * draw(UNCERTAINTY_PROFILE["sea_freight_per_cbm"])
+    origin = cols["origin_charges"] * draw(UNCERTAINTY_PROFILE["origin_charges_per_cbm"])
+    destination = cols["destination_charges"] * draw(UNCERTAINTY_PROFILE["destination_charges_per_cbm"])
+
+    duty_rate = np.maximum(coef.duty_rate_percent + draw(DUTY_RATE_SHIFT_POINTS), 0.0)
+    dutiable_base = product + sea_freight
+    duty = dutiable_base * duty_rate / 100.0 + dutiable_base * coef.extra_taxes_percent / 100.0
+
+    total = (
+        product
+        + cols["packing"]
+        + (sea_freight + origin + destination)
+        + cols["handling"]
+        + duty
+    )
+
+    per_unit = total / units
+    point_estimate = cols["landed_cost_per_unit_usd"]
+    per_unit_stats = _percentiles(per_unit)
+
+    result = {
+        "method": "monte_carlo",
+        "samples": n_samples,
+        "seed": seed,
+        "includes_hidden_costs": include_hidden_costs,
+        "point_estimate_per_unit_usd": round(point_estimate, 4),
+        "landed_cost_per_unit_usd": per_unit_stats,
+        "total_landed_cost_usd": _percentiles(total, digits=2),
+        "band_vs_point_percent": {
+            "p10": round((per_unit_stats["p10"] / point_estimate - 1) * 100, 1),
+            "p90": round((per_unit_stats["p90"] / point_estimate - 1) * 100, 1),
+        },
+    }
+
+    # Margin risk is about what the order really costs, add-on included
+    margin_cost_per_unit = per_unit
+    if include_hidden_costs:
+        hidden = _simulate_hidden_costs(rng, n_samples)
+        replaced = sum(cols[key] for key in set(HIDDEN_COST_REPLACES.values()))
+        addon = hidden - replaced
+        result["hidden_cost_addon"] = {
+            "per_shipment_usd": _percentiles(addon, digits=2),
+            "per_unit_usd": _percentiles(addon / units),
+            "landed_cost_with_addon_per_unit_usd": _percentiles((total + addon) / units),
+        }
+        margin_cost_per_unit = (total + addon) / units
+
+    retail_price = order.retail_price_per_unit
+    if retail_price is not None and retail_price > 0:
+        margin_pct = (retail_price - margin_cost_per_unit) / retail_price * 100.0
+        low_benchmark_pct = meta["margin_low"] * 100
+        result["margin"] = {
+            "retail_price_per_unit_usd": round(retail_price, 2),
+            "includes_hidden_costs": include_hidden_costs,
+            "gross_margin_percent": _percentiles(margin_pct, digits=1),
+            "benchmark_low_percent": low_benchmark_pct,
+            "probability_below_low": round(float(np.mean(margin_pct < low_benchmark_pct)), 4),
+            "probability_negative": round(float(np.mean(margin_pct < 0)), 4),
+        }
+
+    return result
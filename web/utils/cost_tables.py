@@ -5,6 +5,9 @@ LLM handles category classification; Python handles the math.
 
 Structure:
 - Category ID → Base costs, weights, freight profiles
+- Optional fob_price_breaks → Quantity-tiered FOB $/kg (base_fob_cost_per_kg
+  applies below the first break; breaks sorted by min_units). Only add them
+  from sourced factory quotes; no category has them yet.
 - Route → Sea freight, origin/destination charges
 - Handling → Fixed per-shipment costs
 
@@ -17,6 +20,8 @@ Data Sources (verified Nov 2025):
 - Veridion 2025 - Supplier Onboarding Costs
 """
 
+import hashlib
+import json
 from typing import Dict, Any
 
 # =============================================================================
@@ -1591,6 +1596,31 @@ COST_TABLES: Dict[str, Dict[str, Any]] = {
 }
 
 
+# =============================================================================
+# CONTAINER (FCL) SPECS AND RATES
+# =============================================================================
+
+# Usable capacity per container type (below internal volume: stowage loss)
+CONTAINER_SPECS: Dict[str, Dict[str, float]] = {
+    "20gp": {"label": "20ft", "usable_cbm": 28.0, "max_payload_kg": 21700},
+    "40gp": {"label": "40ft", "usable_cbm": 58.0, "max_payload_kg": 26500},
+    "40hq": {"label": "40ft HQ", "usable_cbm": 68.0, "max_payload_kg": 26500},
+}
+
+# All-in FCL rate per container (ocean + origin + destination charges), USD.
+# Merged into every freight_profile as "container_rates_usd"; a category can
+# override by setting its own "container_rates_usd" in COST_TABLES.
+FCL_RATES_BY_ROUTE: Dict[str, Dict[str, float]] = {
+    "cn_to_us_west_coast": {"20gp": 2600, "40gp": 3400, "40hq": 3550},
+    "cn_to_us_east_coast": {"20gp": 3800, "40gp": 5000, "40hq": 5200},
+    "cn_to_eu": {"20gp": 2800, "40gp": 3700, "40hq": 3850},
+}
+
+for _cfg in COST_TABLES.values():
+    for _route, _freight in _cfg["freight_profile"].items():
+        _freight.setdefault("container_rates_usd", dict(FCL_RATES_BY_ROUTE[_route]))
+
+
 # =============================================================================
 # CATEGORY KEYWORDS FOR CLASSIFICATION
 # =============================================================================
@@ -1791,23 +1821,27 @@ CATEGORY_KEYWORDS: Dict[str, list] = {
     ]
 }
 
+# Fingerprint of the classification taxonomy (keywords + category labels).
+# Stored with re-classified analysis_logs rows so the backfill job can find
+# rows labeled under an older taxonomy.
+TAXONOMY_VERSION = hashlib.sha1(json.dumps(
+    [CATEGORY_KEYWORDS, {category_id: cfg["label"] for category_id, cfg in COST_TABLES.items()}],
+    sort_keys=True, ensure_ascii=False
+).encode("utf-8")).hexdigest()[:12]
+
 
 def classify_category(query: str) -> str:
     """
     Simple keyword-based category classification.
     Returns best matching category_id or 'generic_consumer_product'.
+
+    Score is the number of a category's keywords found in the query; ties go
+    to the category listed first in CATEGORY_KEYWORDS. Resolved by the shared
+    query lexicon scan (utils.lexicon), with a typo-tolerant second pass when
+    no keyword matches exactly.
     """
-    query_lower = query.lower()
-    
-    scores = {}
-    for cat_id, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw.lower() in query_lower)
-        if score > 0:
-            scores[cat_id] = score
-    
-    if scores:
-        return max(scores, key=scores.get)
-    return "generic_consumer_product"
+    from utils.lexicon import resolve_category
+    return resolve_category(query)
 
 
 def get_category_config(category_id: str) -> Dict[str, Any]:
@@ -0,0 +1,53 @@
+"""
+NexSupply English Words - Real words the typo pass must not "correct"
+The fuzzy category pass (lexicon.correct_typos) rewrites unknown tokens into
+the nearest category keyword word. A correctly spelled word one or two edits
+from a keyword is not a typo: "speaker" is not "sneaker", "tower" is not
+"towel", "shorts" is not "sports". This list holds such real-word neighbours
+of the category keyword words (same first letter, within the distance the
+typo pass allows), plus everyday product and sourcing words, so they are
+left alone.
+
+When a keyword is added to CATEGORY_KEYWORDS, add its real-word neighbours
+here too.
+"""
+
+COMMON_ENGLISH_WORDS = frozenset("""
+adaptor adapted adopter analogy
+babble battle beady beaks beams beans bears beard beats bender bidder bidding
+blanked blanker blinder blond bloody bloom bobble bondage braided brandied
+breads brood budding burble bubbly beading
+cabled canny canton carbon cartoon cellar chair changer charmer charter
+charier click clack cloak clover cluck cocking coking collard coolie cooling
+cooping covert covet coven cower coder crafty cramping crock croft cracked
+capping carping clotting
+declaration decorating decorative decorator decoy dipper dripper draper
+droll drooper dropped drank drunk drier dries drawee duffer
+earing earning eastern easier eater envelop exorcise
+fatness finder finer flame flood flour fodder folded fonder firth
+grasses glosses
+hamper hammer hardwire hearth heath healthy hiding hiring hummer hummock
+jello jolly
+knotting kitting
+launch lease leach least liner linden lines liken lined lightning loader
+loaner lynch
+mailed mauler medial mould moult mound mouth
+officer
+pacer pager paler pamper pauper payer piper paver pacified pacifies pains
+parse pedant pendent pennant planet plane plank plait pliant plans planer
+planned plainer planted plaster plies poach pooch porch poker poser powder
+primo print point prone phony phoney pulse punch purge puree pursed purser
+resistant rending reaping rearing readying
+scandal scream screed scree seeing seeping sewer sheaf sheen sheep sheer
+shell shift shipper shire shirk shirty shopping short shorts shots shows
+shoed shores shies shoves shapes shakes shames shares shaves sinner sipper
+skeet skipper skinner skirt skipping sleet sleeting slick slipped slippery
+slipping smack smoulder snark snick snipping snuck sorts sowing spades
+spanner speaker spinier spook spoof spool spoor sport sporty spots spores
+spring sprinkle sprinkled sprinkles spurts stack stalk stank stationary
+steeping stink stock stowage strand strong strung stuck sting supple swing
+sweet sweeping swoon sneaked shack slack
+tether teeter teethe tolls toils toots towed tower trowel
+vigor vison
+weigh weighs weighty wench witch wretch wright
+""".split())
@@ -361,7 +361,9 @@ def build_extraction_prompt(user_input_text: str) -> str:
     Returns:
         Complete prompt string for extraction
     """
-    return EXTRACTION_USER_PROMPT_TEMPLATE.format(user_message=user_input_text)
+    # The template's JSON examples contain literal braces, so str.format() cannot be used
+    template = EXTRACTION_USER_PROMPT_TEMPLATE.replace("{{", "{").replace("}}", "}")
+    return template.replace("{user_message}", user_input_text)
 
 
 def create_user_prompt(user_input: str) -> str:
@@ -410,86 +412,12 @@ def normalize_korean_number(text: str) -> Optional[int]:
         "5千个" → 5000 (Chinese)
         "5千個" → 5000 (Japanese)
         "1~2만개" → 20000 (range, use upper bound)
+
+    Same grammar as input_parser.parse_volume (utils.quantity_parser).
     """
-    if not text:
-        return None
-    
-    # Handle ranges (use upper bound)
-    if "~" in text or "-" in text or "〜" in text or "～" in text:
-        numbers = re.findall(r'\d+(?:\.\d+)?', text)
-        if numbers:
-            upper = int(float(numbers[-1]))
-            # Check for units after the last number
-            text_after_last_num = text.split(numbers[-1])[-1] if numbers else ""
-            # Korean/Chinese/Japanese: 亿/억 (100M), 万/만 (10K), 千/천 (1K)
-            if "억" in text_after_last_num or "亿" in text_after_last_num or "億" in text_after_last_num:
-                return upper * 100000000
-            elif "만" in text_after_last_num or "万" in text_after_last_num:
-                return upper * 10000
-            elif "천" in text_after_last_num or "千" in text_after_last_num:
-                return upper * 1000
-            # Spanish: millón (1M), mil (1K)
-            elif "millón" in text_after_last_num.lower() or "million" in text_after_last_num.lower():
-                return upper * 1000000
-            elif "mil" in text_after_last_num.lower() and "millón" not in text_after_last_num.lower():
-                return upper * 1000
-            # Arabic: مليون (1M), ألف (1K)
-            elif "مليون" in text_after_last_num:
-                return upper * 1000000
-            elif "ألف" in text_after_last_num:
-                return upper * 1000
-            # Hindi: करोड़ (10M), लाख (100K), हज़ार (1K)
-            elif "करोड़" in text_after_last_num:
-                return upper * 10000000
-            elif "लाख" in text_after_last_num:
-                return upper * 100000
-            elif "हज़ार" in text_after_last_num:
-                return upper * 1000
-            return upper
-        return None
-    
-    text_normalized = text.lower().strip()
-    match = re.search(r'(\d+(?:\.\d+)?)', text_normalized)
-    if not match:
-        return None
-    
-    base_num = int(float(match.group(1)))
-    
-    # Korean/Chinese/Japanese units
-    if "억" in text or "亿" in text or "億" in text:
-        return base_num * 100000000
-    elif "만" in text or "万" in text:
-        return base_num * 10000
-    elif "천" in text or "千" in text:
-        return base_num * 1000
-    
-    # Spanish units
-    if "millón" in text_normalized or "million" in text_normalized:
-        return base_num * 1000000
-    if "mil" in text_normalized and "millón" not in text_normalized:
-        return base_num * 1000
-    
-    # Arabic units
-    if "مليون" in text:
-        return base_num * 1000000
-    if "ألف" in text:
-        return base_num * 1000
-    
-    # Hindi units
-    if "करोड़" in text:
-        return base_num * 10000000
-    if "लाख" in text:
-        return base_num * 100000
-    if "हज़ार" in text:
-        return base_num * 1000
-    
-    # English units
-    if "m" in text_normalized and "million" in text_normalized or text_normalized.endswith("m"):
-        return base_num * 1000000
-    if "k" in text_normalized or "thousand" in text_normalized:
-        return base_num * 1000
-    
-    return base_num
+    from utils.quantity_parser import parse_quantity
+    quantity = parse_quantity(text)
+    return quantity.value if quantity else None
 
 
 def infer_volume_category(volume: Optional[int], volume_raw: Optional[str]) -> Optional[str]:
@@ -605,29 +533,12 @@ def validate_and_normalize_extraction(llm_response_str: str) -> tuple[Dict[str,
         Tuple of (normalized_dict, error_message)
         If validation fails, returns (None, error_message)
     """
-    import json
-    import re
+    from utils.streaming_json import parse_llm_json
     
-    # Clean and parse JSON first
-    try:
-        cleaned = llm_response_str.strip()
-        # Remove markdown code blocks
-        if "```json" in cleaned:
-            cleaned = re.sub(r'```json\s*\n?(.*?)\n?```', r'\1', cleaned, flags=re.DOTALL)
-        elif "```" in cleaned:
-            cleaned = re.sub(r'```\s*\n?(.*?)\n?```', r'\1', cleaned, flags=re.DOTALL)
-        
-        # Extract JSON object
-        first_brace = cleaned.find('{')
-        last_brace = cleaned.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            cleaned = cleaned[first_brace:last_brace + 1]
-        
-        data = json.loads(cleaned)
-    except json.JSONDecodeError as e:
-        return None, f"JSON parse error: {str(e)}"
-    except Exception as e:
-        return None, f"Error cleaning response: {str(e)}"
+    parsed = parse_llm_json(llm_response_str)
+    if parsed.data is None:
+        return None, f"JSON parse error: {parsed.error}"
+    data = parsed.data
     
     # Try to validate with Pydantic if available
     try:
@@ -666,50 +577,3 @@ def validate_and_normalize_extraction(llm_response_str: str) -> tuple[Dict[str,
             return normalize_extracted_values(data), None
         except Exception as norm_err:
             return None, f"Error: {str(e)}, normalization also failed: {str(norm_err)}"
-    
-    try:
-        # Clean response text
-        cleaned = llm_response_str.strip()
-        
-        # Remove markdown code blocks
-        if "```json" in cleaned:
-            cleaned = re.sub(r'```json\s*\n?(.*?)\n?```', r'\1', cleaned, flags=re.DOTALL)
-        elif "```" in cleaned:
-            cleaned = re.sub(r'```\s*\n?(.*?)\n?```', r'\1', cleaned, flags=re.DOTALL)
-        
-        # Extract JSON object
-        first_brace = cleaned.find('{')
-        last_brace = cleaned.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            cleaned = cleaned[first_brace:last_brace + 1]
-        
-        # Validate with Pydantic
-        parsed = SourcingIntents.model_validate_json(cleaned)
-        
-        # Convert to dict and normalize
-        extracted_dict = parsed.model_dump()
-        normalized = normalize_extracted_values(extracted_dict)
-        
-        # Add volume_category if not present
-        if "volume_category" not in normalized:
-            normalized["volume_category"] = infer_volume_category(
-                normalized.get("volume_units"),
-                normalized.get("volume_raw")
-            )
-        
-        return normalized, None
-        
-    except ValidationError as e:
-        # Pydantic validation failed - try to extract what we can
-        try:
-            data = json.loads(cleaned)
-            # Use normalize_extracted_values even if validation failed
-            normalized = normalize_extracted_values(data)
-            return normalized, f"Validation warning: {str(e)}"
-        except:
-            return None, f"Pydantic validation failed: {str(e)}"
-    except json.JSONDecodeError as e:
-        return None, f"JSON parse error: {str(e)}"
-    except Exception as e:
-        return None, f"Unexpected error: {str(e)}"
-
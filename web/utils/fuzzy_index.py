@@ -0,0 +1,124 @@
+"""
+NexSupply Fuzzy Index - Symmetric-delete typo lookup
+Precomputes every variant of each vocabulary term with up to N characters
+deleted. A misspelled token matches a term when they share a delete variant,
+so a lookup generates the token's own deletes and verifies a handful of
+candidates instead of comparing against the whole vocabulary.
+
+Distances are optimal string alignment (Damerau-Levenshtein with adjacent
+transpositions): "iphnoe" is one edit from "iphone". Matches must keep the
+first letter and may change at most MAX_EDIT_RATIO of the token; callers
+that rewrite text should also ask for a unique best match.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Edits allowed per token character: none under 5 letters, 1 up to 9, then 2
+MAX_EDIT_RATIO = 0.2
+
+
+def max_edit_distance(token: str) -> int:
+    """Typos tolerated for a token (at most 2, and at most MAX_EDIT_RATIO of its length)."""
+    return min(2, int(len(token) * MAX_EDIT_RATIO))
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """All strings obtained by deleting up to max_distance characters."""
+    variants = frontier = {term}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants = variants | frontier
+    return variants
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance, or limit + 1 once it exceeds limit.
+
+    Only the diagonal band |i - j| <= limit of the DP table is filled.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2: List[int] = []
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = min(value, over)
+        if min(current) > limit:
+            return over
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SymmetricDeleteIndex:
+    """
+    Typo-tolerant exact-term lookup over a fixed vocabulary.
+
+    Args:
+        terms: Vocabulary; earlier terms win ties at the same distance
+        max_distance: Largest edit distance any lookup may use
+    """
+
+    def __init__(self, terms: Iterable[str], max_distance: int = 2):
+        self.max_distance = max_distance
+        self.terms: Dict[str, int] = {}
+        for term in terms:
+            self.terms.setdefault(term, len(self.terms))
+        self._variants: Dict[str, List[str]] = {}
+        for term in self.terms:
+            for variant in _deletes(term, max_distance):
+                self._variants.setdefault(variant, []).append(term)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.terms
+
+    def lookup(
+        self,
+        token: str,
+        max_distance: Optional[int] = None,
+        unique: bool = False
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Closest vocabulary term within max_distance edits.
+
+        Args:
+            unique: Return None when several terms tie at the best distance
+                instead of picking the earliest
+
+        Returns:
+            (term, distance), or None when nothing is close enough
+        """
+        if token in self.terms:
+            return token, 0
+        limit = min(self.max_distance if max_distance is None else max_distance, self.max_distance)
+        if limit <= 0:
+            return None
+
+        candidates: Set[str] = set()
+        for variant in _deletes(token, limit):
+            candidates.update(self._variants.get(variant, ()))
+
+        best: Optional[Tuple[str, int]] = None
+        tied = False
+        for term in candidates:
+            if term[0] != token[0]:
+                continue  # typos rarely hit the first letter; avoids widget -> fidget
+            distance = osa_distance(token, term, limit)
+            if distance > limit:
+                continue
+            if best is None or distance < best[1]:
+                best, tied = (term, distance), False
+            elif distance == best[1]:
+                tied = True
+                if self.terms[term] < self.terms[best[0]]:
+                    best = (term, distance)
+        return None if unique and tied else best
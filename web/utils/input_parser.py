@@ -3,19 +3,28 @@ Input parser for extracting structured data from user queries.
 Parses volume, channel, target market, and other parameters from natural language input.
 """
 
-import re
 from typing import Dict, Optional, Tuple
 from utils.config import AppSettings
+from utils.lexicon import scan_query
+from utils.quantity_parser import parse_quantity
+
+
+# Shipping route inferred from the target market
+MARKET_ROUTES = {
+    "USA": "cn_to_us_west_coast",
+    "EU": "cn_to_eu",
+    "UK": "cn_to_uk",
+}
 
 
 def parse_volume(text: str) -> Optional[int]:
     """
     Parse volume/quantity from text.
     
-    Supports:
-    - Korean: 만, 천, 백
-    - English: million, thousand, k, m
-    - Numbers: 2000000, 2,000,000
+    Supports (see utils.quantity_parser):
+    - Korean / Chinese / Japanese: 만/万, 천/千, 백, 억/亿
+    - English: million, thousand, k, m; Spanish: mil, millón; lakh, crore
+    - Numbers: 2000000, 2,000,000; ranges (upper bound)
     
     Examples:
     - "200만개" -> 2000000
@@ -23,53 +32,13 @@ def parse_volume(text: str) -> Optional[int]:
     - "2 million units" -> 2000000
     - "5000" -> 5000
     """
-    if not text:
-        return None
-    
-    text_lower = text.lower()
-    
-    # Korean number patterns
-    korean_patterns = [
-        (r'(\d+(?:\.\d+)?)\s*만\s*개?', 10000),  # 만 (10,000)
-        (r'(\d+(?:\.\d+)?)\s*천\s*개?', 1000),   # 천 (1,000)
-        (r'(\d+(?:\.\d+)?)\s*백\s*개?', 100),    # 백 (100)
-    ]
-    
-    for pattern, multiplier in korean_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            number = float(match.group(1))
-            return int(number * multiplier)
-    
-    # English patterns
-    english_patterns = [
-        (r'(\d+(?:\.\d+)?)\s*million', 1000000),
-        (r'(\d+(?:\.\d+)?)\s*m', 1000000),
-        (r'(\d+(?:\.\d+)?)\s*thousand', 1000),
-        (r'(\d+(?:\.\d+)?)\s*k', 1000),
-    ]
-    
-    for pattern, multiplier in english_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            number = float(match.group(1))
-            return int(number * multiplier)
-    
-    # Plain numbers (remove commas)
-    number_match = re.search(r'(\d{1,3}(?:,\d{3})*(?:\.\d+)?)', text)
-    if number_match:
-        number_str = number_match.group(1).replace(',', '')
-        try:
-            return int(float(number_str))
-        except ValueError:
-            pass
-    
-    return None
+    quantity = parse_quantity(text)
+    return quantity.value if quantity else None
 
 
 def parse_target_market(text: str) -> Optional[str]:
     """
-    Parse target market/country from text.
+    Parse target market/country from text (first MARKET_MAP key found).
     
     Examples:
     - "미국" -> "USA"
@@ -80,43 +49,12 @@ def parse_target_market(text: str) -> Optional[str]:
     if not text:
         return None
     
-    text_lower = text.lower()
-    
-    # Market mappings
-    market_map = {
-        # Korean
-        '미국': 'USA',
-        '미국시장': 'USA',
-        '미국 시장': 'USA',
-        'us': 'USA',
-        'usa': 'USA',
-        'united states': 'USA',
-        'u.s.': 'USA',
-        'u.s.a.': 'USA',
-        
-        # Other markets (add as needed)
-        'eu': 'EU',
-        '유럽': 'EU',
-        'europe': 'EU',
-        'uk': 'UK',
-        '영국': 'UK',
-        'united kingdom': 'UK',
-        'canada': 'Canada',
-        '캐나다': 'Canada',
-        'australia': 'Australia',
-        '호주': 'Australia',
-    }
-    
-    for key, value in market_map.items():
-        if key in text_lower:
-            return value
-    
-    return None
+    return scan_query(text).market
 
 
 def parse_channel(text: str) -> Optional[str]:
     """
-    Parse sales channel from text.
+    Parse sales channel from text (first CHANNEL_MAP key found).
     
     Examples:
     - "편의점 시장" -> "Convenience Store"
@@ -127,37 +65,7 @@ def parse_channel(text: str) -> Optional[str]:
     if not text:
         return None
     
-    text_lower = text.lower()
-    
-    # Channel mappings
-    channel_map = {
-        # Korean
-        '편의점': 'Convenience Store',
-        '편의점 시장': 'Convenience Store',
-        '편의점시장': 'Convenience Store',
-        '온라인': 'Online',
-        '오프라인': 'Offline',
-        '소매': 'Retail',
-        '도매': 'Wholesale',
-        
-        # English
-        'amazon fba': 'Amazon FBA',
-        'amazon': 'Amazon FBA',
-        'fba': 'Amazon FBA',
-        'convenience store': 'Convenience Store',
-        'retail': 'Retail',
-        'wholesale': 'Wholesale',
-        'online': 'Online',
-        'offline': 'Offline',
-        'e-commerce': 'E-commerce',
-        'ecommerce': 'E-commerce',
-    }
-    
-    for key, value in channel_map.items():
-        if key in text_lower:
-            return value
-    
-    return None
+    return scan_query(text).channel
 
 
 def parse_input_parameters(query: str) -> Dict[str, any]:
@@ -189,13 +97,7 @@ def parse_input_parameters(query: str) -> Dict[str, any]:
     channel = parse_channel(query_str)
     
     # Infer route from target_market
-    route = None
-    if target_market == "USA":
-        route = "cn_to_us_west_coast"
-    elif target_market == "EU":
-        route = "cn_to_eu"
-    elif target_market == "UK":
-        route = "cn_to_uk"
+    route = MARKET_ROUTES.get(target_market)
     
     result = {}
     if volume:
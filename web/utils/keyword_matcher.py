@@ -0,0 +1,119 @@
+"""
+NexSupply Keyword Matcher - Aho-Corasick multi-keyword automaton
+Keyword classifiers used to run one substring scan per keyword
+(`kw.lower() in text`), i.e. O(total keywords × text length) per call. This
+module compiles a {label: [keywords]} lexicon once into an Aho-Corasick
+automaton that finds every keyword occurrence in a single pass over the text.
+
+Matching is case-insensitive and substring-based (same semantics as
+`kw.lower() in text.lower()`), so "bagel" still contains "bag".
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Compiled multi-pattern matcher over a {label: [keywords]} lexicon.
+
+    Each (label, keyword) entry is one pattern; a keyword listed under two
+    labels (or twice under one label) is two patterns, so counts match a
+    per-keyword loop exactly.
+    """
+
+    def __init__(self, lexicon: Dict[str, Sequence[str]]):
+        self.labels: List[str] = list(lexicon)
+        # pattern id -> (label index, lowercased keyword)
+        self.patterns: List[Tuple[int, str]] = [
+            (label_index, keyword.lower())
+            for label_index, label in enumerate(self.labels)
+            for keyword in lexicon[label]
+        ]
+
+        # Trie: one transition dict per state; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        ending: List[List[int]] = [[]]
+        for pattern_id, (_, keyword) in enumerate(self.patterns):
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    ending.append([])
+                state = nxt
+            ending[state].append(pattern_id)
+
+        # Failure links (BFS) and merged outputs: every pattern that ends at a
+        # state, including those reached through its failure chain
+        self._fail: List[int] = [0] * len(self._goto)
+        self._out: List[Tuple[int, ...]] = [()] * len(self._goto)
+        self._out[0] = tuple(ending[0])  # empty keywords match everywhere
+        queue = deque()
+        for child in self._goto[0].values():
+            queue.append(child)
+            self._out[child] = tuple(ending[child]) + self._out[0]
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = tuple(ending[child]) + self._out[self._fail[child]]
+                queue.append(child)
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of every pattern occurring in text (case-insensitive), one pass."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set(out[0])
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Every occurrence as (pattern id, start, end), in order of end offset.
+
+        Offsets index into text.lower(); pass already-lowercased text when
+        they must line up with the original.
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        spans: List[Tuple[int, int, int]] = []
+        state = 0
+        for end, ch in enumerate(text.lower(), 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                length = len(patterns[pattern_id][1])
+                if length:
+                    spans.append((pattern_id, end - length, end))
+        return spans
+
+    def count_by_label(self, text: str) -> Dict[str, int]:
+        """
+        Number of matched patterns per label, for labels with at least one hit.
+
+        Keys are in lexicon order, so `max(counts, key=counts.get)` breaks ties
+        in favour of the earliest label, like a loop over the lexicon dict.
+        """
+        counts = [0] * len(self.labels)
+        for pattern_id in self.find(text):
+            counts[self.patterns[pattern_id][0]] += 1
+        return {label: count for label, count in zip(self.labels, counts) if count}
+
+    def matched_keywords(self, text: str) -> Dict[str, List[str]]:
+        """Matched keywords per label (lexicon order), for diagnostics."""
+        hits: Dict[str, List[str]] = {}
+        for pattern_id in sorted(self.find(text)):
+            label_index, keyword = self.patterns[pattern_id]
+            hits.setdefault(self.labels[label_index], []).append(keyword)
+        return hits
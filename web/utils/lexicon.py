@@ -0,0 +1,225 @@
+"""
+NexSupply Lexicon - One keyword scan per query for every parser
+Analysis mode, target market, sales channel, product category and the
+research-data field anchors are all keyword lookups over the same lowercased
+query. Their dictionaries are compiled into one KeywordAutomaton and
+scan_query() returns every field from a single pass; detect_analysis_mode,
+parse_target_market, parse_channel, classify_category and
+parse_research_data_from_text read their answer from that result.
+
+Per-field priority is the same as the original per-module loops:
+    mode      first mode in ANALYSIS_MODES with any keyword present
+    market    first MARKET_MAP key present
+    channel   first CHANNEL_MAP key present
+    category  most keywords present; ties go to the first CATEGORY_KEYWORDS entry
+
+resolve_category() adds a typo-tolerant second pass for queries where the
+exact scan finds no category ("marshmellow", "iphnoe case").
+"""
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+
+from utils.cost_tables import CATEGORY_KEYWORDS
+from utils.english_words import COMMON_ENGLISH_WORDS
+from utils.fuzzy_index import SymmetricDeleteIndex, max_edit_distance
+from utils.keyword_matcher import KeywordAutomaton
+from utils.research_data import RESEARCH_PATTERNS
+
+
+# =============================================================================
+# DICTIONARIES
+# =============================================================================
+
+ANALYSIS_MODES = {
+    "verify": {
+        "keywords": ["verify", "verification", "check", "legitimate", "real factory",
+                     "trading company", "alibaba supplier", "검증", "확인", "scam", "fraud"],
+    },
+    "cost": {
+        "keywords": ["cost", "landed cost", "calculate", "price", "freight", "customs",
+                     "FOB", "duty", "tariff", "비용", "가격", "랜딩", "관세"],
+    },
+    "market": {
+        "keywords": ["market", "analysis", "demand", "trend", "competition", "margin",
+                     "opportunity", "시장", "분석", "트렌드", "수요"],
+    },
+    "leadtime": {
+        "keywords": ["lead time", "delivery", "timeline", "shipping", "production time",
+                     "when", "how long", "리드타임", "배송", "일정", "납기"],
+    }
+}
+
+# Target market keyword → market (checked in order)
+MARKET_MAP = {
+    # Korean
+    '미국': 'USA',
+    '미국시장': 'USA',
+    '미국 시장': 'USA',
+    'us': 'USA',
+    'usa': 'USA',
+    'united states': 'USA',
+    'u.s.': 'USA',
+    'u.s.a.': 'USA',
+
+    # Other markets (add as needed)
+    'eu': 'EU',
+    '유럽': 'EU',
+    'europe': 'EU',
+    'uk': 'UK',
+    '영국': 'UK',
+    'united kingdom': 'UK',
+    'canada': 'Canada',
+    '캐나다': 'Canada',
+    'australia': 'Australia',
+    '호주': 'Australia',
+}
+
+# Sales channel keyword → channel (checked in order)
+CHANNEL_MAP = {
+    # Korean
+    '편의점': 'Convenience Store',
+    '편의점 시장': 'Convenience Store',
+    '편의점시장': 'Convenience Store',
+    '온라인': 'Online',
+    '오프라인': 'Offline',
+    '소매': 'Retail',
+    '도매': 'Wholesale',
+
+    # English
+    'amazon fba': 'Amazon FBA',
+    'amazon': 'Amazon FBA',
+    'fba': 'Amazon FBA',
+    'convenience store': 'Convenience Store',
+    'retail': 'Retail',
+    'wholesale': 'Wholesale',
+    'online': 'Online',
+    'offline': 'Offline',
+    'e-commerce': 'E-commerce',
+    'ecommerce': 'E-commerce',
+}
+
+DEFAULT_MODE = "general"
+DEFAULT_CATEGORY = "generic_consumer_product"
+
+
+# =============================================================================
+# COMPILED LEXICON
+# =============================================================================
+
+@dataclass(frozen=True)
+class LexiconHits:
+    """Every lexicon field found in one query."""
+    mode: str = DEFAULT_MODE
+    market: Optional[str] = None
+    channel: Optional[str] = None
+    market_keyword: Optional[str] = None
+    channel_keyword: Optional[str] = None
+    category: str = DEFAULT_CATEGORY
+    research_anchors: FrozenSet[str] = frozenset()
+
+
+def _build_lexicon() -> Dict[tuple, list]:
+    """Merge all dictionaries into one {(field, name): [keywords]} lexicon, in priority order."""
+    lexicon = {}
+    for mode, config in ANALYSIS_MODES.items():
+        lexicon[("mode", mode)] = config["keywords"]
+    for key in MARKET_MAP:
+        lexicon[("market", key)] = [key]
+    for key in CHANNEL_MAP:
+        lexicon[("channel", key)] = [key]
+    for category_id, keywords in CATEGORY_KEYWORDS.items():
+        lexicon[("category", category_id)] = keywords
+    for anchor, _, _ in RESEARCH_PATTERNS:
+        lexicon[("research", anchor)] = [anchor]
+    return lexicon
+
+
+QUERY_LEXICON = KeywordAutomaton(_build_lexicon())
+
+_SCAN_CACHE_SIZE = 256
+
+
+def scan_text(text: str) -> LexiconHits:
+    """Resolve every lexicon field from one pass over text (uncached)."""
+    if not text:
+        return LexiconHits()
+
+    first: Dict[str, str] = {}
+    category_scores: Dict[str, int] = {}
+    research_anchors = set()
+    # Labels come back in lexicon order, so the first hit per field has priority
+    for (field, name), count in QUERY_LEXICON.count_by_label(text).items():
+        if field == "category":
+            category_scores[name] = count
+        elif field == "research":
+            research_anchors.add(name)
+        else:
+            first.setdefault(field, name)
+
+    return LexiconHits(
+        mode=first.get("mode", DEFAULT_MODE),
+        market=MARKET_MAP[first["market"]] if "market" in first else None,
+        channel=CHANNEL_MAP[first["channel"]] if "channel" in first else None,
+        market_keyword=first.get("market"),
+        channel_keyword=first.get("channel"),
+        category=max(category_scores, key=category_scores.get) if category_scores else DEFAULT_CATEGORY,
+        research_anchors=frozenset(research_anchors),
+    )
+
+
+@functools.lru_cache(maxsize=_SCAN_CACHE_SIZE)
+def scan_query(text: str) -> LexiconHits:
+    """Cached scan_text(): the parsers called for the same query share one scan."""
+    return scan_text(text)
+
+
+# =============================================================================
+# TYPO-TOLERANT CATEGORY PASS
+# =============================================================================
+
+_WORD = re.compile(r"[a-z]+")
+
+# Latin-script words of the category keywords, in CATEGORY_KEYWORDS order
+CATEGORY_KEYWORD_INDEX = SymmetricDeleteIndex(
+    word
+    for keywords in CATEGORY_KEYWORDS.values()
+    for keyword in keywords
+    for word in _WORD.findall(keyword.lower())
+)
+
+# Every word the lexicon knows: never "corrected" into a category keyword
+_KNOWN_WORDS = frozenset(
+    word for _, keyword in QUERY_LEXICON.patterns for word in _WORD.findall(keyword)
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _correct_word(word: str) -> str:
+    # Real words are never typos, however close to a keyword ("speaker", "tower")
+    if word in _KNOWN_WORDS or word in COMMON_ENGLISH_WORDS:
+        return word
+    found = CATEGORY_KEYWORD_INDEX.lookup(word, max_edit_distance(word), unique=True)
+    return found[0] if found else word
+
+
+def correct_typos(text: str) -> str:
+    """Lowercased text with misspelled words replaced by their unique nearest category keyword word."""
+    return _WORD.sub(lambda match: _correct_word(match.group(0)), text.lower())
+
+
+def resolve_category(text: str) -> str:
+    """
+    Category of a query: exact keyword scan, then a typo-corrected rescan.
+
+    The second pass only runs when the exact scan finds no category.
+    """
+    category = scan_query(text).category
+    if category != DEFAULT_CATEGORY or not text:
+        return category
+    corrected = correct_typos(text)
+    if corrected == text.lower():
+        return category
+    return scan_query(corrected).category
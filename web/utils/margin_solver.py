@@ -0,0 +1,276 @@
+"""
+NexSupply Margin Solver - Closed-form target-margin and break-even answers
+Landed cost is linear in units plus fixed per-shipment fees (see cost_curve):
+
+    total(u) = F + v * u        cost per unit = F / u + v
+
+so "how many units for a 35% margin at $4.99?" has an exact answer instead of
+a volume search:
+
+    margin(u) >= m  ⇔  F / u + v <= p * (1 - m)  ⇔  u >= F / (p * (1 - m) - v)
+
+With FOB price breaks v is piecewise constant in u (one v_k per tier) and the
+same bound is solved per tier.
+
+Batch functions take aligned arrays (one row per SKU); the scalar helpers
+wrap them for single questions.
+"""
+
+from typing import Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from utils.cost_calculator import evaluate_landed_cost_columns
+from utils.compiled_cost_tables import get_compiled_cost_tables
+
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _column(values: Optional[ArrayLike], n: int, fill: float = np.nan) -> np.ndarray:
+    """Broadcast a scalar / sequence / None to a float64 column of length n."""
+    if values is None:
+        return np.full(n, fill)
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (n,)).copy()
+
+
+def _margin_fraction(target_margin_percent: ArrayLike, n: int) -> np.ndarray:
+    """Validate target margins (percent) and convert to fractions."""
+    margin = _column(target_margin_percent, n) / 100.0
+    if np.any(np.isnan(margin)) or np.any(margin >= 1.0):
+        raise ValueError("target_margin_percent must be a number below 100")
+    return margin
+
+
+def tiered_cost_structure(
+    category_ids: Sequence[str],
+    routes: Union[str, Sequence[str], None],
+    custom_unit_weights_kg: Optional[ArrayLike]
+) -> Dict[str, np.ndarray]:
+    """
+    Fixed cost F and per-tier variable cost v_k for each SKU.
+
+    Returns:
+        Dictionary with `fixed_costs_usd` (n,), `tier_starts` (n, tiers; inf
+        past the last tier) and `variable_cost_per_unit_usd` (n, tiers)
+    """
+    from utils.config import AppSettings
+
+    n = len(category_ids)
+    if isinstance(routes, str) or routes is None:
+        routes = [routes or AppSettings.DEFAULT_ROUTE] * n
+
+    tables = get_compiled_cost_tables()
+    category_idx = tables.category_ids_of(category_ids)
+    coef = tables.gather(category_idx, tables.route_ids_of(routes))
+    weights = _column(custom_unit_weights_kg, n)
+
+    # Evaluate the real formula at one unit per FOB tier: total(1) = F + v_k
+    variable = np.empty((n, tables.max_fob_tiers))
+    for k in range(tables.max_fob_tiers):
+        tier_coef = coef._replace(base_fob_cost_per_kg=tables.fob_tier_rates[category_idx, k])
+        cols = evaluate_landed_cost_columns(tier_coef, np.ones(n), weights, np.full(n, np.nan))
+        variable[:, k] = cols["total_landed_cost_usd"] - cols["handling"]
+
+    return {
+        "fixed_costs_usd": cols["handling"],
+        "tier_starts": tables.fob_tier_starts[category_idx],
+        "variable_cost_per_unit_usd": variable,
+    }
+
+
+def _tier_of(tier_starts: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """Index of the FOB tier each order quantity falls in."""
+    return (tier_starts <= units[:, None]).sum(axis=1) - 1
+
+
+def cost_structure_batch(
+    category_ids: Sequence[str],
+    routes: Union[str, Sequence[str], None] = None,
+    custom_unit_weights_kg: Optional[ArrayLike] = None,
+    units: Optional[ArrayLike] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Fixed cost F and variable cost per unit v for each SKU.
+
+    Args:
+        category_ids: Category per SKU
+        routes: Single route or one per SKU (defaults to AppSettings.DEFAULT_ROUTE)
+        custom_unit_weights_kg: Unit weight overrides (None/NaN = category default)
+        units: Order quantity selecting the FOB price break (None = base price)
+
+    Returns:
+        Dictionary with `fixed_costs_usd` and `variable_cost_per_unit_usd` arrays
+    """
+    n = len(category_ids)
+    tiered = tiered_cost_structure(category_ids, routes, custom_unit_weights_kg)
+    tier = np.zeros(n, dtype=np.intp) if units is None else _tier_of(tiered["tier_starts"], _column(units, n))
+    return {
+        "fixed_costs_usd": tiered["fixed_costs_usd"],
+        "variable_cost_per_unit_usd": tiered["variable_cost_per_unit_usd"][np.arange(n), tier],
+    }
+
+
+def min_units_for_margin_batch(
+    category_ids: Sequence[str],
+    retail_prices: ArrayLike,
+    target_margin_percent: ArrayLike,
+    routes: Union[str, Sequence[str], None] = None,
+    custom_unit_weights_kg: Optional[ArrayLike] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Minimum order quantity reaching a target gross margin, per SKU.
+
+    With FOB price breaks, cost per unit is F / u + v_k on each tier
+    [start_k, start_k+1); the answer is the first tier whose own bound lands
+    inside it. A target is infeasible when the price cannot cover the
+    variable cost at that margin, however many units are ordered;
+    `max_margin_percent` is the margin approached as volume grows.
+
+    Returns:
+        Dictionary with `units` (int64, 0 where infeasible), `feasible` (bool)
+        and `max_margin_percent` arrays
+    """
+    n = len(category_ids)
+    tiered = tiered_cost_structure(category_ids, routes, custom_unit_weights_kg)
+    fixed = tiered["fixed_costs_usd"][:, None]
+    variable = tiered["variable_cost_per_unit_usd"]
+    starts = tiered["tier_starts"]
+    price = _column(retail_prices, n)
+    margin = _margin_fraction(target_margin_percent, n)
+
+    if np.any(~(price > 0)):
+        raise ValueError("retail_prices must be positive")
+
+    allowed = (price * (1.0 - margin))[:, None]  # max cost per unit, (n, 1)
+    headroom = allowed - variable  # per-unit room left for fixed costs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bound = np.where(headroom > 0, fixed / headroom, np.inf)
+    candidate = np.maximum(np.maximum(np.ceil(bound), 1.0), starts)
+
+    # Guard against float rounding at the exact boundary
+    with np.errstate(invalid="ignore"):
+        short = np.isfinite(candidate) & ((fixed / candidate + variable) > allowed)
+    candidate = candidate + short
+
+    tier_ends = np.concatenate([starts[:, 1:], np.full((n, 1), np.inf)], axis=1)
+    valid = np.isfinite(candidate) & (candidate < tier_ends)
+    feasible = valid.any(axis=1)
+    first = np.argmax(valid, axis=1)
+    units = candidate[np.arange(n), first]
+
+    last_variable = variable[np.arange(n), (np.isfinite(starts)).sum(axis=1) - 1]
+    return {
+        "units": np.where(feasible, units, 0).astype(np.int64),
+        "feasible": feasible,
+        "max_margin_percent": (price - last_variable) / price * 100.0,
+    }
+
+
+def break_even_units_batch(
+    category_ids: Sequence[str],
+    retail_prices: ArrayLike,
+    routes: Union[str, Sequence[str], None] = None,
+    custom_unit_weights_kg: Optional[ArrayLike] = None
+) -> Dict[str, np.ndarray]:
+    """Smallest order quantity with non-negative margin (target margin 0%), per SKU."""
+    return min_units_for_margin_batch(
+        category_ids, retail_prices, 0.0, routes, custom_unit_weights_kg
+    )
+
+
+def retail_price_for_margin_batch(
+    category_ids: Sequence[str],
+    units: ArrayLike,
+    target_margin_percent: ArrayLike,
+    routes: Union[str, Sequence[str], None] = None,
+    custom_unit_weights_kg: Optional[ArrayLike] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Retail price needed for a target gross margin at a given order quantity.
+
+    Returns:
+        Dictionary with `retail_price_per_unit_usd` and
+        `landed_cost_per_unit_usd` arrays
+    """
+    n = len(category_ids)
+    units_col = _column(units, n)
+    if np.any(~(units_col > 0)):
+        raise ValueError("units must be positive")
+    structure = cost_structure_batch(category_ids, routes, custom_unit_weights_kg, units_col)
+    margin = _margin_fraction(target_margin_percent, n)
+
+    cost_per_unit = (
+        structure["fixed_costs_usd"] / units_col + structure["variable_cost_per_unit_usd"]
+    )
+    return {
+        "retail_price_per_unit_usd": cost_per_unit / (1.0 - margin),
+        "landed_cost_per_unit_usd": cost_per_unit,
+    }
+
+
+# =============================================================================
+# SINGLE-SKU HELPERS
+# =============================================================================
+
+def solve_units_for_margin(
+    category_id: str,
+    retail_price: float,
+    target_margin_percent: float,
+    route: Optional[str] = None,
+    custom_unit_weight_kg: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    How many units are needed to reach `target_margin_percent` at `retail_price`?
+
+    Returns:
+        Dictionary with `units` (None if unreachable at any volume),
+        `feasible`, `max_margin_percent` and the cost structure used
+    """
+    solved = min_units_for_margin_batch(
+        [category_id], retail_price, target_margin_percent, route, custom_unit_weight_kg
+    )
+    feasible = bool(solved["feasible"][0])
+    structure = cost_structure_batch(
+        [category_id], route, custom_unit_weight_kg, solved["units"] if feasible else None
+    )
+    return {
+        "category_id": category_id,
+        "retail_price_per_unit_usd": retail_price,
+        "target_margin_percent": target_margin_percent,
+        "units": int(solved["units"][0]) if feasible else None,
+        "feasible": feasible,
+        "max_margin_percent": round(float(solved["max_margin_percent"][0]), 1),
+        "fixed_costs_usd": round(float(structure["fixed_costs_usd"][0]), 2),
+        "variable_cost_per_unit_usd": round(float(structure["variable_cost_per_unit_usd"][0]), 4),
+    }
+
+
+def solve_break_even_units(
+    category_id: str,
+    retail_price: float,
+    route: Optional[str] = None,
+    custom_unit_weight_kg: Optional[float] = None
+) -> Dict[str, Any]:
+    """Break-even order quantity at `retail_price` (see solve_units_for_margin)."""
+    return solve_units_for_margin(category_id, retail_price, 0.0, route, custom_unit_weight_kg)
+
+
+def solve_retail_price_for_margin(
+    category_id: str,
+    units: int,
+    target_margin_percent: float,
+    route: Optional[str] = None,
+    custom_unit_weight_kg: Optional[float] = None
+) -> Dict[str, Any]:
+    """Retail price needed for `target_margin_percent` at `units`."""
+    solved = retail_price_for_margin_batch(
+        [category_id], units, target_margin_percent, route, custom_unit_weight_kg
+    )
+    return {
+        "category_id": category_id,
+        "units": units,
+        "target_margin_percent": target_margin_percent,
+        "retail_price_per_unit_usd": round(float(solved["retail_price_per_unit_usd"][0]), 4),
+        "landed_cost_per_unit_usd": round(float(solved["landed_cost_per_unit_usd"][0]), 4),
+    }
@@ -0,0 +1,255 @@
+"""
+NexSupply N-gram Classifier - TF-IDF character n-gram category scoring
+classify_category() needs a literal keyword inside the query, so paraphrases
+("gummies", "marshmallow pops", "티셔츠 반팔") fall through to the generic
+category. This optional classifier compares character n-grams instead: each
+category is one TF-IDF document built from its label, keywords and, when
+available, queries already labeled in analysis_logs.
+
+Character n-grams need no word tokenizer, so Korean, Chinese and Japanese
+queries work as-is (single CJK characters are kept as unigrams). Category
+documents include CJK_CATEGORY_TERMS, Japanese and Chinese product terms for
+every category, since CATEGORY_KEYWORDS is mostly English and Korean.
+
+A batch of queries is vectorized into one sparse CSR matrix (indptr, indices,
+values) and scored against the dense category matrix with one matrix product
+per block of SCORE_BLOCK_ROWS queries, restricted to the vocabulary columns
+the block uses. Results below `min_score` fall back to 'generic_consumer_product'.
+"""
+
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.cost_tables import COST_TABLES, CATEGORY_KEYWORDS
+
+
+FALLBACK_CATEGORY = "generic_consumer_product"
+
+NGRAM_SIZES = (2, 3, 4)
+
+# Queries per dense block in score_batch. Few queries use few vocabulary
+# columns, so a small block stays dense enough for the product to beat a
+# scatter-add over the non-zeros
+SCORE_BLOCK_ROWS = 32
+DEFAULT_MIN_SCORE = 0.1
+
+# Japanese and Chinese (simplified) terms per category for the category
+# documents; CATEGORY_KEYWORDS itself is mostly English and Korean
+CJK_CATEGORY_TERMS: Dict[str, Tuple[str, ...]] = {
+    "candy_marshmallow_stick": ("マシュマロ", "ロリポップ", "キャンディ", "棉花糖", "棒棒糖", "硬糖"),
+    "candy_gummy_peelable": ("グミ", "ゼリー", "ソフトキャンディ", "软糖", "橡皮糖", "果汁软糖"),
+    "novelty_toy_small_plastic": ("おもちゃ", "キーホルダー", "フィギュア", "玩具", "钥匙扣", "手办"),
+    "electronics_small_accessory": ("充電器", "ケーブル", "イヤホン", "モバイルバッテリー", "充电器", "数据线", "耳机", "充电宝"),
+    "apparel_tshirt_basic": ("Tシャツ", "シャツ", "衣類", "T恤", "衬衫", "服装"),
+    "apparel_hat_cap": ("帽子", "キャップ", "ニット帽", "棒球帽", "鸭舌帽", "毛线帽"),
+    "bags_tote_backpack": ("バッグ", "トートバッグ", "リュック", "手提袋", "背包", "包包"),
+    "home_food_container": ("保存容器", "弁当箱", "タッパー", "保鲜盒", "饭盒", "食品容器"),
+    "home_kitchen_utensil": ("キッチン用品", "調理器具", "ヘラ", "スプーン", "厨具", "锅铲", "勺子", "厨房用品"),
+    "beauty_cosmetic_packaging": ("化粧品", "化粧品容器", "ボトル", "化妆品", "化妆品瓶", "美容"),
+    "pet_toy_accessory": ("ペット", "ペット用品", "犬", "猫", "宠物", "宠物用品", "狗", "猫咪"),
+    "outdoor_camping_gear": ("キャンプ用品", "テント", "アウトドア", "露营", "帐篷", "户外用品"),
+    "sports_fitness_equipment": ("フィットネス", "ヨガマット", "ダンベル", "健身器材", "瑜伽垫", "哑铃"),
+    "office_stationery": ("文房具", "ノート", "ペン", "文具", "笔记本", "圆珠笔"),
+    "automotive_accessory": ("カー用品", "車載ホルダー", "自動車", "汽车用品", "车载支架", "汽车配件"),
+    "home_decor_decorative": ("インテリア", "花瓶", "キャンドル", "装饰品", "摆件", "蜡烛"),
+    "lighting_led_fixture": ("LED照明", "ライト", "ランプ", "照明", "LED灯", "台灯", "灯具"),
+    "packaging_boxes_mailers": ("包装", "段ボール", "ギフトボックス", "包装盒", "纸箱", "礼盒"),
+    "jewelry_fashion_accessory": ("アクセサリー", "ネックレス", "ブレスレット", "ピアス", "首饰", "项链", "手链", "耳环"),
+    "footwear_shoes_sandals": ("靴", "サンダル", "スニーカー", "鞋子", "凉鞋", "运动鞋", "拖鞋"),
+    "eyewear_sunglasses": ("サングラス", "メガネ", "眼鏡", "太阳镜", "墨镜", "眼镜"),
+    "watches_fashion": ("腕時計", "時計", "スマートウォッチ", "手表", "腕表", "智能手表"),
+    "baby_infant_products": ("ベビー用品", "赤ちゃん", "おしゃぶり", "婴儿用品", "宝宝", "奶嘴"),
+    "tools_hand_hardware": ("工具", "ドライバー", "レンチ", "五金工具", "螺丝刀", "扳手"),
+    "medical_health_supplies": ("医療用品", "マスク", "絆創膏", "体温計", "医疗用品", "口罩", "创可贴", "体温计"),
+    "seasonal_holiday_items": ("クリスマス", "ハロウィン", "季節商品", "圣诞", "万圣节", "节日用品"),
+    "promotional_products": ("ノベルティ", "販促品", "記念品", "促销品", "赠品", "礼品定制"),
+    "garden_lawn_products": ("ガーデニング", "植木鉢", "ホース", "园艺", "花盆", "水管"),
+    "craft_diy_supplies": ("手芸", "ハンドメイド", "ビーズ", "毛糸", "手工材料", "串珠", "毛线"),
+    "phone_case_protector": ("スマホケース", "保護フィルム", "携帯ケース", "手机壳", "手机膜", "钢化膜"),
+    "textiles_fabrics_towels": ("タオル", "毛布", "寝具", "クッション", "毛巾", "毛毯", "床上用品", "抱枕"),
+    "furniture_small_storage": ("家具", "収納", "棚", "ラック", "收纳", "置物架", "货架"),
+    "food_beverage_snacks": ("食品", "お菓子", "スナック", "飲料", "零食", "饮料", "饼干"),
+}
+
+# First CJK block (radicals); Hangul, kana and Han ideographs are all above it
+_CJK_START = 0x2E80
+
+
+def char_ngrams(text: str) -> Counter:
+    """Character n-gram counts of a lowercased, space-padded text."""
+    padded = f" {' '.join(text.lower().split())} "
+    grams = Counter(ch for ch in padded if ord(ch) >= _CJK_START)
+    for n in NGRAM_SIZES:
+        grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _sublinear_tf(count: int) -> float:
+    return 1.0 + math.log(count)
+
+
+class NgramCategoryClassifier:
+    """
+    TF-IDF character n-gram classifier over category documents.
+
+    Args:
+        documents: {category_id: [texts]}; each category's texts form one document
+        min_score: Cosine similarity below which classify() falls back to the
+            generic category
+    """
+
+    def __init__(self, documents: Dict[str, Sequence[str]], min_score: float = DEFAULT_MIN_SCORE):
+        self.categories: List[str] = list(documents)
+        self.min_score = min_score
+
+        doc_grams = [Counter() for _ in self.categories]
+        for grams, texts in zip(doc_grams, documents.values()):
+            for text in texts:
+                grams.update(char_ngrams(text))
+
+        self.vocabulary: Dict[str, int] = {}
+        for grams in doc_grams:
+            for gram in grams:
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+
+        # Smoothed IDF over category documents; unseen n-grams get the maximum
+        n_docs = len(self.categories)
+        doc_freq = np.zeros(len(self.vocabulary))
+        for grams in doc_grams:
+            doc_freq[[self.vocabulary[g] for g in grams]] += 1
+        self.idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+        self.unseen_idf = math.log(1.0 + n_docs) + 1.0
+
+        # Dense (categories x vocabulary) matrix of L2-normalized TF-IDF rows
+        self.category_matrix = np.zeros((n_docs, len(self.vocabulary)))
+        for row, grams in enumerate(doc_grams):
+            cols = [self.vocabulary[g] for g in grams]
+            self.category_matrix[row, cols] = [_sublinear_tf(c) for c in grams.values()]
+        self.category_matrix *= self.idf
+        norms = np.linalg.norm(self.category_matrix, axis=1, keepdims=True)
+        self.category_matrix /= np.where(norms > 0, norms, 1.0)
+        # (vocabulary x categories) copy, so score_batch gathers contiguous rows
+        self._vocabulary_weights = np.ascontiguousarray(self.category_matrix.T)
+
+    def vectorize(self, queries: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        L2-normalized TF-IDF vectors of queries as a CSR matrix.
+
+        N-grams outside the vocabulary count towards each row's norm (at the
+        unseen IDF) but are not stored, since no category shares them.
+
+        Returns:
+            (indptr, indices, values)
+        """
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        for query in queries:
+            grams = char_ngrams(query)
+            row_indices, row_values, norm_sq = [], [], 0.0
+            for gram, count in grams.items():
+                col = self.vocabulary.get(gram)
+                weight = _sublinear_tf(count) * (self.unseen_idf if col is None else self.idf[col])
+                norm_sq += weight * weight
+                if col is not None:
+                    row_indices.append(col)
+                    row_values.append(weight)
+            norm = math.sqrt(norm_sq) or 1.0
+            indices.extend(row_indices)
+            values.extend(v / norm for v in row_values)
+            indptr.append(len(indices))
+        return (
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(values, dtype=np.float64),
+        )
+
+    def score_batch(self, queries: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every query to every category, shape (queries, categories)."""
+        indptr, indices, values = self.vectorize(queries)
+        rows = np.repeat(np.arange(len(queries)), np.diff(indptr))
+        scores = np.empty((len(queries), len(self.categories)))
+        # Sparse (queries x vocabulary) @ dense (vocabulary x categories): each
+        # block of queries is densified over only the columns it uses, then
+        # scored against every category in one product
+        for start in range(0, len(queries), SCORE_BLOCK_ROWS):
+            end = min(start + SCORE_BLOCK_ROWS, len(queries))
+            lo, hi = indptr[start], indptr[end]
+            columns, block_columns = np.unique(indices[lo:hi], return_inverse=True)
+            block = np.zeros((end - start, len(columns)))
+            block[rows[lo:hi] - start, block_columns] = values[lo:hi]
+            scores[start:end] = block @ self._vocabulary_weights[columns]
+        return scores
+
+    def top_k(self, queries: Sequence[str], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Best k (category_id, score) pairs per query, highest first."""
+        scores = self.score_batch(queries)
+        k = min(k, len(self.categories))
+        # Stable sort on negated scores: ties keep category order
+        best = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return [
+            [(self.categories[c], float(scores[i, c])) for c in best[i]]
+            for i in range(len(queries))
+        ]
+
+    def classify_batch(self, queries: Sequence[str]) -> List[str]:
+        """Best category per query, or FALLBACK_CATEGORY below min_score."""
+        scores = self.score_batch(queries)
+        best = np.argmax(scores, axis=1)
+        confident = scores[np.arange(len(queries)), best] >= self.min_score
+        return [self.categories[c] if ok else FALLBACK_CATEGORY for c, ok in zip(best, confident)]
+
+    def classify(self, query: str) -> str:
+        """Drop-in alternative to classify_category()."""
+        return self.classify_batch([query])[0]
+
+
+def category_documents(
+    labeled_queries: Optional[Iterable[Tuple[str, str]]] = None
+) -> Dict[str, List[str]]:
+    """
+    Training texts per category: label, id words, keywords, CJK terms and labeled queries.
+
+    Labeled queries may be tagged with a category_id or its COST_TABLES label;
+    other tags (free-text categories from the LLM) are ignored.
+    """
+    documents = {
+        category_id: [
+            COST_TABLES[category_id]["label"],
+            category_id.replace("_", " "),
+            *keywords,
+            *CJK_CATEGORY_TERMS.get(category_id, ()),
+        ]
+        for category_id, keywords in CATEGORY_KEYWORDS.items()
+    }
+    by_label = {COST_TABLES[category_id]["label"].lower(): category_id for category_id in documents}
+    for query, tag in labeled_queries or ():
+        if not query or not tag:
+            continue
+        category_id = tag if tag in documents else by_label.get(tag.lower())
+        if category_id:
+            documents[category_id].append(query)
+    return documents
+
+
+def build_ngram_classifier(
+    labeled_queries: Optional[Iterable[Tuple[str, str]]] = None,
+    include_logs: bool = False,
+    min_score: float = DEFAULT_MIN_SCORE
+) -> NgramCategoryClassifier:
+    """
+    Build a classifier from CATEGORY_KEYWORDS plus optional labeled queries.
+
+    Args:
+        labeled_queries: (query, category) pairs to learn from
+        include_logs: Also learn from labeled rows in analysis_logs
+        min_score: Confidence threshold for the generic fallback
+    """
+    labeled = list(labeled_queries or ())
+    if include_logs:
+        from services.data_logger import get_labeled_queries
+        labeled.extend(get_labeled_queries())
+    return NgramCategoryClassifier(category_documents(labeled), min_score=min_score)
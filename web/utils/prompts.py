@@ -9,6 +9,7 @@ Key Principles:
 4. TRUST - Build confidence through detail
 """
 
+import hashlib
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -864,6 +865,12 @@ Remember:
 * Do not wrap in markdown code blocks.
 '''
 
+# Changes whenever the hybrid prompts change; part of the insight cache key so
+# cached AI insights never outlive the prompt that produced them
+HYBRID_PROMPT_VERSION = hashlib.sha1(
+    (HYBRID_SYSTEM_PROMPT + HYBRID_USER_PROMPT_TEMPLATE).encode("utf-8")
+).hexdigest()[:12]
+
 
 def build_hybrid_prompt(
     user_input: str,
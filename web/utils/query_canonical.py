@@ -0,0 +1,115 @@
+"""
+NexSupply Query Canonicalization - One key for every spelling of a request
+"Marshmallow  on stick 5000pcs", "marshmallow on a stick, 5k units" and the
+same text with full-width digits are one product request. canonicalize_query()
+reduces them to the same canonical text and hash:
+
+    1. Unicode NFKC (full-width digits and letters become ASCII) + casefold
+    2. Drop order quantities found by the quantity grammar: numbers with a
+       count unit or scale word ("5000pcs", "5k"). Bare numbers ("iphone 15
+       case", "3 in 1", "model 3000"), prices and sizes ("$2", "10cm")
+       describe the product and are kept
+    3. Drop target market and sales channel keywords found by the lexicon
+       (whole words only, so "us" inside "customs" stays)
+    4. Punctuation to spaces, filler words removed, whitespace collapsed
+
+The hash of the canonical text is the cache key for anything keyed by query
+(LLM response caches, request coalescing) and is stored in analysis_logs so
+analytics can group and deduplicate with an index lookup.
+"""
+
+import functools
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from utils.lexicon import QUERY_LEXICON
+from utils.quantity_parser import find_quantities
+
+
+STRIPPED_LEXICON_FIELDS = ("market", "channel")
+
+# Quantities at or above this confidence (a count unit or scale word) are
+# order sizes; a bare number may be a model number or product attribute
+QUANTITY_STRIP_CONFIDENCE = 0.85
+
+FILLER_WORDS = frozenset({"a", "an", "the", "for", "to", "in", "into", "please"})
+
+_NON_WORD = re.compile(r"[\W_]+")
+_ASCII_LETTER = re.compile(r"[a-z]")
+
+_CANONICAL_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CanonicalQuery:
+    """Canonical text of a query and its stable hash."""
+    text: str
+    key: str
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Latin keywords must not touch other Latin letters ('us' in 'customs')."""
+    if not _ASCII_LETTER.match(text[start:end][-1]):
+        return True
+    before = text[start - 1] if start else ""
+    after = text[end] if end < len(text) else ""
+    return not (_ASCII_LETTER.match(before) or _ASCII_LETTER.match(after))
+
+
+def _strip_spans(text: str, spans: List[Tuple[int, int]]) -> str:
+    """Replace each (start, end) span of text with a space."""
+    pieces, position = [], 0
+    for start, end in sorted(spans):
+        if start >= position:
+            pieces.append(text[position:start])
+        position = max(position, end)
+        pieces.append(" ")
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def _fold(query: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", query or "").casefold().split())
+
+
+def product_terms(query: str) -> str:
+    """
+    Steps 1-4 of canonicalization with no fallback: what the query says
+    besides quantity, market, channel and filler words ('' if nothing).
+    """
+    folded = _fold(query)
+    if not folded:
+        return ""
+
+    spans = [
+        quantity.span for quantity in find_quantities(folded)
+        if quantity.confidence >= QUANTITY_STRIP_CONFIDENCE
+    ]
+    for pattern_id, start, end in QUERY_LEXICON.find_spans(folded):
+        field, _ = QUERY_LEXICON.labels[QUERY_LEXICON.patterns[pattern_id][0]]
+        if field in STRIPPED_LEXICON_FIELDS and _is_whole_word(folded, start, end):
+            spans.append((start, end))
+
+    words = _NON_WORD.sub(" ", _strip_spans(folded, spans)).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+def canonical_text(query: str) -> str:
+    """Canonical form of a query (see module docstring); '' for empty input."""
+    # A query that is nothing but quantity/market/channel keeps its folded text
+    return product_terms(query) or " ".join(_NON_WORD.sub(" ", _fold(query)).split())
+
+
+@functools.lru_cache(maxsize=_CANONICAL_CACHE_SIZE)
+def canonicalize_query(query: str) -> CanonicalQuery:
+    """Canonical text and hash of a query (cached)."""
+    text = canonical_text(query)
+    return CanonicalQuery(text=text, key=hashlib.sha1(text.encode("utf-8")).hexdigest()[:16])
+
+
+def query_cache_key(query: str) -> str:
+    """The cache key for anything keyed by user query."""
+    return canonicalize_query(query).key
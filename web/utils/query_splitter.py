@@ -0,0 +1,91 @@
+"""
+NexSupply Query Splitter - Several products pasted into one query
+"gummy pouches 20k, phone cases 5k, yoga mats 2k for Amazon US" is three
+orders sharing one market and channel. split_products() finds them:
+
+    1. Quantities with an explicit count unit or scale word ("20k", "5000 pcs",
+       "2만개") anchor products; bare numbers are too ambiguous to split on.
+    2. The text is cut into clauses at , ; newlines "and" "&" "+" - never
+       inside a quantity, so "20,000 pcs" stays whole.
+    3. Each clause with an anchor starts a product; clauses without one
+       ("private label", "for Amazon US") stay with the product before them.
+
+A split needs at least two products that each name something besides their
+quantity, market and channel; otherwise the query is one product and the
+result is empty.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from utils.quantity_parser import find_quantities
+from utils.query_canonical import product_terms
+
+
+# Count units score 0.95 and scale words 0.85 in the quantity grammar
+SPLIT_MIN_CONFIDENCE = 0.85
+
+_CLAUSE_BREAK = re.compile(r"[,;\n]|(?<![^\W\d_])and(?![^\W\d_])|[&+]", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ProductSegment:
+    """One product of a multi-product query."""
+    text: str
+    units: int
+    span: Tuple[int, int]
+
+
+def _clauses(text: str, protected: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """(start, end) of the clauses of text, cut at breaks outside protected spans."""
+    bounds, start = [], 0
+    for match in _CLAUSE_BREAK.finditer(text):
+        if any(lo <= match.start() < hi for lo, hi in protected):
+            continue
+        bounds.append((start, match.start()))
+        start = match.end()
+    bounds.append((start, len(text)))
+    return bounds
+
+
+def _names_a_product(text: str) -> bool:
+    """Whether text has words besides its quantity, market and channel."""
+    return any(ch.isalpha() for ch in product_terms(text))
+
+
+def split_products(query: str, max_segments: Optional[int] = None) -> List[ProductSegment]:
+    """
+    Product segments of a multi-product query, in order of appearance.
+
+    Returns:
+        Two or more segments, or [] when the query is a single product
+    """
+    if not query:
+        return []
+    quantities = find_quantities(query)
+    anchors = [q for q in quantities if q.confidence >= SPLIT_MIN_CONFIDENCE]
+    if len(anchors) < 2:
+        return []
+
+    groups: List[List] = []  # [start, end, units]
+    for start, end in _clauses(query, [q.span for q in quantities]):
+        anchor = next((q for q in anchors if start <= q.span[0] < end), None)
+        if anchor is not None or not groups:
+            groups.append([start, end, anchor.value if anchor else None])
+        else:
+            groups[-1][1] = end
+    # Leading clauses without a quantity ("Quote for:") belong to the first product
+    if groups[0][2] is None and len(groups) > 1:
+        groups[1][0] = groups[0][0]
+        groups.pop(0)
+
+    segments = []
+    for start, end, units in groups:
+        text = query[start:end].strip(" \t\r\n.:-")
+        if units is None or not _names_a_product(text):
+            return []
+        segments.append(ProductSegment(text=text, units=units, span=(start, end)))
+    if len(segments) < 2:
+        return []
+    return segments[:max_segments] if max_segments else segments
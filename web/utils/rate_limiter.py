@@ -0,0 +1,69 @@
+"""
+NexSupply Rate Limiter - Shared throttle for LLM calls
+Concurrent pipelines (multi-product fan-out, shadow extraction) all call the
+same Gemini API key. RateLimiter bounds both how many calls are in flight
+and how many start per minute (token bucket), so a fan-out cannot trip the
+provider's quota.
+
+    with limiter:
+        response = model.generate_content(prompt)
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """
+    Concurrency cap plus token-bucket start rate.
+
+    Args:
+        max_concurrent: Calls allowed in flight at once
+        requests_per_minute: Sustained start rate; bursts up to `burst`
+        burst: Bucket size (default: max_concurrent)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        requests_per_minute: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if max_concurrent < 1 or requests_per_minute <= 0:
+            raise ValueError("max_concurrent must be >= 1 and requests_per_minute > 0")
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._rate_per_s = requests_per_minute / 60.0
+        self._capacity = float(burst or max_concurrent)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _take_token(self) -> None:
+        """Block until a start token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate_per_s)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate_per_s
+            self._sleep(wait)
+
+    def __enter__(self) -> "RateLimiter":
+        self._slots.acquire()
+        try:
+            self._take_token()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._slots.release()
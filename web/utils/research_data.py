@@ -8,6 +8,23 @@ import re
 from typing import Dict, Any, Optional
 
 
+# (anchor keyword, pattern, field). Korean key-value patterns first, then
+# English ones, which win when both match. Each anchor is a literal every
+# match of its pattern contains; utils.lexicon scans for all anchors at once.
+RESEARCH_PATTERNS = [
+    ('수요', r'수요[:\s]+(high|medium|low|높음|중간|낮음)', 'demand_level'),
+    ('경쟁', r'경쟁[:\s]+(high|medium|low|높음|중간|낮음)', 'competition_level'),
+    ('시장', r'시장\s*규모[:\s]+(\$?[\d.]+[MBK]?)', 'market_size_usd'),
+    ('주요', r'주요\s*경쟁자[:\s]+(\d+)', 'competitor_count'),
+    ('마진', r'마진[:\s]+(\d+)[-~](\d+)%', 'margin_range'),
+    ('demand', r'demand[:\s]+(high|medium|low|medium-high)', 'demand_level'),
+    ('competition', r'competition[:\s]+(high|medium|low)', 'competition_level'),
+    ('market', r'market\s*size[:\s]+(\$?[\d.]+[MBK]?)', 'market_size_usd'),
+    ('competitor', r'competitor[s]?[:\s]+(\d+)', 'competitor_count'),
+    ('margin', r'margin[:\s]+(\d+)[-~](\d+)%', 'margin_range'),
+]
+
+
 def parse_research_data_from_text(text: str) -> Optional[Dict[str, Any]]:
     """
     Parse research data from user's context input text.
@@ -46,41 +63,14 @@ def parse_research_data_from_text(text: str) -> Optional[Dict[str, Any]]:
     except (json.JSONDecodeError, AttributeError):
         pass
     
-    # Parse Korean key-value format
-    korean_patterns = [
-        (r'수요[:\s]+(high|medium|low|높음|중간|낮음)', 'demand_level'),
-        (r'경쟁[:\s]+(high|medium|low|높음|중간|낮음)', 'competition_level'),
-        (r'시장\s*규모[:\s]+(\$?[\d.]+[MBK]?)', 'market_size_usd'),
-        (r'주요\s*경쟁자[:\s]+(\d+)', 'competitor_count'),
-        (r'마진[:\s]+(\d+)[-~](\d+)%', 'margin_range'),
-    ]
-    
-    for pattern, key in korean_patterns:
-        match = re.search(pattern, text_lower, re.IGNORECASE)
-        if match:
-            if key == 'demand_level':
-                val = match.group(1).lower()
-                research_data[key] = _normalize_level(val)
-            elif key == 'competition_level':
-                val = match.group(1).lower()
-                research_data[key] = _normalize_level(val)
-            elif key == 'market_size_usd':
-                research_data[key] = match.group(1)
-            elif key == 'competitor_count':
-                research_data[key] = int(match.group(1))
-            elif key == 'margin_range':
-                research_data['margin_range_percent'] = [int(match.group(1)), int(match.group(2))]
-    
-    # Parse English key-value format
-    english_patterns = [
-        (r'demand[:\s]+(high|medium|low|medium-high)', 'demand_level'),
-        (r'competition[:\s]+(high|medium|low)', 'competition_level'),
-        (r'market\s*size[:\s]+(\$?[\d.]+[MBK]?)', 'market_size_usd'),
-        (r'competitor[s]?[:\s]+(\d+)', 'competitor_count'),
-        (r'margin[:\s]+(\d+)[-~](\d+)%', 'margin_range'),
-    ]
-    
-    for pattern, key in english_patterns:
+    # Key-value and natural language formats: a pattern can only match when
+    # its anchor keyword was found by the lexicon scan
+    from utils.lexicon import scan_query
+    anchors = scan_query(text).research_anchors
+
+    for anchor, pattern, key in RESEARCH_PATTERNS:
+        if anchor not in anchors:
+            continue
         match = re.search(pattern, text_lower, re.IGNORECASE)
         if match:
             if key == 'demand_level':
@@ -15,11 +15,13 @@ import uuid
 
 from utils.cost_calculator import (
     OrderParams, 
-    compute_landed_cost, 
-    compute_sensitivity,
+    cached_landed_cost, 
+    cached_sensitivity,
     format_for_pie_chart,
     format_for_cost_table
 )
+from utils.container_planner import plan_containers
+from utils.cost_simulation import simulate_landed_cost
 from utils.cost_tables import get_category_config, classify_category
 from utils.config import Config
 
@@ -38,7 +40,8 @@ def build_nexsupply_result(
     target_market: str = None,
     channel: str = None,
     retail_price: Optional[float] = None,
-    ai_insights: Optional[Dict[str, Any]] = None
+    ai_insights: Optional[Dict[str, Any]] = None,
+    category_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Build the complete NexSupply result JSON.
@@ -51,6 +54,7 @@ def build_nexsupply_result(
         channel: Sales channel (defaults to AppSettings.DEFAULT_CHANNEL)
         retail_price: Expected retail price for margin calculation
         ai_insights: AI-generated qualitative insights (optional)
+        category_id: Already-classified category (skips re-classifying user_query)
     
     Returns:
         Complete result dictionary matching the NexSupply JSON schema
@@ -70,7 +74,7 @@ def build_nexsupply_result(
     # ===========================================
     # STEP 1: CLASSIFY CATEGORY
     # ===========================================
-    category_id = classify_category(user_query)
+    category_id = category_id or classify_category(user_query)
     cfg = get_category_config(category_id)
     
     # ===========================================
@@ -84,8 +88,11 @@ def build_nexsupply_result(
         retail_price_per_unit=retail_price
     )
     
-    lc = compute_landed_cost(order)
-    sensitivity = compute_sensitivity(order, lc)
+    # Memoized: reuses the estimate already computed earlier in the pipeline
+    lc = cached_landed_cost(order)
+    sensitivity = cached_sensitivity(order)
+    uncertainty = simulate_landed_cost(order)
+    container_plan = plan_containers(lc)
     
     # ===========================================
     # STEP 3: BUILD META SECTION
@@ -207,6 +214,8 @@ def build_nexsupply_result(
         "detailed_breakdown": lc.get("cost_breakdown_detailed", {}),
         "current_margin_estimate": sensitivity.get("base_margin", "25-40%"),
         "sensitivity": sensitivity_scenarios,
+        "uncertainty": uncertainty,
+        "container_plan": container_plan,
         "hidden_cost_alerts": ai_insights.get("hidden_cost_alerts", get_default_hidden_costs(cfg))
     }
     
@@ -513,7 +522,9 @@ def convert_to_dashboard_format(result: Dict[str, Any]) -> Dict[str, Any]:
                 comp["key"]: comp["share_percent"]
                 for comp in lc["components"]
             },
-            "hidden_cost_warnings": lc["hidden_cost_alerts"]
+            "hidden_cost_warnings": lc["hidden_cost_alerts"],
+            "uncertainty": lc.get("uncertainty", {}),
+            "container_plan": lc.get("container_plan", {})
         },
         "suppliers": [
             {
@@ -0,0 +1,167 @@
+"""
+NexSupply Rule Extractor - Deterministic extraction fast path
+Volume, channel and target market usually appear literally in the query
+("20000 pcs for Amazon FBA to the US"), and the quantity grammar plus the
+query lexicon find them without an LLM round trip. Each field gets a
+confidence; when all three clear AppSettings.EXTRACTION_FAST_PATH_MIN_CONFIDENCE
+the extraction LLM call is skipped.
+
+ExtractionMonitor records which path each request took, the measured LLM
+extraction latency (to estimate time saved) and, for a sample of fast-path
+requests that are also sent to the LLM, how often the two agree per field.
+"""
+
+import random
+import re
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional
+
+from utils.config import AppSettings
+from utils.extraction_prompts import infer_volume_category
+from utils.input_parser import MARKET_ROUTES
+from utils.lexicon import CHANNEL_MAP, MARKET_MAP, scan_query
+from utils.quantity_parser import parse_quantity
+
+
+FAST_PATH_FIELDS = ("volume_units", "channel", "target_market")
+
+# Rule channel names → the names normalize_extracted_values() gives LLM output
+_LLM_CHANNEL_NAMES = {"E-commerce": "Online", "Offline": "Retail"}
+
+EXTRACTION_PATHS = ("rules", "llm", "fallback_rules")
+
+
+def _keyword_confidence(text_lower: str, mapping: Dict[str, str], value: Optional[str]) -> float:
+    """
+    Whole-word (or non-Latin) keyword hits are reliable; 'us' inside 'customs' is not.
+
+    Any keyword of `mapping` that resolves to `value` counts, so "USA" backs
+    up a scan that stopped at the earlier 'us' key.
+    """
+    if value is None:
+        return 0.0
+    for keyword, name in mapping.items():
+        if name != value or keyword not in text_lower:
+            continue
+        if not keyword.isascii() or re.search(rf"(?<![a-z]){re.escape(keyword)}(?![a-z])", text_lower):
+            return 0.9
+    return 0.3
+
+
+def extract_rule_based(query: str) -> Dict[str, Any]:
+    """
+    Extract volume, channel and target market without an LLM.
+
+    Returns:
+        Dictionary with `values` (same keys as normalize_extracted_values()),
+        per-field `confidence` and `confident` (all fields above the fast-path
+        threshold)
+    """
+    hits = scan_query(query or "")
+    quantity = parse_quantity(query or "")
+    volume = quantity.value if quantity else None
+    volume_raw = quantity.text if quantity else None
+    text_lower = (query or "").lower()
+
+    values = {
+        "volume_units": volume,
+        "volume_raw": volume_raw,
+        "channel": hits.channel,
+        "channel_raw": hits.channel_keyword,
+        "target_market": hits.market,
+        "target_market_raw": hits.market_keyword,
+        "route": MARKET_ROUTES.get(hits.market),
+        "volume_category": infer_volume_category(volume, volume_raw),
+    }
+    confidence = {
+        "volume_units": quantity.confidence if quantity else 0.0,
+        "channel": _keyword_confidence(text_lower, CHANNEL_MAP, hits.channel),
+        "target_market": _keyword_confidence(text_lower, MARKET_MAP, hits.market),
+    }
+    threshold = AppSettings.EXTRACTION_FAST_PATH_MIN_CONFIDENCE
+    return {
+        "values": values,
+        "confidence": confidence,
+        "confident": all(confidence[field] >= threshold for field in FAST_PATH_FIELDS),
+    }
+
+
+def should_shadow_sample(rate: Optional[float] = None) -> bool:
+    """Whether this fast-path request should also be sent to the LLM for comparison."""
+    rate = AppSettings.EXTRACTION_SHADOW_SAMPLE_RATE if rate is None else rate
+    return random.random() < rate
+
+
+# =============================================================================
+# PATH / AGREEMENT MONITOR
+# =============================================================================
+
+class ExtractionMonitor:
+    """Thread-safe counters for extraction paths, LLM latency and rule/LLM agreement."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths = Counter()
+            self._llm_calls = 0
+            self._llm_latency_ms = 0.0
+            self._samples = 0
+            self._field_agreements = Counter()
+            self._full_agreements = 0
+
+    def record_path(self, path: str) -> None:
+        if path not in EXTRACTION_PATHS:
+            raise ValueError(f"Unknown extraction path: {path!r}")
+        with self._lock:
+            self._paths[path] += 1
+
+    def record_llm_latency(self, latency_ms: float) -> None:
+        with self._lock:
+            self._llm_calls += 1
+            self._llm_latency_ms += latency_ms
+
+    def record_comparison(self, rule_values: Dict[str, Any], llm_values: Dict[str, Any]) -> Dict[str, bool]:
+        """Compare fast-path fields of a rule extraction with the LLM's, for one sampled request."""
+        agrees = {}
+        for field in FAST_PATH_FIELDS:
+            rule_value = rule_values.get(field)
+            if field == "channel":
+                rule_value = _LLM_CHANNEL_NAMES.get(rule_value, rule_value)
+            agrees[field] = rule_value == llm_values.get(field)
+        with self._lock:
+            self._samples += 1
+            self._field_agreements.update(field for field, ok in agrees.items() if ok)
+            self._full_agreements += all(agrees.values())
+        return agrees
+
+    def stats(self) -> Dict[str, Any]:
+        """Path counts, average LLM extraction latency, estimated time saved and agreement rates."""
+        with self._lock:
+            avg_latency = self._llm_latency_ms / self._llm_calls if self._llm_calls else None
+            samples = self._samples
+            return {
+                "paths": {path: self._paths[path] for path in EXTRACTION_PATHS},
+                "llm_calls": self._llm_calls,
+                "avg_llm_latency_ms": round(avg_latency, 1) if avg_latency is not None else None,
+                "estimated_latency_saved_ms": (
+                    round(avg_latency * self._paths["rules"], 1) if avg_latency is not None else None
+                ),
+                "shadow_samples": samples,
+                "agreement_rate": round(self._full_agreements / samples, 3) if samples else None,
+                "field_agreement_rate": {
+                    field: round(self._field_agreements[field] / samples, 3) if samples else None
+                    for field in FAST_PATH_FIELDS
+                },
+            }
+
+
+EXTRACTION_MONITOR = ExtractionMonitor()
+
+
+def get_extraction_stats() -> Dict[str, Any]:
+    """Extraction path and agreement statistics for this process."""
+    return EXTRACTION_MONITOR.stats()
@@ -0,0 +1,203 @@
+"""
+NexSupply Scenario Grid - N-dimensional sensitivity analysis
+Applies multiplicative or additive shocks to any cost-table coefficient
+(freight, FOB, duty, packing, handling, ...) or to order volume, evaluates
+the full Cartesian grid through the real landed cost formula in one batched
+pass, and returns a tidy table of landed cost and margin per scenario.
+
+Example:
+    grid = compute_scenario_grid(order, [
+        ShockAxis("freight", (0.9, 1.0, 1.2)),
+        ShockAxis("duty", (-5, 0), mode="add"),
+        ShockAxis("units", (0.5, 1.0, 2.0)),
+    ])
+    top = rank_scenarios(grid, top_n=3)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.cost_calculator import (
+    OrderParams,
+    compute_landed_cost_for_orders,
+    evaluate_landed_cost_columns,
+)
+from utils.compiled_cost_tables import CostCoefficients, get_compiled_cost_tables
+
+
+# Named drivers → the coefficients they shock together.
+# Any CostCoefficients field name is also accepted as a driver.
+SHOCK_DRIVERS: Dict[str, Tuple[str, ...]] = {
+    "freight": (
+        "sea_freight_per_cbm_usd",
+        "origin_charges_per_cbm_usd",
+        "destination_charges_per_cbm_usd",
+    ),
+    "fob": ("base_fob_cost_per_kg",),
+    "duty": ("duty_rate_percent",),
+    "packing": ("packing_cost_per_carton_usd", "inner_carton_cost_usd"),
+    "handling": ("docs_and_broker_per_shipment_usd", "port_misc_per_shipment_usd"),
+    "units": (),  # Shocks order volume rather than a coefficient
+}
+
+SHOCK_MODES = ("multiply", "add")
+
+
+@dataclass(frozen=True)
+class ShockAxis:
+    """One dimension of the scenario grid."""
+    driver: str
+    values: Tuple[float, ...]
+    mode: str = "multiply"
+
+    def __post_init__(self):
+        if self.mode not in SHOCK_MODES:
+            raise ValueError(f"Unknown shock mode: {self.mode!r} (use 'multiply' or 'add')")
+        if self.driver not in SHOCK_DRIVERS and self.driver not in CostCoefficients._fields:
+            raise ValueError(f"Unknown shock driver: {self.driver!r}")
+        if not self.values:
+            raise ValueError(f"Shock axis {self.driver!r} has no values")
+        object.__setattr__(self, "values", tuple(float(v) for v in self.values))
+
+    @property
+    def identity(self) -> float:
+        """Value that leaves the driver unchanged."""
+        return 1.0 if self.mode == "multiply" else 0.0
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Coefficient fields shocked by this axis."""
+        return SHOCK_DRIVERS.get(self.driver, (self.driver,))
+
+
+def _apply_shock(base: np.ndarray, shock: np.ndarray, mode: str) -> np.ndarray:
+    """Apply a shock and clip at zero (no negative rates or costs)."""
+    shocked = base * shock if mode == "multiply" else base + shock
+    return np.maximum(shocked, 0.0)
+
+
+def compute_scenario_grid(order: OrderParams, axes: Sequence[ShockAxis]) -> Dict[str, Any]:
+    """
+    Evaluate every combination of shocks for one order.
+
+    If the order has no retail price, one is assumed from the category's
+    typical margin so that margin impact can still be ranked.
+
+    Args:
+        order: Base order
+        axes: Shock axes; the grid is their Cartesian product
+
+    Returns:
+        Dictionary with the base case, per-scenario columns and a tidy `rows` table
+    """
+    drivers = [axis.driver for axis in axes]
+    if len(set(drivers)) != len(drivers):
+        raise ValueError(f"Each driver may appear on only one axis: {drivers}")
+
+    tables = get_compiled_cost_tables()
+    meta = tables.metadata_for(order.category_id)
+
+    base_cols = compute_landed_cost_for_orders([order]).columns
+    base_cost_per_unit = float(base_cols["landed_cost_per_unit_usd"][0])
+
+    retail_price = order.retail_price_per_unit
+    retail_assumed = retail_price is None or retail_price <= 0
+    if retail_assumed:
+        retail_price = base_cost_per_unit / (1 - meta["margin_typical"])
+    base_margin = (retail_price - base_cost_per_unit) / retail_price * 100.0
+
+    shape = tuple(len(axis.values) for axis in axes)
+    n = int(np.prod(shape)) if axes else 1
+    shock_index = np.indices(shape).reshape(len(axes), n)
+
+    category_idx = np.full(n, tables.category_id_of(order.category_id))
+    units = np.full(n, float(order.units))
+    weights = np.full(n, np.nan if order.custom_unit_weight_kg is None else order.custom_unit_weight_kg)
+    shock_values = {
+        axis.driver: np.asarray(axis.values)[shock_index[k]] for k, axis in enumerate(axes)
+    }
+
+    # Volume shocks first: FOB price breaks depend on the shocked units
+    for axis in axes:
+        if axis.driver == "units":
+            units = np.maximum(np.rint(_apply_shock(units, shock_values["units"], axis.mode)), 1.0)
+
+    coef = tables.gather(category_idx, np.full(n, tables.route_id_of(order.route)))
+    coef = coef._replace(base_fob_cost_per_kg=tables.fob_costs_per_kg(category_idx, units))
+
+    for axis in axes:
+        if axis.driver == "units":
+            continue
+        values = shock_values[axis.driver]
+        coef = coef._replace(**{
+            field: _apply_shock(getattr(coef, field), values, axis.mode) for field in axis.fields
+        })
+
+    cols = evaluate_landed_cost_columns(coef, units, weights, np.full(n, retail_price))
+    cost_per_unit = cols["landed_cost_per_unit_usd"]
+    margin_pct = cols["gross_margin_percent"]
+
+    columns = {
+        "units": units,
+        "landed_cost_per_unit_usd": cost_per_unit,
+        "total_landed_cost_usd": cols["total_landed_cost_usd"],
+        "gross_margin_percent": margin_pct,
+        "margin_impact_points": margin_pct - base_margin,
+        "cost_impact_percent": (cost_per_unit / base_cost_per_unit - 1) * 100.0,
+    }
+
+    rows = []
+    for i in range(n):
+        shocked = [axis.driver for axis in axes if shock_values[axis.driver][i] != axis.identity]
+        rows.append({
+            "scenario_index": i,
+            "shocks": {axis.driver: float(shock_values[axis.driver][i]) for axis in axes},
+            "shocked_drivers": shocked,
+            "units": int(units[i]),
+            "landed_cost_per_unit_usd": round(float(cost_per_unit[i]), 4),
+            "total_landed_cost_usd": round(float(cols["total_landed_cost_usd"][i]), 2),
+            "gross_margin_percent": round(float(margin_pct[i]), 1),
+            "margin_impact_points": round(float(columns["margin_impact_points"][i]), 2),
+            "cost_impact_percent": round(float(columns["cost_impact_percent"][i]), 2),
+        })
+
+    return {
+        "axes": [{"driver": a.driver, "mode": a.mode, "values": list(a.values)} for a in axes],
+        "base": {
+            "units": order.units,
+            "landed_cost_per_unit_usd": round(base_cost_per_unit, 4),
+            "retail_price_per_unit_usd": round(retail_price, 4),
+            "retail_price_assumed": retail_assumed,
+            "gross_margin_percent": round(base_margin, 1),
+        },
+        "columns": columns,
+        "rows": rows,
+    }
+
+
+def rank_scenarios(
+    grid: Dict[str, Any],
+    top_n: int = 3,
+    max_drivers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank scenarios by absolute margin impact (largest first).
+
+    Args:
+        grid: Result of compute_scenario_grid()
+        top_n: Number of scenarios to return
+        max_drivers: Only consider scenarios shocking at most this many drivers
+            (e.g. 1 for single-driver scenarios); the base case is always excluded
+
+    Returns:
+        Top-N rows from grid["rows"]
+    """
+    candidates = [
+        row for row in grid["rows"]
+        if row["shocked_drivers"]
+        and (max_drivers is None or len(row["shocked_drivers"]) <= max_drivers)
+    ]
+    candidates.sort(key=lambda row: abs(row["margin_impact_points"]), reverse=True)
+    return candidates[:top_n]
@@ -0,0 +1,73 @@
+"""
+NexSupply Singleflight - Coalesce identical in-flight calls
+When a Quick Start template or a trending product is submitted by many
+sessions at once, each would fire the same Gemini call. SingleFlight lets the
+first caller for a key (the leader) run the call while concurrent callers
+with the same key (followers) wait on its future and share the result:
+
+    text, shared = flights.do(key, fetch_insights, prompt)
+
+Only calls that overlap are coalesced; once the leader finishes the key is
+released, so later callers start a fresh call (or hit a cache). A leader's
+exception is raised in every follower too.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent calls, with coalescing counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn(*args, **kwargs) unless an identical call is in flight.
+
+        Returns:
+            (result, shared) - shared is True when the result came from another caller's call
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls executed, calls coalesced into them, and calls in flight now."""
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesce_rate": round(self.coalesced / total, 4) if total else 0.0,
+                "in_flight": len(self._in_flight),
+            }
+
+    def clear(self) -> None:
+        """Reset counters (calls in flight are unaffected)."""
+        with self._lock:
+            self.executions = self.coalesced = 0
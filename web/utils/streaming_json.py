@@ -0,0 +1,309 @@
+"""
+NexSupply Streaming JSON - Incremental parser for streamed LLM responses
+The hybrid prompt asks Gemini for one JSON object with flat top-level keys
+(product_name, demand_level, hidden_cost_alerts, suppliers, risk_overview,
+...). With a streamed response, each key's value is complete long before the
+whole object is. IncrementalJSONParser is fed chunks as they arrive and
+returns every top-level member as soon as its value closes:
+
+    parser = IncrementalJSONParser()
+    for chunk in stream:
+        for key, value in parser.feed(chunk):
+            render_section(key, value)
+    data = parser.result()
+
+Each character is scanned once. The parser tolerates what LLMs put around
+JSON: text or a ```json fence before the opening brace, anything after the
+closing brace, and trailing commas. A member whose value does not parse is
+skipped rather than failing the stream.
+
+parse_llm_json() is the single parser for a complete LLM response (streamed
+or not). One linear scan finds the first balanced top-level object and
+repairs what models commonly get wrong:
+
+    trailing_comma      [1, 2,]  {"a": 1,}
+    control_character   raw newlines/tabs inside strings
+    unclosed_string     output cut off inside a string
+    truncated_member    output cut off inside a key or value (member dropped)
+    unclosed_brackets   output cut off before the closing brackets
+
+and reports which repairs were needed, so callers can use a partial result
+without mistaking it for a complete one.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_OPENERS = {"{": "}", "[": "]"}
+
+
+class IncrementalJSONParser:
+    """Emit (key, value) for each top-level member of a streamed JSON object."""
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+        self._stack: List[str] = []  # expected closers below the top-level object
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self.members: Dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object has closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk; return the members completed by it, in order."""
+        if self._done or not chunk:
+            return []
+        self._text += chunk
+        completed: List[Tuple[str, Any]] = []
+        text = self._text
+        pos = self._pos
+
+        while pos < len(text):
+            ch = text[pos]
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._stack and self._key is None and self._value_start is None:
+                        self._key = json.loads(text[self._key_start:pos + 1])
+                pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if not self._stack and self._key is None and self._value_start is None:
+                    self._key_start = pos
+            elif ch in _OPENERS:
+                self._stack.append(_OPENERS[ch])
+            elif self._stack and ch == self._stack[-1]:
+                self._stack.pop()
+            elif not self._stack:
+                if ch == ":" and self._key is not None and self._value_start is None:
+                    self._value_start = pos + 1
+                elif ch in ",}":
+                    member = self._close_member(text, pos)
+                    if member is not None:
+                        completed.append(member)
+                    if ch == "}":
+                        self._done = True
+                        pos += 1
+                        break
+            pos += 1
+
+        self._pos = pos
+        return completed
+
+    def _close_member(self, text: str, end: int) -> Optional[Tuple[str, Any]]:
+        """Parse the value that ends at `end` (a top-level ',' or '}')."""
+        key, start = self._key, self._value_start
+        self._key = self._key_start = self._value_start = None
+        if key is None or start is None:
+            return None  # empty object or trailing comma
+        raw = text[start:end].strip()
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            # Trailing commas inside the value ("[1, 2,]") are the usual culprit
+            try:
+                value = json.loads(_strip_trailing_commas(raw))
+            except ValueError:
+                return None
+        self.members[key] = value
+        return key, value
+
+    def result(self) -> Dict[str, Any]:
+        """Every member parsed so far (the whole object once `done`)."""
+        return dict(self.members)
+
+
+def _strip_trailing_commas(raw: str) -> str:
+    """Remove commas directly before a closing bracket, outside strings."""
+    out: List[str] = []
+    in_string = escaped = False
+    for ch in raw:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "]}":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+        out.append(ch)
+    return "".join(out)
+
+
+# =============================================================================
+# ONE-SHOT PARSING WITH REPAIR
+# =============================================================================
+
+# Repairs that mean the response was cut off, not just sloppy
+TRUNCATION_REPAIRS = frozenset({"unclosed_string", "truncated_member", "unclosed_brackets"})
+
+_DECODER = json.JSONDecoder()
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+@dataclass
+class JSONRepairResult:
+    """Parsed object (None if nothing usable was found) and the repairs it took."""
+    data: Optional[Dict[str, Any]]
+    repairs: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the response was cut off (data is a prefix of what was meant)."""
+        return any(repair in TRUNCATION_REPAIRS for repair in self.repairs)
+
+
+def _object_start(text: str) -> int:
+    """Index of the opening brace of the response object (-1 if none)."""
+    start = text.find("{")
+    fence = text.find("```")
+    # Prose before a fenced block may itself contain braces
+    if fence != -1 and start < fence and not text.lstrip().startswith("{"):
+        fenced = text.find("{", fence)
+        if fenced != -1:
+            return fenced
+    return start
+
+
+def _note(repairs: List[str], repair: str) -> None:
+    if repair not in repairs:
+        repairs.append(repair)
+
+
+def _close(out: List[str], closers, repairs: List[str]) -> str:
+    """out with a trailing comma dropped and closers appended."""
+    end = len(out)
+    while end and out[end - 1].isspace():
+        end -= 1
+    if end and out[end - 1] == ",":
+        end -= 1
+        _note(repairs, "trailing_comma")
+    return "".join(out[:end]) + "".join(reversed(closers))
+
+
+def parse_llm_json(text: str) -> JSONRepairResult:
+    """
+    Parse the first top-level JSON object in an LLM response, repairing it if needed.
+
+    Returns:
+        JSONRepairResult; data is None only when no object could be recovered
+    """
+    start = _object_start(text or "")
+    if start == -1:
+        return JSONRepairResult(None, error="no JSON object found")
+    try:
+        # Well-formed responses (the common case) need no scan at all
+        return JSONRepairResult(_DECODER.raw_decode(text, start)[0])
+    except ValueError:
+        pass
+
+    repairs: List[str] = []
+    out: List[str] = []  # output segments; structural characters are their own segment
+    stack: List[str] = []
+    # (len(out), open closers) where cutting the output leaves only whole members
+    safe_points: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = False
+    pos, length = start, len(text)
+
+    # Jump from one significant character to the next instead of stepping
+    # through every character in Python
+    while pos < length:
+        match = (_STRING_SPECIAL if in_string else _STRUCTURAL).search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            break
+        at = match.start()
+        if at > pos:
+            out.append(text[pos:at])
+        ch = text[at]
+        pos = at + 1
+
+        if in_string:
+            if ch == "\\":
+                if pos >= length:
+                    break
+                out.append(text[at:at + 2])
+                pos += 1
+            elif ch == '"':
+                in_string = False
+                out.append(ch)
+            else:
+                out.append(_CONTROL_ESCAPES.get(ch, "\\u%04x" % ord(ch)))
+                _note(repairs, "control_character")
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in _OPENERS:
+            stack.append(_OPENERS[ch])
+            out.append(ch)
+            safe_points.append((len(out), tuple(stack)))
+        elif ch == ",":
+            safe_points.append((len(out), tuple(stack)))
+            out.append(ch)
+        elif stack and ch == stack[-1]:
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+                _note(repairs, "trailing_comma")
+            stack.pop()
+            out.append(ch)
+            if not stack:
+                try:
+                    return JSONRepairResult(json.loads("".join(out)), repairs)
+                except ValueError as e:
+                    return JSONRepairResult(None, repairs, error=str(e))
+            safe_points.append((len(out), tuple(stack)))
+        # else: stray closer, dropped
+
+    # Ran out of text with the object still open
+    _note(repairs, "unclosed_brackets")
+    if in_string:
+        out.append('"')  # a dangling backslash was never copied
+        _note(repairs, "unclosed_string")
+    try:
+        return JSONRepairResult(json.loads(_close(out, stack, repairs)), repairs)
+    except ValueError:
+        pass
+    # The last member is incomplete ('"ke', '"key":', '"key": tru'):
+    # back off to the latest point where only whole members precede
+    _note(repairs, "truncated_member")
+    for length, closers in reversed(safe_points):
+        try:
+            return JSONRepairResult(json.loads(_close(out[:length], closers, repairs)), repairs)
+        except ValueError:
+            continue
+    return JSONRepairResult(None, repairs, error="could not repair truncated object")